@@ -63,6 +63,30 @@ class CandidateReranker:
         best_candidate_index = np.argmax(reranker_probabilities)
         return candidate_programs[best_candidate_index]
 
+    def select_best_candidates(self,
+                               utterances: List[str],
+                               resolver_probabilities: List[tf.Tensor],
+                               candidate_programs: List[List[str]],
+                               tables: List[List[Table]]) -> List[str]:
+        """
+        Select the best candidate for multiple utterances using a single forward pass of the reranker network.
+        :param utterances:
+        :param resolver_probabilities: The resolver output probabilities of the candidates for each utterance.
+        :param candidate_programs: The candidate programs for each utterance.
+        :param tables: The input tables for each utterance.
+        :return: The best candidate program for each utterance.
+        """
+        reranker_inputs = [
+            self.prepend_model_output_probabilities(embedded, probabilities)
+            for embedded, probabilities in zip(self.embedd_many(utterances, tables), resolver_probabilities)
+        ]
+        reranker_probabilities = self.reranker_network.predict(tf.concat(reranker_inputs, axis=0)).flatten()
+        split_indices = np.cumsum([len(programs) for programs in candidate_programs])[:-1]
+        return [
+            programs[np.argmax(probabilities)]
+            for programs, probabilities in zip(candidate_programs, np.split(reranker_probabilities, split_indices))
+        ]
+
     def retrain(self, utterance: str, tables: List[Table], lifted_candidate_program: str):
         self.append_data_entry(utterance, tables)
         if self.lambda_embedder is not None:
@@ -74,15 +98,17 @@ class CandidateReranker:
 
     def generate_reranker_training_data(self, reranker_data: pd.DataFrame, candidate_resolver: CandidateResolver):
         reranker_feature_dim = 0
-        for row in reranker_data.itertuples(index=False):
-            self.generate_examples_from_row_and_add_to_model(row, candidate_resolver)
+        storage = Storage()
+        rows = list(reranker_data.itertuples(index=False))
+        query_table_aligned_embeddings = self.embedd_many(
+            [row.query for row in rows], [storage.get_matching_tables(row.table) for row in rows]
+        )
+        for row, query_table_aligned_embedding in zip(rows, query_table_aligned_embeddings):
+            self.generate_examples_from_row_and_add_to_model(row, candidate_resolver, query_table_aligned_embedding)
         return reranker_feature_dim
 
-    def generate_examples_from_row_and_add_to_model(self, row: NamedTuple, candidate_resolver: CandidateResolver):
-        storage = Storage()
-        utterance = row.query
-        matching_tables = storage.get_matching_tables(row.table)
-        query_table_aligned_embedding = self.embedd_data(utterance, matching_tables)
+    def generate_examples_from_row_and_add_to_model(self, row: NamedTuple, candidate_resolver: CandidateResolver,
+                                                    query_table_aligned_embedding: tf.Tensor):
         lifted_instance, true_lifted_program = row[1], row[2]
         self.generate_examples_from_candidate_resolver_and_add_to_model(
             candidate_resolver, query_table_aligned_embedding, lifted_instance, true_lifted_program
@@ -115,9 +141,26 @@ class CandidateReranker:
         )
 
     def embedd_data(self, utterance: str, tables: List[Table]) -> tf.Tensor:
-        embedded_lambda_calc = self.generate_lambda_embedding_if_required(utterance)
-        embedded_tables = self.generate_summed_table_embedding(tables, utterance)
-        return self.concatenate_embeddings_if_required(embedded_lambda_calc, embedded_tables)
+        return self.embedd_many([utterance], [tables])[0]
+
+    def embedd_many(self, utterances: List[str], tables: List[List[Table]]) -> List[tf.Tensor]:
+        """
+        Embed each utterance jointly with its tables, embedding all pairs of an utterance and one of its tables in batches.
+        :param utterances:
+        :param tables: The input tables for each utterance.
+        :return: The embedding of each utterance, equal to :py:meth:`embedd_data` of the utterance.
+        """
+        table_embeddings = self.table_embedder.embedd_many([
+            (table, utterance) for utterance, utterance_tables in zip(utterances, tables) for table in utterance_tables
+        ])
+        split_indices = np.cumsum([len(utterance_tables) for utterance_tables in tables])
+        return [
+            self.concatenate_embeddings_if_required(
+                self.generate_lambda_embedding_if_required(utterance),
+                self.sum_table_embeddings(table_embeddings[start:end])
+            )
+            for utterance, start, end in zip(utterances, np.concatenate([[0], split_indices[:-1]]), split_indices)
+        ]
 
     def append_reranker_training_example(self, feature: tf.Tensor, label: int):
         self.reranker_labels.append(label)
@@ -134,10 +177,11 @@ class CandidateReranker:
     def generate_lambda_embedding_if_required(self, utterance: str):
         return self.lambda_embedder(utterance) if self.lambda_embedder is not None else None
 
-    def generate_summed_table_embedding(self, tables: List[Table], utterance: str):
-        summed_table_embedding = self.table_embedder.embedd(tables[0], utterance).numpy()
-        for table in tables[1:]:
-            summed_table_embedding += self.table_embedder.embedd(table, utterance).numpy()
+    @staticmethod
+    def sum_table_embeddings(table_embeddings: List[tf.Tensor]):
+        summed_table_embedding = np.array(table_embeddings[0])
+        for table_embedding in table_embeddings[1:]:
+            summed_table_embedding += np.array(table_embedding)
         return tf.convert_to_tensor(summed_table_embedding, np.float32)
 
     def concatenate_embeddings_if_required(self,
@@ -1,19 +1,22 @@
+import logging
 import math
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 import tensorflow as tf
 import tensorflow_text as text
 import tensorflow_hub as hub
-import gensim.downloader as api
 
 from sklearn.metrics.pairwise import cosine_similarity
 
 from src.candidate_reranker.table_embedding.utils import join
 from src.datamodel.Table import Table
 from src.util.string_utils import remove_punctuation
+from src.util.ModelRegistry import ModelRegistry
 from src.util.tfhub_utils import delete_matching_tfhub_cache
 
+logger = logging.getLogger(__name__)
+
 
 class TableEmbedder:
     def __init__(self,
@@ -24,20 +27,36 @@ class TableEmbedder:
                  column_names_only: bool,
                  pooling_layer_window_shape,
                  pooling_output_shape,
-                 pooling_type: str):
-        preprocessor = hub.load(tfhub_preprocessor_link)
-        special_tokens_dict = preprocessor.tokenize.get_special_tokens_dict()
-        self.sep_token = tf.expand_dims(special_tokens_dict["start_of_sequence_id"], axis=0)
-        self.cls_token = tf.expand_dims(special_tokens_dict["end_of_segment_id"], axis=0)
-        self.tokenizer = hub.KerasLayer(preprocessor.tokenize)
-        self.sequence_length = sequence_length
-        self.bert_layer = hub.KerasLayer(tfhub_bert_link, trainable=False)
-        if not column_names_only:
-            self.word_embedding_model = api.load(gensim_api_word_embedder)
+                 pooling_type: str,
+                 batch_size: int = 32):
+        self.tfhub_preprocessor_link = tfhub_preprocessor_link
+        self.tfhub_bert_link = tfhub_bert_link
+        self.gensim_api_word_embedder = gensim_api_word_embedder
         self.column_names_only = column_names_only
+        model_registry = ModelRegistry.get_shared_instance()
+        preprocessor = model_registry.acquire_hub_model(tfhub_preprocessor_link)
+        bert_model_acquired = False
+        try:
+            special_tokens_dict = preprocessor.tokenize.get_special_tokens_dict()
+            self.sep_token = tf.expand_dims(special_tokens_dict["start_of_sequence_id"], axis=0)
+            self.cls_token = tf.expand_dims(special_tokens_dict["end_of_segment_id"], axis=0)
+            self.tokenizer = hub.KerasLayer(preprocessor.tokenize)
+            self.sequence_length = sequence_length
+            bert_model = model_registry.acquire_hub_model(tfhub_bert_link)
+            bert_model_acquired = True
+            self.bert_layer = hub.KerasLayer(bert_model, trainable=False)
+            if not column_names_only:
+                self.word_embedding_model = model_registry.acquire_gensim_model(gensim_api_word_embedder)
+        except Exception:
+            # E.g. a corrupted download of the BERT model raises a DataLossError after the preprocessor was acquired.
+            model_registry.release_hub_model(tfhub_preprocessor_link)
+            if bert_model_acquired:
+                model_registry.release_hub_model(tfhub_bert_link)
+            raise
         self.pooling_layer_window_shape = pooling_layer_window_shape
         self.pooling_output_shape = pooling_output_shape
         self.pooling_type = pooling_type
+        self.batch_size = batch_size
 
     @classmethod
     def initialize(cls,
@@ -48,7 +67,8 @@ class TableEmbedder:
                    column_names_only: bool = False,
                    pooling_layer_window_shape=(128, 128),
                    pooling_output_shape=(1, 27),
-                   pooling_type: str = "MAX"):
+                   pooling_type: str = "MAX",
+                   batch_size: int = 32):
         try:
             embedder = cls(
                 tfhub_preprocessor_link,
@@ -58,10 +78,11 @@ class TableEmbedder:
                 column_names_only,
                 pooling_layer_window_shape,
                 pooling_output_shape,
-                pooling_type
+                pooling_type,
+                batch_size
             )
         except tf.errors.DataLossError as error:
-            print("Data loss found: redownloading model.")
+            logger.warning("Data loss found: redownloading model.")
             delete_matching_tfhub_cache(error)
             embedder = cls.initialize(
                 tfhub_preprocessor_link,
@@ -71,23 +92,56 @@ class TableEmbedder:
                 column_names_only,
                 pooling_layer_window_shape,
                 pooling_output_shape,
-                pooling_type
+                pooling_type,
+                batch_size
             )
         return embedder
 
+    def release(self):
+        """
+        Release the models of this embedder in the :py:class:`ModelRegistry`, the embedder must not be used afterwards.
+        :return:
+        """
+        model_registry = ModelRegistry.get_shared_instance()
+        model_registry.release_hub_model(self.tfhub_preprocessor_link)
+        model_registry.release_hub_model(self.tfhub_bert_link)
+        if not self.column_names_only:
+            model_registry.release_gensim_model(self.gensim_api_word_embedder)
+
     def embedd(self, table: Table, query: str) -> tf.Tensor:
-        return self.create_feature_from_column_names(table, query) \
+        return self.embedd_many([(table, query)])[0]
+
+    def embedd_many(self, tables_and_queries: List[Tuple[Table, str]]) -> List[tf.Tensor]:
+        """
+        Embed each table jointly with its query, running BERT and the pooling once per batch of at most batch size pairs.
+        :param tables_and_queries:
+        :return: The embedding of each pair, equal to :py:meth:`embedd` of the pair.
+        """
+        embeddings = []
+        for start in range(0, len(tables_and_queries), self.batch_size):
+            bert_inputs = [
+                self.create_bert_input(table, query)
+                for table, query in tables_and_queries[start:start + self.batch_size]
+            ]
+            embeddings += tf.unstack(self.create_features({
+                input_name: tf.concat([bert_input[input_name] for bert_input in bert_inputs], 0)
+                for input_name in bert_inputs[0]
+            }))
+        return embeddings
+
+    def create_bert_input(self, table: Table, query: str) -> Dict[str, tf.Tensor]:
+        return self.create_bert_input_from_column_names(table, query) \
             if self.column_names_only \
-            else self.create_feature_from_data(table, query)
+            else self.create_bert_input_from_data(table, query)
 
-    def create_feature_from_column_names(self, table: Table, query: str) -> tf.Tensor:
+    def create_bert_input_from_column_names(self, table: Table, query: str) -> Dict[str, tf.Tensor]:
         columns = [" ".join(table.columns)]
-        return self.create_feature(table, query, columns)
+        return self.create_feature_input(table, query, columns)
 
-    def create_feature_from_data(self, table: Table, query: str) -> tf.Tensor:
+    def create_bert_input_from_data(self, table: Table, query: str) -> Dict[str, tf.Tensor]:
         entries = [" ".join(entry) for entry in self.get_linearized_data_entries(table)]
         entries = self.get_sorted_entries(entries, query)
-        return self.create_feature(table, query, entries)
+        return self.create_feature_input(table, query, entries)
 
     @staticmethod
     def get_linearized_data_entries(table: Table):
@@ -106,25 +160,39 @@ class TableEmbedder:
         indices = (-distances).argsort()
         return [table_entries[i] for i in indices]
 
-    def create_feature(self,
-                       table: Table,
-                       query: str,
-                       table_data_to_be_embedded: List[str]
-                       ) -> tf.Tensor:
+    def create_feature_input(self,
+                             table: Table,
+                             query: str,
+                             table_data_to_be_embedded: List[str]
+                             ) -> Dict[str, tf.Tensor]:
+        """
+        Create the BERT input of batch size one embedding the table data jointly with the query.
+        :param table:
+        :param query:
+        :param table_data_to_be_embedded:
+        :return:
+        """
         tokenized_features = self.get_tokenized_features(query, table.get_contexts(), table_data_to_be_embedded)
         combined = tf.concat([self.cls_token[:, tf.newaxis, tf.newaxis],
                               join(tokenized_features, self.sep_token[:, tf.newaxis, tf.newaxis]),
                               self.sep_token[:, tf.newaxis, tf.newaxis]], 1)
         data, mask = text.pad_model_inputs(input=combined, max_seq_length=self.sequence_length)
         segment_mask = self.get_segment_mask(data.numpy().flatten())
-        bert_input = {"input_word_ids": data, "input_mask": mask, "input_type_ids": segment_mask[tf.newaxis, :]}
+        return {"input_word_ids": data, "input_mask": mask, "input_type_ids": segment_mask[tf.newaxis, :]}
+
+    def create_features(self, bert_input: Dict[str, tf.Tensor]) -> tf.Tensor:
+        """
+        Pool the BERT sequence output of each input of the batch.
+        :param bert_input:
+        :return: The features stacked along the batch axis.
+        """
         bert_output = self.bert_layer(bert_input)["sequence_output"][:, :, :, tf.newaxis]
         return tf.nn.pool(
             bert_output,
             self.pooling_layer_window_shape,
             self.pooling_type,
             strides=self.get_strides(bert_output.shape[1:3])
-        )[0, :, :, 0]
+        )[:, :, :, 0]
 
     def get_tokenized_features(self, query: str, contexts: List[str], table_entries: List[str]):
         tokenized_features = [self.tokenize(query)] \
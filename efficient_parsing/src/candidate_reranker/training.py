@@ -17,31 +17,31 @@ def create_reranker_training_data_from(reranker_dataframe: pd.DataFrame,
     for table_name in reranker_dataframe["table_name"].unique():
         table = list(filter(lambda candidate_table: candidate_table.table_name == table_name, tables))[0]
         sub_dataframe = reranker_dataframe[reranker_dataframe["table_name"] == table_name]
-        for row in sub_dataframe.itertuples(index=False):
-            feature = create_reranker_input(row.query, table, lambda_embedder, table_embedder)
-            positive_feature = tf.concat([tf.constant([[1.0]], dtype=tf.float32), feature], axis=-1)
-            negative_feature = tf.concat([tf.constant([[0.0]], dtype=tf.float32), feature], axis=-1)
-            features = append_reranker_feature(positive_feature, features)
-            features = append_reranker_feature(negative_feature, features)
+        for feature in create_reranker_inputs(list(sub_dataframe["query"]), table, lambda_embedder, table_embedder):
+            features.append(tf.concat([tf.constant([[1.0]], dtype=tf.float32), feature], axis=-1))
+            features.append(tf.concat([tf.constant([[0.0]], dtype=tf.float32), feature], axis=-1))
             labels.append(1)
             labels.append(0)
+    features = tf.concat(features, axis=0) if len(features) > 0 else features
     return features, tf.transpose(tf.constant([labels], dtype=tf.int32))
 
 
-def create_reranker_input(query: str,
-                          table: Table,
-                          lambda_embedder: LambdaEmbedder,
-                          table_embedder: TableEmbedder):
-    embedded_lambda_calc = lambda_embedder(query)
-    embedded_table = table_embedder.embedd(table, query)
-    return tf.concat([
-            tf.constant(embedded_lambda_calc, dtype=tf.float32)[tf.newaxis, :], embedded_table
+def create_reranker_inputs(queries: List[str],
+                           table: Table,
+                           lambda_embedder: LambdaEmbedder,
+                           table_embedder: TableEmbedder):
+    """
+    Create the reranker input of each query, embedding the table jointly with the queries in batches.
+    :param queries:
+    :param table:
+    :param lambda_embedder:
+    :param table_embedder:
+    :return:
+    """
+    embedded_tables = table_embedder.embedd_many([(table, query) for query in queries])
+    return [
+        tf.concat([
+            tf.constant(lambda_embedder(query), dtype=tf.float32)[tf.newaxis, :], embedded_table
         ], -1)
-
-
-def append_reranker_feature(feature: tf.Tensor, features: tf.Tensor):
-    if len(features) == 0:
-        features = feature
-    else:
-        features = tf.concat([features, feature], axis=0)
-    return features
+        for query, embedded_table in zip(queries, embedded_tables)
+    ]
@@ -0,0 +1,166 @@
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from src.candidate_resolver.ExampleBuffer import ExampleBuffer
+from src.candidate_resolver.NearestNeighbors import NearestNeighbors
+
+
+class ApproximateNearestNeighbors:
+    """
+    An approximate nearest neighbor search using random projection locality sensitive hashing for the euclidean distance.
+    Every hash table assigns a feature vector the bucket floor((a * x + b) / w) for several random gaussian projections a.
+    All examples sharing a bucket with the query in at least one table become candidates.
+    The candidates are verified with their exact distance, hence the search returns a subset of the examples an exact search within the same radius finds.
+    The interface is the same as the one of :py:class:`~src.candidate_resolver.NearestNeighbors.NearestNeighbors`.
+    """
+    def __init__(self,
+                 examples: Union[np.ndarray, ExampleBuffer],
+                 radius: float = 400.0,
+                 num_tables: int = 16,
+                 num_projections: int = 8,
+                 bucket_width: float = None,
+                 seed: int = 0):
+        """
+        :param examples: The trained feature vectors. A given example buffer is shared, hence examples added with :py:meth:`add` are visible to its owner.
+        :param radius: The maximal distance of a found example.
+        :param num_tables: The number of hash tables. More tables increase the recall and the query time.
+        :param num_projections: The number of projections combined into one hash key. More projections make the buckets more selective.
+        :param bucket_width: The width w of a bucket along a projection. If None, it is set to the median distance between sampled example pairs, or to the (finite) radius if there are fewer than two distinct examples.
+        :param seed: The seed of the random projections.
+        """
+        self.radius = radius
+        self.example_buffer = examples if isinstance(examples, ExampleBuffer) else ExampleBuffer(examples)
+        self.num_tables = num_tables
+        self.num_projections = num_projections
+        self.random_state = np.random.default_rng(seed)
+        self.bucket_width = bucket_width
+        self.projections = None
+        self.offsets = None
+        self.hash_tables = [{} for _ in range(num_tables)]
+        self.squared_norms = ExampleBuffer(dtype=np.float32)
+        self.float32_examples = None
+        if len(self.example_buffer) > 0:
+            self.float32_examples = NearestNeighbors.create_float32_examples_of(self.examples)
+            self.insert(self.flattened_examples, 0)
+
+    @property
+    def examples(self) -> np.ndarray:
+        return self.example_buffer.array
+
+    @property
+    def flattened_examples(self) -> np.ndarray:
+        return NearestNeighbors.flattened(self.examples) if self.float32_examples is None \
+            else self.float32_examples.array
+
+    def initialize_projections(self, flattened_examples: np.ndarray):
+        """
+        Draw the random projections once the dimension of the examples is known, i.e. when the first examples are inserted.
+        :param flattened_examples:
+        :return:
+        """
+        if self.bucket_width is None:
+            self.bucket_width = self.estimate_bucket_width_from(
+                flattened_examples, self.random_state, self.radius if np.isfinite(self.radius) else 1.0
+            )
+        self.projections = self.random_state.standard_normal(
+            (flattened_examples.shape[1], self.num_tables * self.num_projections)
+        ).astype(np.float32)
+        self.offsets = self.random_state.uniform(
+            0, self.bucket_width, self.num_tables * self.num_projections
+        ).astype(np.float32)
+
+    @staticmethod
+    def estimate_bucket_width_from(flattened_examples: np.ndarray,
+                                   random_state: np.random.Generator,
+                                   default_bucket_width: float,
+                                   num_sampled_pairs: int = 256) -> float:
+        """
+        :param flattened_examples:
+        :param random_state:
+        :param default_bucket_width: The bucket width used if no pair of distinct examples is sampled.
+        :param num_sampled_pairs:
+        :return: The median distance between sampled pairs of distinct examples.
+        """
+        if len(flattened_examples) < 2:
+            return default_bucket_width
+        first_indices = random_state.integers(0, len(flattened_examples), num_sampled_pairs)
+        second_indices = random_state.integers(0, len(flattened_examples), num_sampled_pairs)
+        distances = np.linalg.norm(flattened_examples[first_indices] - flattened_examples[second_indices], axis=1)
+        distances = distances[distances > 0]
+        return float(np.median(distances)) if len(distances) > 0 else default_bucket_width
+
+    def hash_keys_of(self, flattened_vectors: np.ndarray) -> np.ndarray:
+        """
+        :param flattened_vectors:
+        :return: The bucket coordinates of each vector with shape (num vectors, num tables, num projections).
+        """
+        buckets = np.floor((flattened_vectors @ self.projections + self.offsets) / self.bucket_width)
+        return buckets.astype(np.int64).reshape(len(flattened_vectors), self.num_tables, self.num_projections)
+
+    def insert(self, flattened_examples: np.ndarray, first_index: int):
+        if self.projections is None:
+            self.initialize_projections(flattened_examples)
+        self.squared_norms.append(NearestNeighbors.squared_norms_of(flattened_examples))
+        for example_index, example_keys in enumerate(self.hash_keys_of(flattened_examples), start=first_index):
+            for hash_table, key in zip(self.hash_tables, example_keys):
+                hash_table.setdefault(key.tobytes(), []).append(example_index)
+
+    def add(self, feature_vectors: np.ndarray):
+        """
+        Add new examples to the hash tables.
+        :param feature_vectors: One or multiple feature vectors stacked along the first axis.
+        :return:
+        """
+        first_index = len(self.example_buffer)
+        self.example_buffer.append(feature_vectors)
+        added_examples = NearestNeighbors.flattened(self.examples[first_index:])
+        if first_index == 0:
+            self.float32_examples = NearestNeighbors.create_float32_examples_of(self.examples)
+        elif self.float32_examples is not None:
+            self.float32_examples.append(added_examples)
+        self.insert(added_examples, first_index)
+
+    def query_radius(self, query: np.ndarray):
+        """
+        Find trained vectors within a threshold which share a bucket with the query.
+        :param query:
+        :return:
+        """
+        return self.query_radius_batch(query)[0]
+
+    def query_radius_batch(self, queries: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find trained vectors within a threshold for multiple queries at once.
+        :param queries: The queries stacked along the first axis, each shaped like a query of :py:meth:`query_radius`.
+        :return: The indices and distances for each query.
+        """
+        if self.projections is None:
+            return [(np.array([], dtype=np.int64), np.array([], dtype=np.float32)) for _ in range(len(queries))]
+        queries = NearestNeighbors.flattened(queries)
+        examples = self.flattened_examples
+        squared_norms = self.squared_norms.array[:, 0]
+        return [
+            self.verify(query, self.candidates_of(query_keys), examples, squared_norms)
+            for query, query_keys in zip(queries, self.hash_keys_of(queries))
+        ]
+
+    def candidates_of(self, query_keys: np.ndarray) -> np.ndarray:
+        candidate_lists = [
+            hash_table[key.tobytes()] for hash_table, key in zip(self.hash_tables, query_keys)
+            if key.tobytes() in hash_table
+        ]
+        return np.unique(np.concatenate(candidate_lists)).astype(np.int64) if len(candidate_lists) > 0 \
+            else np.array([], dtype=np.int64)
+
+    def verify(self,
+               query: np.ndarray,
+               candidates: np.ndarray,
+               examples: np.ndarray,
+               squared_norms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        squared_distances = squared_norms[candidates] - 2 * examples[candidates] @ query + query @ query
+        distances = np.sqrt(np.maximum(squared_distances, 0))
+        within_radius = distances <= self.radius
+        candidates, distances = candidates[within_radius], distances[within_radius]
+        order = np.argsort(distances, kind="stable")
+        return candidates[order], distances[order]
@@ -4,9 +4,15 @@ import tensorflow as tf
 import numpy as np
 import pandas as pd
 
+from collections import OrderedDict
 from pathlib import Path
+from typing import List, Tuple
 
+from src.candidate_resolver.ApproximateNearestNeighbors import ApproximateNearestNeighbors
+from src.candidate_resolver.ExampleBuffer import ExampleBuffer
+from src.candidate_resolver.InferenceKernel import InferenceKernel
 from src.candidate_resolver.NearestNeighbors import NearestNeighbors
+from src.candidate_resolver.configurables.resolver_configurable_enums import NearestNeighborBackendType
 
 
 class CandidateResolver:
@@ -22,21 +28,51 @@ class CandidateResolver:
                  take_best_guess: bool = False,
                  nearest_neighbor_metric_learner=None,
                  not_sure_threshold: float = 400,
-                 self_attention: bool = False):
+                 self_attention: bool = False,
+                 nearest_neighbor_backend_type: NearestNeighborBackendType = NearestNeighborBackendType.EXACT,
+                 max_result_cache_size: int = 10000):
         super().__init__()
         self.embedding_function = embedding_function
         self.regressor = regressor
         self.self_attention = tf.keras.layers.MultiHeadAttention(
             num_heads=2, key_dim=2, attention_axes=(1, 2)
         ) if self_attention else None
-        self.not_sure_threshold = not_sure_threshold
         self.take_best_guess = take_best_guess
-        self.trained_examples = []
+        self.example_buffer = ExampleBuffer(dtype=np.float32)
         self.transformed_trained_examples = np.array([[]])
         self.nearest_neighbor_search = None
+        self.not_sure_threshold = not_sure_threshold
         self.nearest_neighbor_metric_learner = nearest_neighbor_metric_learner
+        self.nearest_neighbor_backend_type = nearest_neighbor_backend_type
         self.dsl_programs = []
         self.save_location = Path(save_location)
+        self.inference_kernel = None
+        self.result_cache = OrderedDict()
+        self.max_result_cache_size = max_result_cache_size
+
+    @property
+    def trained_examples(self) -> np.ndarray:
+        return self.example_buffer.array
+
+    @trained_examples.setter
+    def trained_examples(self, trained_examples: np.ndarray):
+        self.example_buffer = ExampleBuffer(trained_examples, dtype=np.float32)
+
+    @property
+    def not_sure_threshold(self) -> float:
+        return self.nearest_neighbor_radius
+
+    @not_sure_threshold.setter
+    def not_sure_threshold(self, not_sure_threshold: float):
+        """
+        The not sure threshold is the radius of the nearest neighbor search, hence an existing search is updated as well.
+        :param not_sure_threshold:
+        :return:
+        """
+        self.nearest_neighbor_radius = not_sure_threshold
+        if self.nearest_neighbor_search is not None:
+            self.nearest_neighbor_search.radius = not_sure_threshold
+            self.invalidate_cached_outputs()
 
     @staticmethod
     def load(save_location: Path, embedding_function):
@@ -47,6 +83,46 @@ class CandidateResolver:
         return model
 
     def call(self, inputs, training=False):
+        if training:
+            return self.select_output(*self.resolve(inputs, training=training))
+        cached_output = self.cached_output_of(inputs)
+        if cached_output is None:
+            cached_output = self.resolve(inputs)
+            self.cache_output(inputs, cached_output)
+        return self.select_output(*cached_output)
+
+    def call_batch(self, inputs: List[str], training=False) -> List[Tuple]:
+        """
+        Resolve multiple lifted utterances at once.
+        Every distinct input is embedded once, the nearest neighbor queries are answered together and the regressor
+        scores all found distances in a single call.
+        :param inputs: The lifted utterances.
+        :param training:
+        :return: The output of :py:meth:`call` for each input.
+        """
+        if len(inputs) == 0:
+            return []
+        unique_inputs = list(dict.fromkeys(inputs))
+        unique_outputs = {} if training else {
+            unique_input: self.cached_output_of(unique_input) for unique_input in unique_inputs
+        }
+        uncached_inputs = [unique_input for unique_input in unique_inputs if unique_outputs.get(unique_input) is None]
+        if len(uncached_inputs) > 0:
+            for uncached_input, output in zip(uncached_inputs, self.resolve_batch(uncached_inputs, training=training)):
+                unique_outputs[uncached_input] = output
+                if not training:
+                    self.cache_output(uncached_input, output)
+        return [self.select_output(*unique_outputs[lifted_input]) for lifted_input in inputs]
+
+    def resolve(self, inputs, training=False) -> Tuple[List, List[str]]:
+        """
+        Embed the lifted utterance, find its nearest neighbors and score them without consulting the result cache.
+        :param inputs:
+        :param training:
+        :return output_probabilities, candidate_programs:
+        """
+        if self.inference_kernel is not None:
+            return self.inference_kernel(np.array(self.embedding_function(inputs)))
         inputs = self.embedding_function(inputs)
         inputs = inputs[tf.newaxis, :]
         inputs = inputs if self.nearest_neighbor_metric_learner is None \
@@ -57,15 +133,123 @@ class CandidateResolver:
             tf.squeeze(self.regressor(np.array(distance)[np.newaxis, np.newaxis]))
             for distance in distances
         ]
+        return output_probabilities, candidate_programs
+
+    def resolve_batch(self, inputs: List[str], training=False) -> List[Tuple[List, List[str]]]:
+        """
+        Resolve multiple distinct lifted utterances without consulting the result cache.
+        :param inputs:
+        :param training:
+        :return: The output probabilities and candidate programs for each input.
+        """
+        if self.inference_kernel is not None:
+            return self.inference_kernel.call_batch(self.stack_embeddings_of(inputs))
+        embedded_inputs = self.embed_batch(inputs, training=training)
+        neighbors = self.nearest_neighbor_search.query_radius_batch(embedded_inputs)
+        output_probabilities = self.score_distances(
+            np.concatenate([np.array(distances, dtype=np.float64).flatten() for _, distances in neighbors])
+        )
+        outputs = []
+        offset = 0
+        for example_indices, _ in neighbors:
+            outputs.append((
+                output_probabilities[offset:offset + len(example_indices)],
+                [self.dsl_programs[i] for i in example_indices]
+            ))
+            offset += len(example_indices)
+        return outputs
+
+    def cached_output_of(self, inputs: str) -> Tuple[List, List[str]] | None:
+        output = self.result_cache.get(inputs)
+        if output is not None:
+            self.result_cache.move_to_end(inputs)
+        return output
+
+    def cache_output(self, inputs: str, output: Tuple[List, List[str]]):
+        """
+        Cache the result of a lifted utterance, evicting the least recently used result if the cache is full.
+        :param inputs:
+        :param output:
+        :return:
+        """
+        self.result_cache[inputs] = output
+        self.result_cache.move_to_end(inputs)
+        if len(self.result_cache) > self.max_result_cache_size:
+            self.result_cache.popitem(last=False)
+
+    def invalidate_cached_outputs(self):
+        """
+        Drop all cached results, such that they are recomputed on their next request, e.g. after the index changed.
+        :return:
+        """
+        self.result_cache.clear()
+
+    def embed_batch(self, inputs: List[str], training=False) -> np.ndarray:
+        """
+        Embed multiple lifted utterances and apply the metric learner and self attention to all of them at once.
+        :param inputs: The lifted utterances.
+        :param training:
+        :return: The embedded inputs stacked along the first axis.
+        """
+        embedded_inputs = self.stack_embeddings_of(inputs)
+        if self.nearest_neighbor_metric_learner is not None:
+            transformed_inputs = self.nearest_neighbor_metric_learner.transform(
+                embedded_inputs.reshape(-1, embedded_inputs.shape[-1])
+            )
+            embedded_inputs = transformed_inputs.reshape(*embedded_inputs.shape[:-1], -1)
+        if self.self_attention is not None:
+            embedded_inputs = np.array(self.self_attention(embedded_inputs, embedded_inputs, training=training))
+        return embedded_inputs
+
+    def stack_embeddings_of(self, inputs: List[str]) -> np.ndarray:
+        return np.stack([np.array(embedding) for embedding in self.embedding_function(list(inputs))])
+
+    def export_inference_kernel(self) -> InferenceKernel:
+        """
+        Freeze the regressor, the metric learner and the nearest neighbor index into a NumPy-only inference kernel.
+        Once exported, :py:meth:`call` and :py:meth:`call_batch` use the kernel and retraining re-exports it.
+        :return:
+        """
+        self.inference_kernel = InferenceKernel.export_from(self)
+        self.invalidate_cached_outputs()
+        return self.inference_kernel
+
+    def reexport_inference_kernel_if_required(self):
+        if self.inference_kernel is not None:
+            self.export_inference_kernel()
+
+    def score_distances(self, distances: np.ndarray) -> List[tf.Tensor]:
+        """
+        Assign probabilities to all given distances using a single regressor call.
+        :param distances: A flat array of nearest neighbor distances.
+        :return:
+        """
+        if len(distances) == 0:
+            return []
+        return tf.unstack(tf.reshape(self.regressor(distances[:, np.newaxis]), [-1]))
+
+    def select_output(self, output_probabilities: List, candidate_programs: List[str]):
         return (output_probabilities, candidate_programs) \
             if not self.take_best_guess or len(output_probabilities) == 0 \
             else (output_probabilities[0], candidate_programs[0])
 
     def add_training_example_and_retrain(self, lifted_instance: str, dsl_program: str):
-        self.trained_examples = np.append(self.trained_examples, self.embedding_function(lifted_instance), axis=0)
+        """
+        Without a metric learner the new example is appended to the existing nearest neighbor search.
+        Otherwise, the metric has to be relearned and the nearest neighbor search is rebuilt.
+        :param lifted_instance:
+        :param dsl_program:
+        :return:
+        """
         self.dsl_programs.append(dsl_program)
-        self.train_metric_if_required()
-        self.create_nearest_neighbor_classifier()
+        if self.nearest_neighbor_metric_learner is None and self.nearest_neighbor_search is not None:
+            self.nearest_neighbor_search.add(np.array(self.embedding_function(lifted_instance)))
+        else:
+            self.add_trained_feature_vector(np.array(self.embedding_function(lifted_instance)))
+            self.train_metric_if_required()
+            self.create_nearest_neighbor_classifier()
+        self.reexport_inference_kernel_if_required()
+        self.invalidate_cached_outputs()
 
     def close_enough_examples(self, inputs):
         example_indices, distances = self.nearest_neighbor_search.query_radius(inputs)
@@ -80,6 +264,8 @@ class CandidateResolver:
             embedded_dataframe, feature_column_index, label_column_index
         )
         self.create_nearest_neighbor_classifier()
+        self.reexport_inference_kernel_if_required()
+        self.invalidate_cached_outputs()
 
     def extract_feature_vectors_and_dsl_programs_from(self,
                                                       embedded_dataframe: pd.DataFrame,
@@ -113,15 +299,16 @@ class CandidateResolver:
             )
 
     def create_nearest_neighbor_classifier(self):
-        self.nearest_neighbor_search = NearestNeighbors(
-            self.trained_examples if self.nearest_neighbor_metric_learner is None
+        nearest_neighbor_class = ApproximateNearestNeighbors \
+            if self.nearest_neighbor_backend_type == NearestNeighborBackendType.LSH else NearestNeighbors
+        self.nearest_neighbor_search = nearest_neighbor_class(
+            self.example_buffer if self.nearest_neighbor_metric_learner is None
             else self.transformed_trained_examples,
             self.not_sure_threshold,
         )
 
     def add_trained_feature_vector(self, feature_vector: np.ndarray):
-        self.trained_examples = feature_vector if len(self.trained_examples) == 0 \
-            else np.vstack((self.trained_examples, feature_vector))
+        self.example_buffer.append(feature_vector)
 
     def trained_instance_at(self, i: int):
         return (self.dsl_programs[i], self.trained_examples[i, :]) if self.nearest_neighbor_metric_learner is None \
@@ -139,4 +326,18 @@ class CandidateResolver:
         state = self.__dict__.copy()
         del state["embedding_function"]
         del state["regressor"]
+        state["result_cache"] = OrderedDict()
         return state
+
+    def __setstate__(self, state):
+        state.setdefault("inference_kernel", None)
+        state.setdefault("nearest_neighbor_backend_type", NearestNeighborBackendType.EXACT)
+        state["result_cache"] = OrderedDict()
+        state.setdefault("max_result_cache_size", 10000)
+        if "not_sure_threshold" in state:
+            state["nearest_neighbor_radius"] = state.pop("not_sure_threshold")
+        if state.get("nearest_neighbor_search") is not None:
+            state["nearest_neighbor_search"].radius = state["nearest_neighbor_radius"]
+        if "trained_examples" in state:
+            state["example_buffer"] = ExampleBuffer(np.array(state.pop("trained_examples")), dtype=np.float32)
+        self.__dict__.update(state)
@@ -0,0 +1,58 @@
+import numpy as np
+
+
+class ExampleBuffer:
+    """
+    A growable array of trained feature vectors.
+    The capacity doubles whenever it is exhausted, therefore appending an example costs amortised O(1) instead of copying all previously stored examples.
+    """
+    def __init__(self, examples: np.ndarray = None, initial_capacity: int = 16, dtype: np.dtype = None):
+        """
+        :param examples: The initial examples stacked along the first axis.
+        :param initial_capacity:
+        :param dtype: The data type of the stored examples. If None, the data type of the first appended examples is used.
+        """
+        self.initial_capacity = initial_capacity
+        self.dtype = dtype
+        self.data = None
+        self.size = 0
+        if examples is not None and len(examples) > 0:
+            self.append(examples)
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        A view of all stored examples. Later appends never change the rows of an already returned view.
+        :return:
+        """
+        return self.data[:self.size] if self.data is not None else np.array([])
+
+    def append(self, feature_vectors: np.ndarray):
+        """
+        Append one or multiple feature vectors stacked along the first axis like :py:func:`np.vstack` would.
+        :param feature_vectors:
+        :return:
+        """
+        feature_vectors = np.atleast_2d(np.asarray(feature_vectors))
+        if self.data is None:
+            self.data = np.empty(
+                (max(self.initial_capacity, len(feature_vectors)), *feature_vectors.shape[1:]),
+                dtype=feature_vectors.dtype if self.dtype is None else self.dtype
+            )
+        elif self.size + len(feature_vectors) > len(self.data):
+            self.grow_to(max(2 * len(self.data), self.size + len(feature_vectors)))
+        self.data[self.size:self.size + len(feature_vectors)] = feature_vectors
+        self.size += len(feature_vectors)
+
+    def grow_to(self, capacity: int):
+        grown_data = np.empty((capacity, *self.data.shape[1:]), dtype=self.data.dtype)
+        grown_data[:self.size] = self.data[:self.size]
+        self.data = grown_data
+
+    def __len__(self):
+        return self.size
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["data"] = self.array.copy() if self.data is not None else None
+        return state
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import copy
+import pickle
+
+import numpy as np
+import tensorflow as tf
+
+from pathlib import Path
+from typing import List, Tuple
+
+from src.candidate_resolver.ApproximateNearestNeighbors import ApproximateNearestNeighbors
+from src.candidate_resolver.NearestNeighbors import NearestNeighbors
+
+
+class InferenceKernel:
+    """
+    The inference kernel is a frozen copy of all parts of a candidate resolver which are applied after the embedding.
+    It holds the weights of the regressor, the transformation matrix of the metric learner and the nearest neighbor index as plain NumPy arrays.
+    Therefore, all candidates of a query get scored in a single vectorized pass without entering TensorFlow.
+    The index and the program templates are copied when the kernel is exported, hence retraining the resolver does not change an exported kernel.
+    """
+    def __init__(self,
+                 regressor_weight: np.ndarray,
+                 regressor_bias: np.ndarray,
+                 transformation_matrix: np.ndarray | None,
+                 nearest_neighbor_search: NearestNeighbors | ApproximateNearestNeighbors,
+                 dsl_programs: List[str]):
+        """
+        :param regressor_weight: The kernel of the dense regressor layer.
+        :param regressor_bias: The bias of the dense regressor layer.
+        :param transformation_matrix: The linear transformation learned by the metric learner or None if no metric learner is used.
+        :param nearest_neighbor_search: The nearest neighbor index over the trained examples, which is owned by the kernel.
+        :param dsl_programs: The program templates of the trained examples, which are copied.
+        """
+        self.regressor_weight = np.asarray(regressor_weight, dtype=np.float32).reshape(())
+        self.regressor_bias = np.asarray(regressor_bias, dtype=np.float32).reshape(())
+        self.transformation_matrix = transformation_matrix
+        self.nearest_neighbor_search = nearest_neighbor_search
+        self.dsl_programs = np.array(dsl_programs, dtype=object)
+
+    @classmethod
+    def export_from(cls, candidate_resolver) -> InferenceKernel:
+        """
+        Freeze the current state of a trained candidate resolver.
+        The nearest neighbor index is copied once a running background merge finished, such that the kernel queries a consistent snapshot.
+        :param candidate_resolver:
+        :return:
+        """
+        if candidate_resolver.self_attention is not None:
+            raise ValueError("Candidate resolvers using self attention cannot be exported to an inference kernel.")
+        regressor_weight, regressor_bias = cls.dense_sigmoid_weights_of(candidate_resolver.regressor)
+        metric_learner = candidate_resolver.nearest_neighbor_metric_learner
+        transformation_matrix = np.array(metric_learner.components_, dtype=np.float32).T \
+            if metric_learner is not None else None
+        return cls(
+            regressor_weight,
+            regressor_bias,
+            transformation_matrix,
+            copy.deepcopy(candidate_resolver.nearest_neighbor_search),
+            candidate_resolver.dsl_programs
+        )
+
+    @staticmethod
+    def dense_sigmoid_weights_of(regressor: tf.keras.Model) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the kernel and bias of a regressor consisting of a single dense sigmoid unit applied to a distance, which is the only regressor :py:meth:`score` reproduces.
+        :param regressor:
+        :return: regressor_weight, regressor_bias
+        """
+        layers = regressor.layers
+        if len(layers) != 1 or not isinstance(layers[0], tf.keras.layers.Dense):
+            raise ValueError(
+                f"Only regressors consisting of a single dense layer can be exported, the regressor has the layers "
+                f"{[type(layer).__name__ for layer in layers]}."
+            )
+        layer_configuration = layers[0].get_config()
+        if layer_configuration["units"] != 1 or layer_configuration["activation"] != "sigmoid" \
+                or not layer_configuration["use_bias"]:
+            raise ValueError(
+                f"Only a dense regressor layer with a single sigmoid unit and a bias can be exported, the layer has "
+                f"{layer_configuration['units']} units, {layer_configuration['activation']} activation and "
+                f"use_bias={layer_configuration['use_bias']}."
+            )
+        regressor_weight, regressor_bias = layers[0].get_weights()
+        if np.size(regressor_weight) != 1:
+            raise ValueError(
+                f"Only a regressor of a single distance can be exported, the kernel has shape {np.shape(regressor_weight)}."
+            )
+        return regressor_weight, regressor_bias
+
+    @staticmethod
+    def load(save_location: Path) -> InferenceKernel:
+        with open(save_location / Path("inference_kernel.pkl"), "rb") as file:
+            return pickle.load(file)
+
+    def save(self, save_location: Path):
+        with open(save_location / Path("inference_kernel.pkl"), "wb") as file:
+            pickle.dump(self, file)
+
+    def __call__(self, embedded_input: np.ndarray) -> Tuple[List[np.float32], List[str]]:
+        """
+        Find and score the candidate programs of a single embedded input.
+        :param embedded_input: The output of the embedding function for a single lifted utterance.
+        :return output_probabilities, candidate_programs:
+        """
+        return self.call_batch(np.asarray(embedded_input)[np.newaxis])[0]
+
+    def call_batch(self, embedded_inputs: np.ndarray) -> List[Tuple[List[np.float32], List[str]]]:
+        """
+        Find and score the candidate programs of multiple embedded inputs.
+        :param embedded_inputs: The outputs of the embedding function stacked along the first axis.
+        :return: The output probabilities and candidate programs for each input.
+        """
+        neighbors = self.nearest_neighbor_search.query_radius_batch(self.transform(embedded_inputs))
+        output_probabilities = self.score(
+            np.concatenate([np.asarray(distances).flatten() for _, distances in neighbors])
+        )
+        res = []
+        offset = 0
+        for example_indices, _ in neighbors:
+            res.append((
+                list(output_probabilities[offset:offset + len(example_indices)]),
+                self.dsl_programs[np.asarray(example_indices, dtype=np.intp)].tolist()
+            ))
+            offset += len(example_indices)
+        return res
+
+    def transform(self, embedded_inputs: np.ndarray) -> np.ndarray:
+        """
+        Apply the metric learner transformation to the last axis of the embedded inputs.
+        :param embedded_inputs:
+        :return:
+        """
+        embedded_inputs = np.asarray(embedded_inputs, dtype=np.float32)
+        return embedded_inputs if self.transformation_matrix is None else embedded_inputs @ self.transformation_matrix
+
+    def score(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Compute the output of the single dense sigmoid unit of the regressor for all distances at once.
+        :param distances:
+        :return:
+        """
+        logits = distances.astype(np.float32) * self.regressor_weight + self.regressor_bias
+        return 1 / (1 + np.exp(-logits))
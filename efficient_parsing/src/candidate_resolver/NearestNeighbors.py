@@ -1,19 +1,103 @@
+import threading
+
+from typing import List, Tuple, Union
+
 import numpy as np
 from sklearn.neighbors import KDTree
 
+from src.candidate_resolver.ExampleBuffer import ExampleBuffer
+
 
 class NearestNeighbors:
     """
-    Depending on the rank of the utterance feature vectors this class provides a nearest neighbor implementation using kd-trees (rank < 3) or a trivial vectorized implementation.
+    Depending on the rank of the utterance feature vectors this class provides a nearest neighbor implementation using kd-trees (rank < 3) or a brute force implementation.
+    The brute force implementation works on the flattened float32 examples and their cached squared norms and computes all distances with matrix products.
+    Examples stored in another data type are converted to float32 once, when they are added, instead of on every query.
+    Every implementation finds the examples whose distance is at most the radius.
+    Examples added after construction are kept in a small delta buffer which is searched exhaustively.
+    As soon as the delta buffer grows large compared to the kd-tree it gets merged into a new kd-tree in the background.
     """
-    def __init__(self, examples: np.ndarray, radius: float = 400.0):
+    def __init__(self,
+                 examples: Union[np.ndarray, ExampleBuffer],
+                 radius: float = 400.0,
+                 min_delta_size: int = 32,
+                 delta_fraction: float = 0.1,
+                 brute_force_chunk_size: int = 1024):
+        """
+        :param examples: The trained feature vectors. A given example buffer is shared, hence examples added with :py:meth:`add` are visible to its owner.
+        :param radius: The maximal distance of a found example.
+        :param min_delta_size: The delta buffer is never merged into the kd-tree before it contains this many examples.
+        :param delta_fraction: The delta buffer gets merged into the kd-tree when it exceeds this fraction of the kd-tree size.
+        :param brute_force_chunk_size: The number of examples the brute force implementation compares at once.
+        """
         self.radius = radius
-        self.examples = examples
-        self.performant_implementation = None if len(self.examples.shape) >= 3 else \
-            KDTree(self.examples, leaf_size=2, metric="euclidean")
+        self.example_buffer = examples if isinstance(examples, ExampleBuffer) else ExampleBuffer(examples)
+        self.min_delta_size = min_delta_size
+        self.delta_fraction = delta_fraction
+        self.brute_force_chunk_size = brute_force_chunk_size
+        self.merge_thread = None
+        self.indexed = (None, 0) if len(self.examples.shape) >= 3 else \
+            (KDTree(self.examples), len(self.example_buffer))
+        self.squared_norms = ExampleBuffer(dtype=np.float32)
+        self.float32_examples = None
+        if self.performant_implementation is None:
+            self.float32_examples = self.create_float32_examples_of(self.examples)
+            self.squared_norms.append(self.squared_norms_of(self.flattened_examples))
+
+    @property
+    def examples(self) -> np.ndarray:
+        return self.example_buffer.array
 
-        if len(self.examples.shape) < 3:
-            self.performant_implementation = KDTree(self.examples)
+    @property
+    def performant_implementation(self) -> KDTree:
+        return self.indexed[0]
+
+    @property
+    def flattened_examples(self) -> np.ndarray:
+        """
+        The examples as float32 matrix with one row per example, which is a view of the example buffer if it stores float32 examples.
+        :return:
+        """
+        return self.flattened(self.examples) if self.float32_examples is None else self.float32_examples.array
+
+    @staticmethod
+    def create_float32_examples_of(examples: np.ndarray) -> ExampleBuffer | None:
+        if examples.dtype == np.float32:
+            return None
+        return ExampleBuffer(NearestNeighbors.flattened(examples), dtype=np.float32)
+
+    def add(self, feature_vectors: np.ndarray):
+        """
+        Add new examples to the search without rebuilding the kd-tree in the foreground.
+        :param feature_vectors: One or multiple feature vectors stacked along the first axis.
+        :return:
+        """
+        self.example_buffer.append(feature_vectors)
+        if self.performant_implementation is None:
+            added_examples = self.flattened(self.examples[len(self.squared_norms):])
+            if self.float32_examples is not None:
+                self.float32_examples.append(added_examples)
+            self.squared_norms.append(self.squared_norms_of(added_examples))
+        elif self.delta_exceeds_threshold() and not self.is_merging():
+            self.merge_thread = threading.Thread(
+                target=self.merge_delta_into_tree, args=(self.examples,), daemon=True
+            )
+            self.merge_thread.start()
+
+    def delta_exceeds_threshold(self) -> bool:
+        tree_size = self.indexed[1]
+        return len(self.example_buffer) - tree_size > max(self.min_delta_size, self.delta_fraction * tree_size)
+
+    def is_merging(self) -> bool:
+        return self.merge_thread is not None and self.merge_thread.is_alive()
+
+    def merge_delta_into_tree(self, examples: np.ndarray):
+        self.indexed = (KDTree(examples), len(examples))
+
+    def wait_for_merge(self):
+        if self.merge_thread is not None:
+            self.merge_thread.join()
+            self.merge_thread = None
 
     def query_radius(self, query: np.ndarray):
         """
@@ -21,22 +105,104 @@ class NearestNeighbors:
         :param query:
         :return:
         """
-        indices, distances = self.query_radius_brute(query) if self.performant_implementation is None \
-            else self.performant_implementation.query_radius(
-            query[0] if len(query.shape) == 3 else query, self.radius, return_distance=True, sort_results=True
-        )
-        return (indices.flatten()[0], distances.flatten()[0]) if self.performant_implementation is not None \
-            else (indices.flatten(), distances.flatten())
+        if self.performant_implementation is None:
+            return self.query_radius_brute(query)
+        return self.query_radius_batch(query[0] if len(query.shape) == 3 else query)[0]
+
+    def query_radius_batch(self, queries: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find all trained vectors within a threshold for multiple queries at once.
+        :param queries: The queries stacked along the first axis, each shaped like a query of :py:meth:`query_radius`.
+        :return: The indices and distances for each query.
+        """
+        if self.performant_implementation is None:
+            return self.query_radius_brute_batch(queries)
+        queries = queries.reshape(len(queries), -1)
+        kd_tree, tree_size = self.indexed
+        examples = self.examples
+        indices, distances = kd_tree.query_radius(queries, self.radius, return_distance=True, sort_results=True)
+        if len(examples) == tree_size:
+            return list(zip(indices, distances))
+        delta_distances = np.linalg.norm(examples[np.newaxis, tree_size:] - queries[:, np.newaxis], axis=-1)
+        return [
+            self.merge_with_delta(query_indices, query_distances, query_delta_distances, tree_size)
+            for query_indices, query_distances, query_delta_distances in zip(indices, distances, delta_distances)
+        ]
+
+    def merge_with_delta(self,
+                         indices: np.ndarray,
+                         distances: np.ndarray,
+                         delta_distances: np.ndarray,
+                         tree_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        delta_indices = np.flatnonzero(delta_distances <= self.radius)
+        indices = np.concatenate([indices, delta_indices + tree_size])
+        distances = np.concatenate([distances, delta_distances[delta_indices]])
+        order = np.argsort(distances, kind="stable")
+        return indices[order], distances[order]
 
     def query_radius_brute(self, query: np.ndarray):
         """
-        Find all trained vectors within a threshold using the trivial implementation.
+        Find all trained vectors within a threshold using the brute force implementation.
         :param query:
         :return:
         """
-        # noinspection PyTypeChecker
-        distances = np.linalg.norm(self.examples - query, axis=(2, 3)).flatten()
-        distances = distances[distances < self.radius]
-        indices = np.argsort(distances)
-        return indices, distances[indices]
+        return self.query_radius_brute_batch(query)[0]
+
+    def query_radius_brute_batch(self, queries: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Compute the distances between the queries and all examples as ||a||^2 - 2 a.b + ||b||^2.
+        The examples are processed in chunks, such that the memory needed besides the examples is linear in their number.
+        :param queries: The queries stacked along the first axis, each shaped like a single example.
+        :return: The indices and distances for each query.
+        """
+        queries = self.flattened(queries)
+        examples = self.flattened_examples
+        squared_norms = self.squared_norms.array[:len(examples), 0]
+        squared_distances = np.empty((len(queries), len(examples)), dtype=np.float32)
+        for start in range(0, len(examples), self.brute_force_chunk_size):
+            end = start + self.brute_force_chunk_size
+            squared_distances[:, start:end] = squared_norms[np.newaxis, start:end] \
+                - 2 * queries @ examples[start:end].T
+        squared_distances += self.squared_norms_of(queries)
+        distances = np.sqrt(np.maximum(squared_distances, 0))
+        res = []
+        for query_distances in distances:
+            indices = np.flatnonzero(query_distances <= self.radius)
+            indices = indices[np.argsort(query_distances[indices], kind="stable")]
+            res.append((indices, query_distances[indices]))
+        return res
+
+    @staticmethod
+    def flattened(examples: np.ndarray) -> np.ndarray:
+        return np.ascontiguousarray(examples.reshape(len(examples), -1), dtype=np.float32)
+
+    @staticmethod
+    def squared_norms_of(flattened_examples: np.ndarray) -> np.ndarray:
+        return np.einsum("ij,ij->i", flattened_examples, flattened_examples)[:, np.newaxis]
+
+    def __getstate__(self):
+        self.wait_for_merge()
+        return self.__dict__.copy()
 
+    def __setstate__(self, state):
+        if "examples" in state:
+            examples = state.pop("examples")
+            kd_tree = state.pop("performant_implementation")
+            state.update({
+                "example_buffer": ExampleBuffer(examples),
+                "min_delta_size": 32,
+                "delta_fraction": 0.1,
+                "brute_force_chunk_size": 1024,
+                "merge_thread": None,
+                "indexed": (kd_tree, len(examples))
+            })
+            if kd_tree is None:
+                state["squared_norms"] = ExampleBuffer(
+                    NearestNeighbors.squared_norms_of(NearestNeighbors.flattened(examples)), dtype=np.float32
+                )
+            else:
+                state["squared_norms"] = ExampleBuffer(dtype=np.float32)
+        if "float32_examples" not in state:
+            state["float32_examples"] = NearestNeighbors.create_float32_examples_of(state["example_buffer"].array) \
+                if state["indexed"][0] is None else None
+        self.__dict__.update(state)
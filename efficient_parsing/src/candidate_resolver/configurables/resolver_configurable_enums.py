@@ -27,3 +27,8 @@ class MetricLearnerType(Enum):
     NONE = 0
     NCA = 1
     LMNN = 2
+
+
+class NearestNeighborBackendType(Enum):
+    EXACT = 0
+    LSH = 1
@@ -1,34 +1,113 @@
+import logging
+
 import tensorflow as tf
 import tensorflow_hub as hub
 import tensorflow_text as text
 
-from typing import Dict
+from typing import Dict, List
 from src.candidate_resolver.embedding.embedding_utils import apply_positional_encoding
+from src.util.ModelRegistry import ModelRegistry
 from src.util.tfhub_utils import delete_matching_tfhub_cache
 
+logger = logging.getLogger(__name__)
+
 
 class BertEmbedder(tf.keras.Model):
+    """
+    Embeds strings with a BERT model from TF Hub, whose preprocessor pads every input to the maximal sequence length.
+    :py:meth:`call_trimmed` instead packs the inputs to the shortest sequence length bucket fitting the batch.
+    """
+    max_sequence_length = 128
+    sequence_length_buckets = (16, 32, 64, 128)
+    padding_independent_outputs = ("pooled_output", "sequence_output_pos_encoded")
+
     def __init__(self, tfhub_preprocessor_link: str, tfhub_bert_link: str):
         super().__init__()
+        self.tfhub_preprocessor_link = tfhub_preprocessor_link
+        self.tfhub_bert_link = tfhub_bert_link
         self.text_input = tf.keras.layers.Input(shape=(), dtype=tf.string)
-        self.preprocess = hub.KerasLayer(tfhub_preprocessor_link, trainable=False)
-        self.bert_layer = hub.KerasLayer(tfhub_bert_link, trainable=False)
+        model_registry = ModelRegistry.get_shared_instance()
+        self.preprocessor = model_registry.acquire_hub_model(tfhub_preprocessor_link)
+        bert_model_acquired = False
+        try:
+            self.preprocess = hub.KerasLayer(self.preprocessor, trainable=False)
+            bert_model = model_registry.acquire_hub_model(tfhub_bert_link)
+            bert_model_acquired = True
+            self.bert_layer = hub.KerasLayer(bert_model, trainable=False)
+        except Exception:
+            # E.g. a corrupted download of the BERT model raises a DataLossError after the preprocessor was acquired.
+            model_registry.release_hub_model(tfhub_preprocessor_link)
+            if bert_model_acquired:
+                model_registry.release_hub_model(tfhub_bert_link)
+            raise
 
     @classmethod
     def initialize(cls, tfhub_preprocessor_link: str, tfhub_bert_link: str):
         try:
             embedder = cls(tfhub_preprocessor_link, tfhub_bert_link)
         except tf.errors.DataLossError as error:
-            print("Data loss found: redownloading model.")
+            logger.warning("Data loss found: redownloading model.")
             delete_matching_tfhub_cache(error)
             embedder = cls.initialize(tfhub_preprocessor_link, tfhub_bert_link)
         return embedder
 
-    def call(self, inputs: str) -> Dict[str, tf.Tensor]:
-        inputs = tf.constant([inputs], dtype=tf.string)
+    def release(self):
+        """
+        Release the hub models of this embedder in the :py:class:`ModelRegistry`, the embedder must not be used afterwards.
+        :return:
+        """
+        model_registry = ModelRegistry.get_shared_instance()
+        model_registry.release_hub_model(self.tfhub_preprocessor_link)
+        model_registry.release_hub_model(self.tfhub_bert_link)
+
+    def call(self, inputs: str | List[str] | tf.Tensor) -> Dict[str, tf.Tensor]:
+        """
+        Embed a single string or a batch of strings.
+        :param inputs:
+        :return: The BERT outputs with one row per input string.
+        """
+        inputs = tf.constant([inputs], dtype=tf.string) if isinstance(inputs, str) \
+            else tf.convert_to_tensor(inputs, dtype=tf.string)
         bert_inputs = self.preprocess.call(inputs)
         bert_outputs = self.bert_layer.call(bert_inputs)
         sequence_output_with_positional_encoding = apply_positional_encoding(bert_outputs["sequence_output"],
                                                                              bert_inputs["input_mask"])
         bert_outputs["sequence_output_pos_encoded"] = sequence_output_with_positional_encoding
         return bert_outputs
+
+    def call_trimmed(self, inputs: str | List[str] | tf.Tensor) -> Dict[str, tf.Tensor]:
+        """
+        Embed a single string or a batch of strings like :py:meth:`call`, but BERT only attends over the shortest sequence length bucket fitting the batch.
+        Padded positions are masked in the attention of BERT, hence only the outputs at padded positions depend on the sequence length.
+        Therefore, only the outputs which do not read them are returned, the positional encoded sequence output is padded back to the maximal sequence length.
+        :param inputs:
+        :return: The pooled output and the positional encoded sequence output with one row per input string.
+        """
+        inputs = tf.constant([inputs], dtype=tf.string) if isinstance(inputs, str) \
+            else tf.convert_to_tensor(inputs, dtype=tf.string)
+        tokenized_inputs = self.preprocessor.tokenize(inputs)
+        sequence_length = self.sequence_length_bucket_of(tokenized_inputs)
+        bert_inputs = self.preprocessor.bert_pack_inputs([tokenized_inputs], seq_length=sequence_length)
+        bert_outputs = self.bert_layer.call(bert_inputs)
+        sequence_output_with_positional_encoding = apply_positional_encoding(bert_outputs["sequence_output"],
+                                                                             bert_inputs["input_mask"])
+        return {
+            "pooled_output": bert_outputs["pooled_output"],
+            "sequence_output_pos_encoded": tf.pad(
+                sequence_output_with_positional_encoding,
+                [[0, 0], [0, self.max_sequence_length - sequence_length], [0, 0]]
+            )
+        }
+
+    def sequence_length_bucket_of(self, tokenized_inputs: tf.RaggedTensor) -> int:
+        """
+        Find the shortest sequence length bucket which fits every input of the batch without truncation.
+        Besides the word pieces, a packed input contains the [CLS] and [SEP] tokens, and the positional encoding reads the position after the last token.
+        :param tokenized_inputs: The word pieces of each word of each input.
+        :return:
+        """
+        word_piece_counts = tokenized_inputs.merge_dims(-2, -1).row_lengths()
+        required_length = int(tf.reduce_max(word_piece_counts)) + 3 if word_piece_counts.shape[0] > 0 else 0
+        return next(
+            (bucket for bucket in self.sequence_length_buckets if bucket >= required_length), self.max_sequence_length
+        )
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import sqlite3
+import threading
+
+import numpy as np
+import tensorflow as tf
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Tuple
+
+
+class EmbeddingCache:
+    """
+    The embedding cache stores the embeddings of lifted utterances, so that each lifted utterance is embedded only once per embedding configuration.
+    Recently used embeddings are kept in an in-memory LRU cache, all embeddings are persisted in a SQLite database shared across runs and processes.
+    """
+    def __init__(self, database_location: Path, max_memory_entries: int = 4096):
+        """
+        :param database_location: The SQLite file the embeddings are persisted in.
+        :param max_memory_entries: The maximal number of embeddings kept in memory.
+        """
+        self.database_location = Path(database_location)
+        self.max_memory_entries = max_memory_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.database_location.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.database_location), check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, dtype TEXT, shape TEXT, data BLOB)"
+        )
+        self.connection.commit()
+
+    def wrap(self, embedding_function, *configuration):
+        """
+        Wrap an embedding function, such that its outputs are looked up in the cache before being computed.
+        :param embedding_function: A function mapping a lifted utterance to its embedding and a list of lifted utterances to the list of their embeddings.
+        :param configuration: Everything the output of the embedding function depends on besides the input, e.g. the hub model link, the embedding type and the pooling arguments.
+        :return: The cached embedding function.
+        """
+        configuration = [str(component) for component in configuration]
+
+        def func(inputs):
+            if not isinstance(inputs, str):
+                return self.lookup_or_embed_many(embedding_function, configuration, list(inputs))
+            key = self.key_of(configuration, inputs)
+            embedding = self.lookup(key)
+            if embedding is None:
+                embedding = np.array(embedding_function(inputs))
+                self.store(key, embedding)
+            return tf.constant(embedding)
+        return func
+
+    def lookup_or_embed_many(self, embedding_function, configuration, inputs):
+        """
+        Look up the embeddings of many lifted utterances and embed all missing ones in a single call of the embedding function.
+        :param embedding_function:
+        :param configuration:
+        :param inputs:
+        :return: The embedding of each lifted utterance.
+        """
+        embeddings = [self.lookup(self.key_of(configuration, lifted_input)) for lifted_input in inputs]
+        missing_inputs = list(dict.fromkeys(
+            lifted_input for lifted_input, embedding in zip(inputs, embeddings) if embedding is None
+        ))
+        if len(missing_inputs) > 0:
+            missing_embeddings = {
+                lifted_input: np.array(embedding)
+                for lifted_input, embedding in zip(missing_inputs, embedding_function(missing_inputs))
+            }
+            self.store_many([
+                (self.key_of(configuration, lifted_input), embedding)
+                for lifted_input, embedding in missing_embeddings.items()
+            ])
+            embeddings = [
+                embedding if embedding is not None else missing_embeddings[lifted_input]
+                for lifted_input, embedding in zip(inputs, embeddings)
+            ]
+        return [tf.constant(embedding) for embedding in embeddings]
+
+    @staticmethod
+    def key_of(configuration, inputs: str) -> str:
+        return hashlib.sha256(json.dumps(configuration + [inputs]).encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> np.ndarray | None:
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+            row = self.connection.execute(
+                "SELECT dtype, shape, data FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        dtype, shape, data = row
+        embedding = np.frombuffer(data, dtype=np.dtype(dtype)).reshape(json.loads(shape))
+        self.remember(key, embedding)
+        return embedding
+
+    def store(self, key: str, embedding: np.ndarray):
+        self.store_many([(key, embedding)])
+
+    def store_many(self, keyed_embeddings: List[Tuple[str, np.ndarray]]):
+        for key, embedding in keyed_embeddings:
+            self.remember(key, embedding)
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                [
+                    (key, embedding.dtype.str, json.dumps(embedding.shape), embedding.tobytes())
+                    for key, embedding in keyed_embeddings
+                ]
+            )
+            self.connection.commit()
+
+    def remember(self, key: str, embedding: np.ndarray):
+        with self.lock:
+            self.memory[key] = embedding
+            self.memory.move_to_end(key)
+            if len(self.memory) > self.max_memory_entries:
+                self.memory.popitem(last=False)
@@ -1,173 +1,236 @@
-from typing import Tuple, List
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import tensorflow as tf
 
 from src.candidate_resolver.configurables.resolver_configurable_enums import EmbeddingType
 from src.candidate_resolver.embedding.BertEmbedder import BertEmbedder
-from src.candidate_resolver.embedding.embedding_utils import summed_quadratic_kernel
+from src.candidate_resolver.embedding.EmbeddingCache import EmbeddingCache
+from src.candidate_resolver.embedding.embedding_utils import batched_self_summed_quadratic_kernel
 from src.candidate_resolver.embedding.postprocessing.postprocessors import CustomPooling, PoolingType, PaddingType
 
 
 class EmbeddingFunctionProvider:
-
+    """
+    Provides the embedding functions of all embedding types.
+    Each embedding function maps a lifted utterance to its embedding, or a list of lifted utterances to the list of their embeddings.
+    Lists are embedded by the embedder in batches, each embedding in the list equals the embedding of the single utterance.
+    Every embedding type is derived from an output of a single embedder pass, hence :py:meth:`embed_multiple` embeds many types at the cost of one.
+    """
     def __init__(self,
                  embedder: BertEmbedder,
                  pooling_window_shape: Tuple = (128, 32),
                  number_of_strides: Tuple = (1, 32),
-                 pooling_padding_type: PaddingType = PaddingType.VALID):
+                 pooling_padding_type: PaddingType = PaddingType.VALID,
+                 embedding_cache: EmbeddingCache = None,
+                 batch_size: int = 32,
+                 dynamic_sequence_length: bool = False,
+                 co_embedded_types: List[EmbeddingType] = None):
+        """
+        :param embedder:
+        :param pooling_window_shape:
+        :param number_of_strides:
+        :param pooling_padding_type:
+        :param embedding_cache: If given, all selected embedding functions look up their outputs in this cache.
+        :param batch_size: The maximal number of lifted utterances the embedder embeds at once.
+        :param dynamic_sequence_length: If true, the outputs which do not depend on the padding are computed with :py:meth:`BertEmbedder.call_trimmed`.
+        :param co_embedded_types: If given together with an embedding cache, whenever an embedding misses the cache,
+            these embedding types are derived from the same embedder pass and stored in the cache as well.
+        """
         self.embedder = embedder
+        self.batch_size = batch_size
+        self.dynamic_sequence_length = dynamic_sequence_length
+        self.embedding_cache = embedding_cache
+        self.co_embedded_types = co_embedded_types if co_embedded_types is not None else []
         self.pooling_arguments = [pooling_window_shape, number_of_strides, pooling_padding_type]
         self.pooling_window_shape = pooling_window_shape
         self.number_of_strides = number_of_strides
         self.pooling_padding_type = pooling_padding_type
+        self.postprocessors: Dict[Tuple, Tuple[str, Callable[[tf.Tensor], tf.Tensor]]] = {}
 
     def select_embedding_function(self,
                                   embedding_type: EmbeddingType,
                                   pooling_window_shape: Tuple = None,
                                   number_of_strides: Tuple = None,
                                   padding_type: PaddingType = None):
+        pooling_arguments = tuple(self.resolve_pooling_arguments([pooling_window_shape, number_of_strides, padding_type]))
+        if self.embedding_cache is None:
+            return self.select_uncached_embedding_function(embedding_type, *pooling_arguments)
+        co_embedded_types = [
+            co_embedded_type for co_embedded_type in dict.fromkeys(self.co_embedded_types)
+            if co_embedded_type != embedding_type
+        ]
+
+        def func(inputs):
+            embeddings = self.embed_multiple(inputs, [embedding_type] + co_embedded_types, *pooling_arguments)
+            for co_embedded_type in co_embedded_types:
+                self.store_in_embedding_cache(inputs, co_embedded_type, pooling_arguments, embeddings[co_embedded_type])
+            return embeddings[embedding_type]
+        return self.embedding_cache.wrap(func, *self.cache_configuration_of(embedding_type, pooling_arguments))
+
+    def select_uncached_embedding_function(self,
+                                           embedding_type: EmbeddingType,
+                                           pooling_window_shape: Tuple = None,
+                                           number_of_strides: Tuple = None,
+                                           padding_type: PaddingType = None):
+        return lambda inputs: self.embed_multiple(
+            inputs, [embedding_type], pooling_window_shape, number_of_strides, padding_type
+        )[embedding_type]
+
+    def embed_multiple(self,
+                       inputs: str | List[str],
+                       embedding_types: Iterable[EmbeddingType],
+                       pooling_window_shape: Tuple = None,
+                       number_of_strides: Tuple = None,
+                       padding_type: PaddingType = None) \
+            -> Dict[EmbeddingType, tf.Tensor | List[tf.Tensor]]:
+        """
+        Embed a lifted utterance or each of many lifted utterances with several embedding types,
+        running the embedder and each postprocessor once per batch.
+        :param inputs: A lifted utterance or a list of lifted utterances.
+        :param embedding_types: The embedding types to derive from the embedder outputs.
+        :param pooling_window_shape:
+        :param number_of_strides:
+        :param padding_type:
+        :return: For each embedding type the embedding of the single lifted utterance, or the list of embeddings of the lifted utterances.
+        """
+        pooling_arguments = tuple(self.resolve_pooling_arguments([pooling_window_shape, number_of_strides, padding_type]))
+        postprocessors = {
+            embedding_type: self.get_postprocessor(embedding_type, *pooling_arguments)
+            for embedding_type in embedding_types
+        }
+        output_names = {output_name for output_name, _ in postprocessors.values()}
+        embed = self.embedder.call_trimmed \
+            if self.dynamic_sequence_length and output_names <= set(BertEmbedder.padding_independent_outputs) \
+            else self.embedder
+        if isinstance(inputs, str):
+            outputs = embed(inputs)
+            return {
+                embedding_type: postprocess(outputs[output_name])[0]
+                for embedding_type, (output_name, postprocess) in postprocessors.items()
+            }
+        embeddings = {embedding_type: [] for embedding_type in postprocessors}
+        for start in range(0, len(inputs), self.batch_size):
+            batch_outputs = embed(tf.constant(inputs[start:start + self.batch_size], dtype=tf.string))
+            for embedding_type, (output_name, postprocess) in postprocessors.items():
+                embeddings[embedding_type] += tf.unstack(postprocess(batch_outputs[output_name]))
+        return embeddings
+
+    def get_postprocessor(self, embedding_type: EmbeddingType, *pooling_arguments) \
+            -> Tuple[str, Callable[[tf.Tensor], tf.Tensor]]:
+        """
+        Get the memoised postprocessor of :py:meth:`select_postprocessor`, such that compiled poolings are traced only once.
+        :param embedding_type:
+        :param pooling_arguments:
+        :return:
+        """
+        key = (embedding_type, *pooling_arguments)
+        if key not in self.postprocessors:
+            self.postprocessors[key] = self.select_postprocessor(embedding_type, *pooling_arguments)
+        return self.postprocessors[key]
+
+    def select_postprocessor(self,
+                             embedding_type: EmbeddingType,
+                             pooling_window_shape: Tuple,
+                             number_of_strides: Tuple,
+                             padding_type: PaddingType) -> Tuple[str, Callable[[tf.Tensor], tf.Tensor]]:
+        """
+        Select how an embedding type is derived from the embedder outputs of a batch of lifted utterances.
+        :param embedding_type:
+        :param pooling_window_shape:
+        :param number_of_strides:
+        :param padding_type:
+        :return: The name of the embedder output and the function mapping this output of a batch to the embeddings stacked along the batch axis.
+        """
         match embedding_type:
             case EmbeddingType.SEQUENCE:
-                return self.get_sequence_embedding_function()
+                return "sequence_output", self.keep_batch_axis
             case EmbeddingType.BERT_POOLED:
-                return self.get_bert_pooled_embedding_function()
+                return "pooled_output", self.keep_batch_axis
             case EmbeddingType.SEQUENCE_POSITIONAL:
-                return self.get_sequence_positional_encoded_embedding_function()
+                return "sequence_output_pos_encoded", self.keep_batch_axis
             case EmbeddingType.MAX_POOLED:
-                return self.get_max_pooled_embedding_function(
-                    *self.resolve_pooling_arguments([
-                        pooling_window_shape,
-                        number_of_strides,
-                        padding_type
-                    ])
+                return "sequence_output", self.get_pooling(
+                    PoolingType.MAX, pooling_window_shape, number_of_strides, padding_type
                 )
             case EmbeddingType.AVG_POOLED:
-                return self.get_avg_pooled_embedding_function(
-                    *self.resolve_pooling_arguments([
-                        pooling_window_shape,
-                        number_of_strides,
-                        padding_type
-                    ])
+                return "sequence_output", self.get_pooling(
+                    PoolingType.AVG, pooling_window_shape, number_of_strides, padding_type
                 )
             case EmbeddingType.MAX_POOLED_POSITIONAL:
-                return self.get_max_pooled_positional_encoded_embedding_function(
-                    *self.resolve_pooling_arguments([
-                        pooling_window_shape,
-                        number_of_strides,
-                        padding_type
-                    ])
+                return "sequence_output_pos_encoded", self.get_pooling(
+                    PoolingType.MAX, pooling_window_shape, number_of_strides, padding_type
                 )
             case EmbeddingType.AVG_POOLED_POSITIONAL:
-                return self.get_avg_pooled_positional_encoded_embedding_function(
-                    *self.resolve_pooling_arguments([
-                        pooling_window_shape,
-                        number_of_strides,
-                        padding_type
-                    ])
+                return "sequence_output_pos_encoded", self.get_pooling(
+                    PoolingType.AVG, pooling_window_shape, number_of_strides, padding_type
                 )
             case EmbeddingType.SUMMED_QUADRATIC_KERNEL_SEQUENCE:
-                return self.get_summed_quadratic_kernel_of_sequence_embedding_function()
+                return "sequence_output", batched_self_summed_quadratic_kernel
             case EmbeddingType.SUMMED_QUADRATIC_KERNEL_SEQUENCE_POSITIONAL:
-                return self.get_summed_quadratic_kernel_of_positional_encoded_sequence_embedding_function()
+                return "sequence_output_pos_encoded", batched_self_summed_quadratic_kernel
             case EmbeddingType.SUMMED_QUADRATIC_KERNEL_BERT_POOLED:
-                return self.get_summed_quadratic_kernel_of_bert_pooled_embedding_function()
+                return "pooled_output", batched_self_summed_quadratic_kernel
             case _:
                 # noinspection PyUnreachableCode
                 raise NotImplementedError(f"No function supplier for {embedding_type} exists!")
 
-    def get_summed_quadratic_kernel_of_sequence_embedding_function(self):
-        return self.get_summed_quadratic_kernel_function(
-            self.get_sequence_embedding_function()
-        )
-
-    def get_summed_quadratic_kernel_of_positional_encoded_sequence_embedding_function(self):
-        return self.get_summed_quadratic_kernel_function(
-            self.get_sequence_positional_encoded_embedding_function()
-        )
-
-    def get_summed_quadratic_kernel_of_bert_pooled_embedding_function(self):
-        return self.get_summed_quadratic_kernel_function(
-            self.get_bert_pooled_embedding_function()
-        )
-
-    def get_max_pooled_positional_encoded_embedding_function(
-            self,
-            pooling_window_shape,
-            number_of_strides,
-            padding_type):
-        return self.get_pooled_embedding_function(
-            self.get_sequence_positional_encoded_embedding_function(),
-            PoolingType.MAX,
-            pooling_window_shape,
-            number_of_strides,
-            padding_type
-        )
-
-    def get_avg_pooled_positional_encoded_embedding_function(
-            self,
-            pooling_window_shape: Tuple,
-            number_of_strides: Tuple,
-            padding_type: PaddingType):
-        return self.get_pooled_embedding_function(
-            self.get_sequence_positional_encoded_embedding_function(),
-            PoolingType.AVG,
-            pooling_window_shape,
-            number_of_strides,
-            padding_type
-        )
-
-    def get_max_pooled_embedding_function(self,
-                                          pooling_window_shape,
-                                          number_of_strides,
-                                          padding_type):
-        return self.get_pooled_embedding_function(
-            self.get_sequence_embedding_function(),
-            PoolingType.MAX,
-            pooling_window_shape,
-            number_of_strides,
-            padding_type
-        )
-
-    def get_avg_pooled_embedding_function(self,
-                                          pooling_window_shape: Tuple,
-                                          number_of_strides: Tuple,
-                                          padding_type: PaddingType):
-        return self.get_pooled_embedding_function(
-            self.get_sequence_embedding_function(),
-            PoolingType.AVG,
+    @staticmethod
+    def get_pooling(pooling_type: PoolingType,
+                    pooling_window_shape: Tuple,
+                    number_of_strides: Tuple,
+                    padding_type: PaddingType) -> Callable[[tf.Tensor], tf.Tensor]:
+        return CustomPooling(
             pooling_window_shape,
             number_of_strides,
+            pooling_type,
             padding_type
-        )
-
-    @staticmethod
-    def get_pooled_embedding_function(
-            sequence_embedding_function,
-            pooling_type: PoolingType,
-            pooling_window_shape: Tuple,
-            number_of_strides: Tuple,
-            padding_type: PaddingType):
-        def func(inputs):
-            sequence_embedder = sequence_embedding_function
-            pooling = CustomPooling(
-                pooling_window_shape,
-                number_of_strides,
-                pooling_type,
-                padding_type
-            )
-            return pooling(sequence_embedder(inputs))
-        return func
+        ).call_batch
 
     @staticmethod
-    def get_summed_quadratic_kernel_function(embedding_function):
-        return lambda inputs: summed_quadratic_kernel(embedding_function(inputs), embedding_function(inputs))
-
-    def get_bert_pooled_embedding_function(self):
-        return lambda inputs: self.embedder(inputs)["pooled_output"]
-
-    def get_sequence_embedding_function(self):
-        return lambda inputs: self.embedder(inputs)["sequence_output"]
-
-    def get_sequence_positional_encoded_embedding_function(self):
-        return lambda inputs: self.embedder(inputs)["sequence_output_pos_encoded"]
+    def keep_batch_axis(embeddings: tf.Tensor) -> tf.Tensor:
+        """
+        Keep the batch axis of size one in the embedding of each lifted utterance, as the embedder outputs of a single lifted utterance have it.
+        :param embeddings:
+        :return:
+        """
+        return embeddings[:, tf.newaxis]
+
+    def cache_configuration_of(self, embedding_type: EmbeddingType, pooling_arguments: Tuple) -> List:
+        """
+        The configuration the cached embeddings of the embedding type are keyed with.
+        Embedding types derived from :py:attr:`BertEmbedder.padding_independent_outputs` are shared between both sequence length modes,
+        the embeddings of all other types are keyed with the sequence length mode of this provider.
+        :param embedding_type:
+        :param pooling_arguments:
+        :return:
+        """
+        return [
+            self.embedder.tfhub_preprocessor_link,
+            self.embedder.tfhub_bert_link,
+            embedding_type.value,
+            pooling_arguments,
+            self.sequence_length_mode_of(embedding_type, pooling_arguments)
+        ]
+
+    def sequence_length_mode_of(self, embedding_type: EmbeddingType, pooling_arguments: Tuple) -> str:
+        output_name, _ = self.get_postprocessor(embedding_type, *pooling_arguments)
+        if output_name in BertEmbedder.padding_independent_outputs:
+            return "any sequence length"
+        return "dynamic sequence length" if self.dynamic_sequence_length else "maximal sequence length"
+
+    def store_in_embedding_cache(self,
+                                 inputs: str | List[str],
+                                 embedding_type: EmbeddingType,
+                                 pooling_arguments: Tuple,
+                                 embeddings: tf.Tensor | List[tf.Tensor]):
+        configuration = [str(component) for component in self.cache_configuration_of(embedding_type, pooling_arguments)]
+        if isinstance(inputs, str):
+            inputs, embeddings = [inputs], [embeddings]
+        self.embedding_cache.store_many([
+            (EmbeddingCache.key_of(configuration, lifted_input), np.array(embedding))
+            for lifted_input, embedding in dict(zip(inputs, embeddings)).items()
+        ])
 
     def resolve_pooling_arguments(self, pooling_arguments: List):
         return (
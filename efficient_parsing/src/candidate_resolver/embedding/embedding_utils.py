@@ -1,6 +1,8 @@
 import numpy as np
 import tensorflow as tf
 
+from functools import lru_cache
+
 from sklearn import metrics
 
 
@@ -14,37 +16,68 @@ def cosine_similarity(x, y) -> float:
     return float((x @ y.T)/(np.linalg.norm(x) * np.linalg.norm(y.T)).flatten())
 
 
+@tf.function
 def summed_quadratic_kernel(x: tf.Tensor, y: tf.Tensor) -> tf.Tensor:
+    """
+    Compiled once per input shape, the inputs are embeddings of a single lifted utterance.
+    :param x:
+    :param y:
+    :return:
+    """
     return tf.reduce_sum(
         tf.tensordot(
-            tf.squeeze(x) if len(x.shape) > 2 else tf.transpose(x),
-            tf.transpose(tf.squeeze(y)) if len(y.shape) > 2 else y, axes=1
+            tf.squeeze(x, axis=0) if len(x.shape) > 2 else tf.transpose(x),
+            tf.transpose(tf.squeeze(y, axis=0)) if len(y.shape) > 2 else y, axes=1
         )**2, 0
     )
 
 
+@tf.function
+def batched_self_summed_quadratic_kernel(x: tf.Tensor) -> tf.Tensor:
+    """
+    The summed quadratic kernel of each embedding of a batch with itself, equal to :py:func:`summed_quadratic_kernel` of each embedding.
+    Compiled once per input shape.
+    :param x: A batch of embeddings of shape (batch size, sequence length, hidden size) or (batch size, hidden size).
+    :return: The kernels stacked along the batch axis.
+    """
+    if len(x.shape) > 2:
+        return tf.reduce_sum(tf.einsum("bij,bkj->bik", x, x)**2, 1)
+    return tf.reduce_sum(tf.einsum("bi,bk->bik", x, x)**2, 1)
+
+
 def apply_positional_encoding(sequence_output: tf.Tensor, input_mask: tf.Tensor) -> tf.Tensor:
-    sequence_length = get_last_nonzero_index(input_mask.numpy())
-    max_sequence_length = sequence_output.shape[1]
-    embedded_sequence = sequence_output[:, sequence_length, :]
-    embedded_sequence += positional_encoding(
-        max_sequence_length,
-        sequence_output.shape[2]
-    )[:, :sequence_length, :]
-    return tf.pad(embedded_sequence,
-                  tf.constant([
-                      [0, 0],
-                      [0, int(max_sequence_length - sequence_length)],
-                      [0, 0]
-                  ], dtype=tf.int32),
-                  "CONSTANT")
-
-
-def get_last_nonzero_index(tensor: tf.Tensor) -> int:
-    zero = tf.constant(0, dtype=tf.int32)
-    where = tf.not_equal(tensor, zero)
-    indices = tf.where(where)
-    return tf.shape(indices)[0]
+    """
+    Apply the positional encoding to each row of a batch, where every row has its own sequence length.
+    The positions after the sequence length of a row are zero.
+    :param sequence_output: The sequence output of BERT of shape (batch size, max sequence length, hidden size).
+    :param input_mask: The input mask of shape (batch size, max sequence length).
+    :return:
+    """
+    return compiled_positional_encoder(sequence_output.shape[1], sequence_output.shape[2])(sequence_output, input_mask)
+
+
+@lru_cache(maxsize=None)
+def compiled_positional_encoder(max_sequence_length: int, hidden_size: int):
+    """
+    Compile :py:func:`apply_positional_encoding` for a sequence length and hidden size, with the positional encoding table computed once.
+    :param max_sequence_length:
+    :param hidden_size:
+    :return: A graph function taking the sequence output and the input mask of a batch of any size.
+    """
+    positional_encoding_table = positional_encoding(max_sequence_length, hidden_size)
+
+    @tf.function(input_signature=[
+        tf.TensorSpec(shape=[None, max_sequence_length, hidden_size], dtype=tf.float32),
+        tf.TensorSpec(shape=[None, max_sequence_length], dtype=tf.int32)
+    ])
+    def func(sequence_output, input_mask):
+        sequence_lengths = tf.math.count_nonzero(input_mask, axis=1, dtype=tf.int32)
+        embedded_sequence = tf.gather(sequence_output, sequence_lengths, axis=1, batch_dims=1)[:, tf.newaxis, :]
+        embedded_sequence += positional_encoding_table
+        return embedded_sequence * tf.sequence_mask(
+            sequence_lengths, max_sequence_length, dtype=embedded_sequence.dtype
+        )[:, :, tf.newaxis]
+    return func
 
 
 def positional_encoding(max_position: int, d_model: int) -> tf.Tensor:
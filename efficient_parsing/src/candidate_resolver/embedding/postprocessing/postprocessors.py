@@ -15,6 +15,10 @@ class PaddingType(Enum):
 
 
 class CustomPooling:
+    """
+    Pools the first embedding of a batch of sequence embeddings, or with :py:meth:`call_batch` each embedding of the batch.
+    The pooling is compiled to a graph once per pooling instance.
+    """
     def __init__(self, pooling_window_shape: Tuple,
                  number_of_strides: Tuple,
                  pooling_type: PoolingType,
@@ -24,18 +28,43 @@ class CustomPooling:
         self.number_of_strides = number_of_strides
         self.pooling_type = pooling_type.value
         self.padding_type = padding_type.value
+        self.pool = tf.function(
+            self.pool_first_embedding,
+            input_signature=[tf.TensorSpec(shape=[None, None, None], dtype=tf.float32)]
+        )
+        self.pool_batch = tf.function(
+            self.pool_embeddings,
+            input_signature=[tf.TensorSpec(shape=[None, None, None], dtype=tf.float32)]
+        )
 
     def __call__(self, inputs: tf.Tensor) -> tf.Tensor:
-        input_rank = tf.rank(inputs)
+        input_rank = inputs.shape.rank
         if input_rank == 3:
-            inputs = inputs[:, :, :, tf.newaxis]
-            pooled = tf.nn.pool(
-                input=inputs,
-                window_shape=self.pooling_window_shape,
-                pooling_type=self.pooling_type,
-                strides=self.number_of_strides,
-                padding=self.padding_type
-            )
-            return pooled[0, :, :, 0]
+            return self.pool(inputs)
         else:
             raise ValueError(f"Inputs are required to have rank 3, given {input_rank}")
+
+    def call_batch(self, inputs: tf.Tensor) -> tf.Tensor:
+        """
+        Pool each embedding of a batch of sequence embeddings.
+        :param inputs:
+        :return: The pooled embeddings stacked along the batch axis.
+        """
+        input_rank = inputs.shape.rank
+        if input_rank == 3:
+            return self.pool_batch(inputs)
+        else:
+            raise ValueError(f"Inputs are required to have rank 3, given {input_rank}")
+
+    def pool_first_embedding(self, inputs: tf.Tensor) -> tf.Tensor:
+        return self.pool_embeddings(inputs)[0]
+
+    def pool_embeddings(self, inputs: tf.Tensor) -> tf.Tensor:
+        pooled = tf.nn.pool(
+            input=inputs[:, :, :, tf.newaxis],
+            window_shape=self.pooling_window_shape,
+            pooling_type=self.pooling_type,
+            strides=self.number_of_strides,
+            padding=self.padding_type
+        )
+        return pooled[:, :, :, 0]
@@ -9,6 +9,7 @@ from pathlib import Path
 
 from src.candidate_resolver.CandidateResolver import CandidateResolver
 from src.candidate_resolver.Regressor import Regressor
+from src.candidate_resolver.configurables.resolver_configurable_enums import NearestNeighborBackendType
 from src.candidate_resolver.scorers import euclidean_distance
 
 
@@ -23,7 +24,8 @@ def create_and_train_model(
         relative_not_sure_threshold: int = 4,
         regressor_num_epochs: int = 1,
         regressor_learning_rate: float = 1e-5,
-        take_best_guess: bool = False):
+        take_best_guess: bool = False,
+        nearest_neighbor_backend_type: NearestNeighborBackendType = NearestNeighborBackendType.EXACT):
     embedded_dataset = embedd_dataset(
         dataset, lifted_instance_column_name, lifted_program_column_name, embedding_function
     )
@@ -36,7 +38,8 @@ def create_and_train_model(
                               model_location,
                               self_attention=self_attention,
                               nearest_neighbor_metric_learner=metric_learner,
-                              take_best_guess=take_best_guess)
+                              take_best_guess=take_best_guess,
+                              nearest_neighbor_backend_type=nearest_neighbor_backend_type)
     max_positive_distance = train_model(model, embedded_dataset, 0, 1, regressor_num_epochs)
     model.not_sure_threshold = max_positive_distance / relative_not_sure_threshold if relative_not_sure_threshold > 0 \
         else float("inf")
@@ -49,7 +52,9 @@ def embedd_dataset(dataset: pd.DataFrame,
                    lifted_program_column_name: str,
                    embedding_function) -> pd.DataFrame:
     embedded_dataset = pd.DataFrame()
-    embedded_dataset[lifted_instance_column_name] = dataset[lifted_instance_column_name].apply(embedding_function)
+    embedded_dataset[lifted_instance_column_name] = pd.Series(
+        embedding_function(list(dataset[lifted_instance_column_name])), index=dataset.index, dtype=object
+    )
     embedded_dataset[lifted_program_column_name] = dataset[lifted_program_column_name]
     return embedded_dataset
 
@@ -1,11 +1,16 @@
+import itertools
 import re
 
 from enum import Enum
+from functools import lru_cache
 from typing import Tuple, Dict, Any, Iterable, List
 
 from src.datamodel.TableType import TableType
 
 
+TEMPLATE_TAG_PATTERN = re.compile(r"\[(,)?(.+?)(\d)?]")
+
+
 class Multiplicity(Enum):
     NONE = 0
     SINGLE = 1
@@ -16,6 +21,7 @@ class FunctionTemplate:
     """
     Grounds program templates by filling in the inputs extracted by the abstractor.
     (e.g., SELECT([table], [,column]) -> SELECT(['time_slots'], ['date']))
+    Function templates are immutable once created, :py:meth:`compile` therefore parses each lifted program and condition pair only once.
     """
     def __init__(self, lifted_program: str, lifted_condition: str = None):
         self.assigment = self.extract_assignment(lifted_program)
@@ -28,9 +34,20 @@ class FunctionTemplate:
                 lifted_condition, self.condition_assignment
             )
 
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def compile(cls, lifted_program: str, lifted_condition: str = None):
+        """
+        Get the function template of a lifted program and lifted condition, parsing it only on the first request.
+        :param lifted_program:
+        :param lifted_condition:
+        :return:
+        """
+        return cls(lifted_program, lifted_condition)
+
     @classmethod
     def ground_lifted_program(cls, lifted_program: str, inputs: Dict[str, Any], lifted_condition: str = None) -> str:
-        function_template = cls(lifted_program, lifted_condition)
+        function_template = cls.compile(lifted_program, lifted_condition)
         return function_template.resolve_input(inputs)
 
     @staticmethod
@@ -51,7 +68,7 @@ class FunctionTemplate:
                 assignment[(table_type, number)] = ([position], multiplicity)
             else:
                 assignment[(table_type, number)][0].append(position)
-        return assignment
+        return {key: (tuple(positions), multiplicity) for key, (positions, multiplicity) in assignment.items()}
 
     @staticmethod
     def extract_standard_fill_tuples_from(assignment: Dict[Tuple[str, int], Tuple[List[int], Multiplicity]]) \
@@ -68,7 +85,7 @@ class FunctionTemplate:
                 (position, f"[{multiplicity_token}{table_type}{number if number != 0 else ''}]")
             )
         standard_fill_tuples.sort(key=lambda fill_tuple: fill_tuple[0])
-        return standard_fill_tuples
+        return tuple(standard_fill_tuples)
 
     @staticmethod
     def create_output_function_template_from(lifted_functions: str,
@@ -77,21 +94,13 @@ class FunctionTemplate:
         """
         This method creates a format string for the given function template.
         (e.g. "SELECT([table], [,column])" -> "SELECT({0}, {1})")
+        Every DSL type tag is replaced by its position in a single pass, the same way the positions of the assignment are enumerated.
         :param lifted_functions:
         :param assignment: The function template input signature.
         :return:
         """
-        for key, value in assignment.items():
-            table_type, type_pack_number = key
-            template_positions, multiplicity = value
-            program = re.compile(r"\[(,)?" + f"({table_type})" + r"(\d)?]")
-            for template_position in template_positions:
-                lifted_functions = program.sub(
-                    "{%s}" % template_position,
-                    lifted_functions,
-                    count=1
-                )
-        return lifted_functions
+        positions = itertools.count()
+        return TEMPLATE_TAG_PATTERN.sub(lambda match: "{%s}" % next(positions), lifted_functions)
 
     @staticmethod
     def extract_input_signature(output_function_template: str) -> Iterable[Tuple[str, int, Multiplicity]]:
@@ -100,7 +109,7 @@ class FunctionTemplate:
         :param output_function_template:
         :return:
         """
-        for match in re.finditer(r"\[(,)?(.+?)(\d)?]", output_function_template):
+        for match in TEMPLATE_TAG_PATTERN.finditer(output_function_template):
             yield FunctionTemplate.extract_input_parameter_information_from(match)
 
     @staticmethod
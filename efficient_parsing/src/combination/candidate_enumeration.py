@@ -0,0 +1,48 @@
+"""
+This module enumerates combinations of grounded program line candidates in the order of their mean probability.
+"""
+import heapq
+
+from typing import Iterator, List, Tuple
+
+
+def best_program_line_combinations(grounded_program_line_candidates: List[List[Tuple[float, str]]]) \
+        -> Iterator[Tuple[Tuple[float, str], ...]]:
+    """
+    Lazily yield the combinations :py:func:`itertools.product` would yield, ordered by descending mean probability.
+    Each program line's candidates are sorted by probability, and a heap holds the frontier of not yet yielded combinations.
+    Taking the k best combinations therefore costs O(k * n * log(k * n)) for n program lines instead of enumerating the whole product.
+    Combinations with equal probability are yielded in the order :py:func:`itertools.product` yields them.
+    :param grounded_program_line_candidates: The (probability, grounded program line) candidates of each program line.
+    :return: Combinations with one candidate per program line.
+    """
+    sorted_indices = [
+        sorted(range(len(candidates)), key=lambda i, candidates=candidates: -float(candidates[i][0]))
+        for candidates in grounded_program_line_candidates
+    ]
+    if any(len(indices) == 0 for indices in sorted_indices):
+        return
+    start = (0,) * len(sorted_indices)
+    frontier = [combination_entry(start, grounded_program_line_candidates, sorted_indices)]
+    visited = {start}
+    while len(frontier) > 0:
+        _, original_indices, positions = heapq.heappop(frontier)
+        yield tuple(candidates[i] for candidates, i in zip(grounded_program_line_candidates, original_indices))
+        for line in range(len(positions)):
+            if positions[line] + 1 < len(sorted_indices[line]):
+                successor = positions[:line] + (positions[line] + 1,) + positions[line + 1:]
+                if successor not in visited:
+                    visited.add(successor)
+                    heapq.heappush(
+                        frontier, combination_entry(successor, grounded_program_line_candidates, sorted_indices)
+                    )
+
+
+def combination_entry(positions: Tuple[int, ...],
+                      grounded_program_line_candidates: List[List[Tuple[float, str]]],
+                      sorted_indices: List[List[int]]) -> Tuple[float, Tuple[int, ...], Tuple[int, ...]]:
+    original_indices = tuple(indices[position] for indices, position in zip(sorted_indices, positions))
+    probability_sum = sum(
+        float(candidates[i][0]) for candidates, i in zip(grounded_program_line_candidates, original_indices)
+    )
+    return -probability_sum, original_indices, positions
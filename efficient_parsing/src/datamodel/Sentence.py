@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import copy
 from typing import List, Dict, Any, Tuple
 
 from src.datamodel.Table import Table
 from src.datamodel.TableType import TableType
 from src.entity_abstractor.dependencytree.LiftableDependencyTree import LiftableDependencyTree
+from src.entity_abstractor.dependencytree.LiftingScope import LiftingScope
 from src.entity_abstractor.dependencytree.nodes.LiftableCaseDependencyTreeNode import LiftableCaseDependencyTreeNode
 from src.entity_abstractor.dependencytree.nodes.LiftableObjectDependencyTreeNode import LiftableObjectDependencyTreeNode
 from src.entity_abstractor.dependencytree.nodes.LiftableValueDependencyTreeNode import LiftableValueDependencyTreeNode
@@ -49,7 +49,8 @@ class Sentence:
         :param table: The active table in the parser's context.
         :return lifted_sentence_string, input_dict, lifted_condition:
         """
-        return self.lifted(table), self.get_input_dict(table), self.case_lifted(table)
+        with LiftingScope():
+            return self.lifted(table), self.get_input_dict(table), self.case_lifted(table)
 
     def lifted(self, table: Table = None) -> str:
         """
@@ -57,9 +58,8 @@ class Sentence:
         :param table: The active table in the parser's context.
         :return:
         """
-        nonempty_lifted_strings = [
-            node.lifted(table) for node in self.dependency_tree.nodes() if node.lifted(table) != ""
-        ]
+        lifted_strings = [node.memoised_lifted(table) for node in self.dependency_tree.nodes()]
+        nonempty_lifted_strings = [lifted_string for lifted_string in lifted_strings if lifted_string != ""]
         return " ".join(nonempty_lifted_strings)
 
     def case_lifted(self, table: Table = None) -> str:
@@ -70,9 +70,8 @@ class Sentence:
         """
         res = []
         for case in self.cases:
-            case_nodes = [
-                node.case_lifted(table) for node in case.nodes() if node.case_lifted(table) != ""
-            ]
+            case_lifted_strings = [node.memoised_case_lifted(table) for node in case.nodes()]
+            case_nodes = [case_lifted_string for case_lifted_string in case_lifted_strings if case_lifted_string != ""]
             if len(case_nodes) > 1:
                 res.append(" ".join(case_nodes))
         return res[0] if len(res) > 0 else None
@@ -151,8 +150,9 @@ class Sentence:
             for obj in obj_pack:
                 if obj.get_table_type(table) == TableType.COLUMN and obj.is_oblique_predecessor_of_case():
                     for normalized_compound in normalized_compounds(obj):
-                        if table.is_column_name(normalized_compound) and normalized_compound not in column_names:
-                            column_names.append(normalized_compound)
+                        column_name = table.column_name_of(normalized_compound)
+                        if column_name is not None and column_name not in column_names:
+                            column_names.append(column_name)
         return column_names
 
     def get_lifted_values(self) -> List[str]:
@@ -160,8 +160,7 @@ class Sentence:
         Finds the values inside the conditions of the sentence.
         :return:
         """
-        all_values = copy.deepcopy(self.values)
-        all_values.sort(key=lambda value_node: value_node.depth)
+        all_values = sorted(self.values, key=lambda value_node: value_node.depth)
         res = []
         for case in self.cases:
             value = [
@@ -224,8 +223,9 @@ class Sentence:
         :return:
         """
         for normalized_compound in normalized_compounds(obj):
-            if table.is_column_name(normalized_compound) and normalized_compound not in column_name_pack:
-                column_name_pack.append(normalized_compound)
+            column_name = table.column_name_of(normalized_compound)
+            if column_name is not None and column_name not in column_name_pack:
+                column_name_pack.append(column_name)
         return column_name_pack
 
     @staticmethod
@@ -238,7 +238,6 @@ class Sentence:
         :param table_name_pack: An enumeration of table names.
         :return:
         """
-        for compound in compounds(obj):
-            if table.is_table_name(compound):
-                table_name_pack.append(compound)
+        if table.is_table(obj):
+            table_name_pack.append(table.table_name)
         return table_name_pack
@@ -2,21 +2,27 @@ from pathlib import Path
 
 import pandas as pd
 
-from typing import List
+from typing import Dict, List
 
 from src.datamodel.TableType import TableType
 from src.entity_abstractor.dependencytree.nodes.LiftableObjectDependencyTreeNode import LiftableObjectDependencyTreeNode
-from src.entity_abstractor.utils import normalized_compounds, compounds
+from src.entity_abstractor.utils import normalized_compounds, compounds, compound_versions_of
 from src.util.string_utils import normalize
 
 
 class Table:
+    """
+    A table of an application context. The naming convention variants of the normalized column names and of the table name are indexed by the name they spell,
+    such that typing an object node costs a constant number of dictionary lookups regardless of the number of columns.
+    The indices are built when the table is created or its columns are set.
+    """
     def __init__(self,
                  data: pd.DataFrame,
                  table_name: str,
                  application_context: str):
         self.data = data
         self.table_name = table_name
+        self.table_name_index = self.create_variant_index([table_name])
         self.columns = [normalize(column_name) for column_name in list(data.columns)]
         self.application_context = application_context
 
@@ -31,25 +37,63 @@ class Table:
         table_object.columns = [normalize(column_name) for column_name in columns]
         return table_object
 
+    @property
+    def columns(self) -> List[str]:
+        """
+        The normalized column names in the order of the table columns.
+        :return:
+        """
+        return self.normalized_columns
+
+    @columns.setter
+    def columns(self, normalized_columns: List[str]):
+        self.normalized_columns = list(normalized_columns)
+        self.column_name_index = self.create_variant_index(self.normalized_columns)
+
+    @staticmethod
+    def create_variant_index(names: List[str]) -> Dict[str, str]:
+        """
+        Map every snake case, camel case and compound variant of the names to the name it spells.
+        The words of a name are separated by spaces, as in normalized column names, or underscores, as in table names.
+        A name always maps to itself, even if it is also a variant of another name.
+        :param names:
+        :return:
+        """
+        index = {name: name for name in names}
+        for name in names:
+            words = name.replace("_", " ").split()
+            if len(words) == 0:
+                continue
+            for variant in compound_versions_of(tuple(words)):
+                index.setdefault(variant, name)
+        return index
+
     def get_table_type(self, node: LiftableObjectDependencyTreeNode):
         if self.is_column(node):
             return TableType.COLUMN
         elif self.is_table(node):
             return TableType.TABLE
-        else:
-            return TableType.NO_TABLE_TYPE
+        return TableType.NO_TABLE_TYPE
 
     def is_column(self, node: LiftableObjectDependencyTreeNode) -> bool:
-        return any([self.is_column_name(compound) for compound in normalized_compounds(node)])
+        return any(self.is_column_name(compound) for compound in normalized_compounds(node))
 
     def is_table(self, node: LiftableObjectDependencyTreeNode) -> bool:
-        return any([self.is_table_name(compound) for compound in compounds(node)])
+        return any(self.is_table_name(compound) for compound in compounds(node))
 
     def is_column_name(self, string) -> bool:
-        return string in self.columns
+        return string in self.column_name_index
 
     def is_table_name(self, string) -> bool:
-        return string == self.table_name
+        return string in self.table_name_index
+
+    def column_name_of(self, string) -> str | None:
+        """
+        Get the normalized column name spelled by the string in any naming convention.
+        :param string:
+        :return: The column name or None if the string spells no column name.
+        """
+        return self.column_name_index.get(string)
 
     def get_contexts(self) -> List[str]:
         return [self.table_name, self.application_context]
@@ -1,106 +1,67 @@
 import requests
 import subprocess
 import shlex
-import time
 
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple
 
-from nltk import CoreNLPDependencyParser
-from requests.exceptions import ConnectionError
+from src.entity_abstractor.CoreNLPClient import CoreNLPClient
+from src.entity_abstractor.CoreNLPServerPool import CoreNLPServerPool
+from src.entity_abstractor.DependencyParseAbstractor import DependencyParseAbstractor
 
-from src.datamodel.Sentence import Sentence
-from src.datamodel.Table import Table
-from src.entity_abstractor.dependencytree.creation.LiftableDependencyTreeCreator import LiftableDependencyTreeCreator
-from src.entity_abstractor.dependencytree.creation.LiftableDependencyTreeNodeFactory import \
-    LiftableDependencyTreeNodeFactory
 
-
-class Abstractor:
+class Abstractor(DependencyParseAbstractor):
     """
     This class abstracts natural language utterances by removing the pertinent objects from a sentence and inserting DSL data types in their place.
     (e.g.: Create the table time slots. -> Create [table])
     To do this, the class starts a Stanford CoreNLP server which provides dependency parses to the abstraction system.
     The sentence dependency parses are used by the Sentence class and other classes to annotate the words and lift the correct words for the abstraction mechanism.
+    The dependency parses are cached on disk per CoreNLP version, hence a warm cache does not require a running server.
     """
-    def __init__(self):
-        self.dependency_parser = CoreNLPDependencyParser()
+    core_nlp_version = "stanford-corenlp-4.2.2"
 
-    @staticmethod
-    def start_core_nlp_server() -> None:
+    def __init__(self, core_nlp_url: str | List[str] = "http://localhost:9000"):
+        """
+        :param core_nlp_url: The url of the CoreNLP server or the urls of several servers, e.g. of a :py:class:`CoreNLPServerPool`.
+        """
+        super().__init__()
+        core_nlp_urls = [core_nlp_url] if isinstance(core_nlp_url, str) else list(core_nlp_url)
+        self.core_nlp_client = CoreNLPClient(core_nlp_urls)
+
+    @classmethod
+    def start_core_nlp_server(cls) -> None:
         """
         Starts the Stanford CoreNLP server in this project.
         :return:
         """
-        server_path = Path(__file__).parents[3] / "res" / "abstraction" / "stanford-corenlp-4.2.2"
         command = "java -mx4g -cp '*' edu.stanford.nlp.pipeline.StanfordCoreNLPServer " + \
-                  "-preload tokenize,ssplit,pos,lemma,ner,parse,depparse -status_port 9000 -port 9000 -timeout 50000 &"
+                  "-preload tokenize,ssplit,pos,lemma,ner,parse,depparse -status_port 9000 -port 9000 -timeout 50000"
         subprocess.Popen(
             shlex.split(command),
-            stdout=subprocess.PIPE, cwd=server_path
+            stdout=subprocess.DEVNULL, cwd=cls.core_nlp_server_path()
         )
 
-    @staticmethod
-    def wait_until_server_reachable() -> None:
+    @classmethod
+    def create_core_nlp_server_pool(cls, number_of_servers: int = None) -> CoreNLPServerPool:
         """
-        This method checks if the server is reachable by trying to obtain a dependency parse for the sentence:
-        "The quick brown fox jumped over the lazy dog."
+        Creates a pool of Stanford CoreNLP servers in this project, which is started with :py:meth:`CoreNLPServerPool.start` or as a context manager.
+        :param number_of_servers: The number of servers, by default one per four cores.
         :return:
         """
-        response_code = 0
-        while response_code != 200:
-            time.sleep(5)
-            try:
-                response_code = requests.post(
-                    'http://[::]:9000/?properties={"annotators":"tokenize,ssplit,pos","outputFormat":"json"}',
-                    data={'data': 'The quick brown fox jumped over the lazy dog.'}
-                ).status_code
-            except ConnectionError as error:
-                pass
-        time.sleep(10)
+        return CoreNLPServerPool(cls.core_nlp_server_path(), number_of_servers)
 
-    def abstract(self, utterance: str, table: Table) -> List[Tuple[str, Dict[str, Any], str]]:
-        """
-        Abstract a given natural language utterance.
-        :param utterance: The natural language utterance
-        :param table: The table on which the operation is done
-        :return lifted_string, extracted_inputs, lifted_condition: The lifted string, all recognized inputs in a dict and the lifted condition if one exists.
-        """
-        sentence, subsentences = self.extract_sentence_instances_from(utterance)
-        return [sentence.abstract(table)] if len(subsentences) == 0 \
-            else [subsentence.abstract(table) for subsentence in subsentences]
+    @classmethod
+    def core_nlp_server_path(cls) -> Path:
+        return Path(__file__).parents[3] / "res" / "abstraction" / cls.core_nlp_version
 
-    def extract_sentence_instances_from(self, utterance: str) -> Tuple[Sentence, List[Sentence]]:
-        """
-        Finds all subsentences and creates Sentence instances from them.
-        :param utterance: The natural language utterance
-        :return whole_sentence, subsentences: The sentence instances for both the whole sentence and all subsentences.
-        """
-        raw_nodes = self.extract_raw_dependency_parse_nodes_from(utterance)
-        dependency_tree_creator = LiftableDependencyTreeCreator(raw_nodes, LiftableDependencyTreeNodeFactory
-                                                                .get_default_instance())
-        sentence_tree = dependency_tree_creator.create_tree()
-
-        return (
-            Sentence.create_sentence(sentence_tree),
-            [
-                Sentence.create_sentence(subsentence_tree)
-                for subsentence_tree in dependency_tree_creator.create_subsentence_trees_of(sentence_tree)
-            ]
-        )
-
-    def extract_raw_dependency_parse_nodes_from(self, utterance: str) -> List[Tuple[str, str, int, str]]:
+    @staticmethod
+    def wait_until_server_reachable(timeout: float = 300) -> None:
         """
-        Translates the dependency parse in the conll format to tuples which can be translated by the system to dependency tree nodes.
-        :param utterance:
+        This method waits until the status port of the server reports that the server is ready.
+        :param timeout: The maximal time in seconds to wait.
         :return:
         """
-        parse, = self.dependency_parser.raw_parse(utterance)
-        res = []
-        for pos, conll_line in enumerate(parse.to_conll(4).split("\n")[:-1]):
-            word, word_type, parent_id, dependency = tuple(conll_line.split())
-            res.append((word, word_type, int(parent_id), dependency))
-        return res
+        CoreNLPServerPool.wait_until_ready("http://localhost:9000", timeout)
 
     @staticmethod
     def stop_core_nlp_server():
@@ -109,5 +70,18 @@ class Abstractor:
         :return:
         """
         url = "http://localhost:9000/shutdown?"
-        shutdown_key = subprocess.getoutput("cat /tmp/corenlp.shutdown")
+        # The server writes the key to java.io.tmpdir, which is /tmp on Linux regardless of the TMPDIR of this process.
+        shutdown_key = Path("/tmp/corenlp.shutdown").read_text().strip()
         requests.post(url, data="", params={"key": shutdown_key})
+
+    def parse_dependencies_of(self, utterances: List[str]) -> List[List[Tuple[str, str, int, str]]]:
+        """
+        Parses the utterances with the CoreNLP server, bypassing the dependency parse cache.
+        :param utterances:
+        :return:
+        """
+        return self.core_nlp_client.parse_many(utterances)
+
+    @property
+    def parser_version(self) -> str:
+        return self.core_nlp_version
@@ -0,0 +1,115 @@
+import json
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+
+class CoreNLPClient:
+    """
+    A client for the Stanford CoreNLP server which keeps a pool of persistent connections.
+    Many utterances are sent in a single request as a document containing one utterance per line.
+    The server splits the document only at line breaks, hence each utterance is parsed as one sentence, the same way a single request per utterance would parse it.
+    Given the urls of several servers, e.g. of a :py:class:`CoreNLPServerPool`, each request is sent to the server with the fewest requests in flight.
+    """
+    properties = {
+        "outputFormat": "json",
+        "annotators": "tokenize,pos,lemma,ssplit,depparse",
+        "ssplit.eolonly": "true",
+        "tokenize.whitespace": "false"
+    }
+
+    def __init__(self,
+                 url: str | List[str] = "http://localhost:9000",
+                 pool_size: int = 4,
+                 batch_size: int = 64,
+                 timeout: float = 60):
+        """
+        :param url: The url of the CoreNLP server or the urls of several CoreNLP servers.
+        :param pool_size: The number of persistent connections per server, the maximal number of concurrent requests grows with the number of servers.
+        :param batch_size: The maximal number of utterances sent in one request.
+        :param timeout: The timeout of a single request in seconds.
+        """
+        self.urls = [url] if isinstance(url, str) else list(url)
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.requests_in_flight = [0] * len(self.urls)
+        self.dispatch_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(self.urls), pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def parse(self, utterance: str) -> List[Tuple[str, str, int, str]]:
+        """
+        Get the dependency parse of a single utterance.
+        :param utterance:
+        :return: A (word, part of speech tag, parent id, dependency) tuple for each word, like the conll format of the parse.
+        """
+        return self.parse_many([utterance])[0]
+
+    def parse_many(self, utterances: List[str]) -> List[List[Tuple[str, str, int, str]]]:
+        """
+        Get the dependency parses of many utterances. The batches are sent concurrently over the connection pool.
+        :param utterances:
+        :return: The parse of each utterance as returned by :py:meth:`parse`.
+        """
+        batches = [utterances[i:i + self.batch_size] for i in range(0, len(utterances), self.batch_size)]
+        max_concurrent_requests = self.pool_size * len(self.urls)
+        if len(batches) <= 1 or max_concurrent_requests <= 1:
+            parsed_batches = [self.parse_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=max_concurrent_requests) as executor:
+                parsed_batches = list(executor.map(self.parse_batch, batches))
+        return [parse for parsed_batch in parsed_batches for parse in parsed_batch]
+
+    def parse_batch(self, utterances: List[str]) -> List[List[Tuple[str, str, int, str]]]:
+        utterances = [" ".join(utterance.splitlines()) for utterance in utterances]
+        parsed_sentences = self.request_parse_of("\n".join(utterances))["sentences"]
+        if len(parsed_sentences) != len(utterances):
+            # An utterance without any token yields no sentence, hence the sentences cannot be aligned.
+            return [
+                self.dependency_tuples_from(self.request_parse_of(utterance)["sentences"][0])
+                for utterance in utterances
+            ]
+        return [self.dependency_tuples_from(sentence) for sentence in parsed_sentences]
+
+    def request_parse_of(self, document: str) -> dict:
+        server = self.acquire_least_loaded_server()
+        try:
+            response = self.session.post(
+                self.urls[server],
+                params={"properties": json.dumps(self.properties)},
+                data=document.encode("utf8"),
+                headers={"Content-Type": "text/plain; charset=utf8"},
+                timeout=self.timeout
+            )
+        finally:
+            with self.dispatch_lock:
+                self.requests_in_flight[server] -= 1
+        response.raise_for_status()
+        return response.json()
+
+    def acquire_least_loaded_server(self) -> int:
+        with self.dispatch_lock:
+            server = min(range(len(self.urls)), key=lambda i: self.requests_in_flight[i])
+            self.requests_in_flight[server] += 1
+            return server
+
+    @staticmethod
+    def dependency_tuples_from(sentence: dict) -> List[Tuple[str, str, int, str]]:
+        """
+        Translate the basic dependencies of a parsed sentence to tuples ordered by the position of the dependent word.
+        :param sentence:
+        :return:
+        """
+        res = []
+        for dependency in sorted(sentence["basicDependencies"], key=lambda dependency: dependency["dependent"]):
+            token = sentence["tokens"][dependency["dependent"] - 1]
+            res.append((token["word"], token["pos"], int(dependency["governor"]), dependency["dep"]))
+        return res
@@ -0,0 +1,128 @@
+import os
+import socket
+import subprocess
+import time
+
+from pathlib import Path
+from typing import List
+
+import requests
+
+from requests.exceptions import RequestException
+
+
+class CoreNLPServerPool:
+    """
+    The server pool starts several Stanford CoreNLP servers on free ports, such that the abstraction of many utterances scales across cores.
+    The servers are started concurrently and are ready as soon as the status port of each server reports it, which is probed with exponential backoff.
+    A :py:class:`CoreNLPClient` created with the urls of the pool dispatches each request to the least loaded server.
+    """
+    preloaded_annotators = "tokenize,ssplit,pos,lemma,depparse"
+
+    def __init__(self,
+                 server_path: Path,
+                 number_of_servers: int = None,
+                 memory: str = "4g",
+                 server_timeout: int = 50000):
+        """
+        :param server_path: The folder containing the CoreNLP jars.
+        :param number_of_servers: The number of servers, by default one per four cores.
+        :param memory: The maximal heap size of each server.
+        :param server_timeout: The timeout of a single annotation inside a server in milliseconds.
+        """
+        self.server_path = Path(server_path)
+        self.number_of_servers = number_of_servers if number_of_servers is not None \
+            else max(1, (os.cpu_count() or 1) // 4)
+        self.memory = memory
+        self.server_timeout = server_timeout
+        self.ports: List[int] = []
+        self.processes: List[subprocess.Popen] = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def urls(self) -> List[str]:
+        return [f"http://localhost:{port}" for port in self.ports]
+
+    def start(self, startup_timeout: float = 300) -> None:
+        """
+        Start all servers and wait until each of them is ready.
+        :param startup_timeout: The maximal time in seconds to wait for a server.
+        :return:
+        """
+        threads = max(1, (os.cpu_count() or 1) // self.number_of_servers)
+        for _ in range(self.number_of_servers):
+            port = self.find_free_port()
+            command = [
+                "java", f"-mx{self.memory}", "-cp", "*", "edu.stanford.nlp.pipeline.StanfordCoreNLPServer",
+                "-preload", self.preloaded_annotators, "-port", str(port), "-status_port", str(port),
+                "-threads", str(threads), "-timeout", str(self.server_timeout)
+            ]
+            self.processes.append(subprocess.Popen(
+                command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=self.server_path
+            ))
+            self.ports.append(port)
+        try:
+            for url, process in zip(self.urls, self.processes):
+                self.wait_until_ready(url, startup_timeout, process)
+        except Exception:
+            self.stop()
+            raise
+
+    def stop(self, shutdown_timeout: float = 10) -> None:
+        """
+        Terminate all servers, killing those which did not exit in time.
+        :param shutdown_timeout: The time in seconds each server is given to exit.
+        :return:
+        """
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            try:
+                process.wait(timeout=shutdown_timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        self.processes = []
+        self.ports = []
+
+    @staticmethod
+    def wait_until_ready(url: str,
+                         timeout: float = 300,
+                         process: subprocess.Popen = None,
+                         initial_delay: float = 0.1,
+                         max_delay: float = 2) -> None:
+        """
+        Poll the readiness endpoint of the status port of a server with exponentially growing delays.
+        :param url: The url of the status port of the server.
+        :param timeout: The maximal time in seconds to wait.
+        :param process: The process of the server, if it exits the server will never become ready.
+        :param initial_delay: The delay in seconds before the second probe.
+        :param max_delay: The maximal delay in seconds between two probes.
+        :return:
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        while True:
+            try:
+                if requests.get(f"{url}/ready", timeout=max_delay).status_code == 200:
+                    return
+            except RequestException:
+                pass
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"The CoreNLP server at {url} exited with code {process.returncode}.")
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"The CoreNLP server at {url} was not ready after {timeout} seconds.")
+            time.sleep(delay)
+            delay = min(2 * delay, max_delay)
+
+    @staticmethod
+    def find_free_port() -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as free_socket:
+            free_socket.bind(("localhost", 0))
+            return free_socket.getsockname()[1]
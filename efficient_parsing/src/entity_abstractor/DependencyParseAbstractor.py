@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Tuple
+
+from src.datamodel.Sentence import Sentence
+from src.datamodel.Table import Table
+from src.entity_abstractor.DependencyParseCache import DependencyParseCache
+from src.entity_abstractor.dependencytree.creation.LiftableDependencyTreeCreator import LiftableDependencyTreeCreator
+from src.entity_abstractor.dependencytree.creation.LiftableDependencyTreeNodeFactory import \
+    LiftableDependencyTreeNodeFactory
+from src.util.Storage import Storage
+
+
+class DependencyParseAbstractor:
+    """
+    This class abstracts natural language utterances based on their dependency parses, independently of the dependency parser.
+    Subclasses obtain the parses in :py:meth:`parse_dependencies_of` and name the parser with :py:attr:`parser_version`.
+    The dependency parses are cached on disk per parser version, such that each utterance is parsed only once.
+    """
+    def __init__(self):
+        self.dependency_parse_cache = DependencyParseCache(Storage().cache_location / "dependency_parses.sqlite")
+
+    def abstract(self, utterance: str, table: Table) -> List[Tuple[str, Dict[str, Any], str]]:
+        """
+        Abstract a given natural language utterance.
+        :param utterance: The natural language utterance
+        :param table: The table on which the operation is done
+        :return lifted_string, extracted_inputs, lifted_condition: The lifted string, all recognized inputs in a dict and the lifted condition if one exists.
+        """
+        return self.abstract_sentence_instances(*self.extract_sentence_instances_from(utterance), table)
+
+    def abstract_many(self, utterances: List[str], table: Table) -> List[List[Tuple[str, Dict[str, Any], str]]]:
+        """
+        Abstract many natural language utterances, obtaining their dependency parses with as few parser calls as possible.
+        :param utterances: The natural language utterances
+        :param table: The table on which the operations are done
+        :return: The output of :py:meth:`abstract` for each utterance.
+        """
+        return [
+            self.abstract_sentence_instances(*self.create_sentence_instances_from(raw_nodes), table)
+            for raw_nodes in self.extract_raw_dependency_parse_nodes_of_many(utterances)
+        ]
+
+    @staticmethod
+    def abstract_sentence_instances(sentence: Sentence, subsentences: List[Sentence], table: Table) \
+            -> List[Tuple[str, Dict[str, Any], str]]:
+        return [sentence.abstract(table)] if len(subsentences) == 0 \
+            else [subsentence.abstract(table) for subsentence in subsentences]
+
+    def extract_sentence_instances_from(self, utterance: str) -> Tuple[Sentence, List[Sentence]]:
+        """
+        Finds all subsentences and creates Sentence instances from them.
+        :param utterance: The natural language utterance
+        :return whole_sentence, subsentences: The sentence instances for both the whole sentence and all subsentences.
+        """
+        return self.create_sentence_instances_from(self.extract_raw_dependency_parse_nodes_from(utterance))
+
+    @staticmethod
+    def create_sentence_instances_from(raw_nodes: List[Tuple[str, str, int, str]]) -> Tuple[Sentence, List[Sentence]]:
+        dependency_tree_creator = LiftableDependencyTreeCreator(raw_nodes, LiftableDependencyTreeNodeFactory
+                                                                .get_default_instance())
+        sentence_tree = dependency_tree_creator.create_tree()
+
+        return (
+            Sentence.create_sentence(sentence_tree),
+            [
+                Sentence.create_sentence(subsentence_tree)
+                for subsentence_tree in dependency_tree_creator.create_subsentence_trees_of(sentence_tree)
+            ]
+        )
+
+    def extract_raw_dependency_parse_nodes_from(self, utterance: str) -> List[Tuple[str, str, int, str]]:
+        """
+        Obtains the dependency parse as tuples which can be translated by the system to dependency tree nodes.
+        The tuples contain the same information as the conll format of the parse.
+        :param utterance:
+        :return:
+        """
+        return self.extract_raw_dependency_parse_nodes_of_many([utterance])[0]
+
+    def extract_raw_dependency_parse_nodes_of_many(self, utterances: List[str]) -> List[List[Tuple[str, str, int, str]]]:
+        """
+        Obtains the dependency parse tuples of many utterances. Only utterances missing in the dependency parse cache are parsed.
+        :param utterances:
+        :return:
+        """
+        parses = [self.dependency_parse_cache.lookup(self.parser_version, utterance) for utterance in utterances]
+        unparsed_utterances = list(dict.fromkeys(
+            utterance for utterance, parse in zip(utterances, parses) if parse is None
+        ))
+        if len(unparsed_utterances) > 0:
+            new_parses = self.parse_dependencies_of(unparsed_utterances)
+            self.dependency_parse_cache.store_many(self.parser_version, unparsed_utterances, new_parses)
+            new_parses_by_utterance = dict(zip(unparsed_utterances, new_parses))
+            parses = [
+                parse if parse is not None else new_parses_by_utterance[utterance]
+                for utterance, parse in zip(utterances, parses)
+            ]
+        return parses
+
+    def parse_dependencies_of(self, utterances: List[str]) -> List[List[Tuple[str, str, int, str]]]:
+        """
+        Parses the utterances, bypassing the dependency parse cache.
+        :param utterances:
+        :return: A (word, part of speech tag, parent id, dependency) tuple for each word of each utterance.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not parse dependencies!")
+
+    @property
+    def parser_version(self) -> str:
+        raise NotImplementedError(f"{type(self).__name__} does not name its dependency parser!")
@@ -0,0 +1,60 @@
+import json
+import sqlite3
+import threading
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Tuple
+
+
+class DependencyParseCache:
+    """
+    The dependency parse cache stores the raw dependency parse nodes of utterances per CoreNLP version, so that each utterance is parsed only once.
+    Recently used parses are kept in an in-memory LRU cache, all parses are persisted in a SQLite database shared across runs and processes.
+    """
+    def __init__(self, database_location: Path, max_memory_entries: int = 4096):
+        """
+        :param database_location: The SQLite file the dependency parses are persisted in.
+        :param max_memory_entries: The maximal number of parses kept in memory.
+        """
+        self.database_location = Path(database_location)
+        self.max_memory_entries = max_memory_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.database_location.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.database_location), check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS dependency_parses "
+            "(version TEXT, utterance TEXT, parse TEXT, PRIMARY KEY (version, utterance))"
+        )
+        self.connection.commit()
+
+    def lookup(self, version: str, utterance: str) -> List[Tuple[str, str, int, str]] | None:
+        with self.lock:
+            if (version, utterance) in self.memory:
+                self.memory.move_to_end((version, utterance))
+                return self.memory[version, utterance]
+            row = self.connection.execute(
+                "SELECT parse FROM dependency_parses WHERE version = ? AND utterance = ?", (version, utterance)
+            ).fetchone()
+            if row is None:
+                return None
+            parse = [tuple(node) for node in json.loads(row[0])]
+            self.remember(version, utterance, parse)
+            return parse
+
+    def store_many(self, version: str, utterances: List[str], parses: List[List[Tuple[str, str, int, str]]]):
+        with self.lock:
+            for utterance, parse in zip(utterances, parses):
+                self.remember(version, utterance, [tuple(node) for node in parse])
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO dependency_parses VALUES (?, ?, ?)",
+                [(version, utterance, json.dumps(parse)) for utterance, parse in zip(utterances, parses)]
+            )
+            self.connection.commit()
+
+    def remember(self, version: str, utterance: str, parse: List[Tuple[str, str, int, str]]):
+        self.memory[version, utterance] = parse
+        self.memory.move_to_end((version, utterance))
+        if len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
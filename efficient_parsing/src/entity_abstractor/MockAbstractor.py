@@ -12,12 +12,29 @@ class MockAbstractor:
     """
     This class provides a perfect abstraction mechanism to measure the impact of abstraction on parse performance.
     For this it uses the dataset which provides all inputs and the lifted instance for a given utterance.
+    The dataset rows are indexed by query and condition id, hence abstracting an utterance is a dictionary lookup.
     """
+    shared_instance = None
+
     def __init__(self):
         storage = Storage()
         self.input_data, self.condition_data = storage.load_abstraction_recombination_data()
         self.composition_input_data, self.composition_condition_data = \
             storage.load_composition_abstraction_recombination_data()
+        self.input_index = self.create_index(self.input_data, "query")
+        self.condition_index = self.create_index(self.condition_data, "condition id")
+        self.composition_input_index = self.create_index(self.composition_input_data, "query")
+        self.composition_condition_index = self.create_index(self.composition_condition_data, "condition id")
+
+    @classmethod
+    def get_shared_instance(cls):
+        """
+        Get the mock abstractor shared by the whole process, which loads the dataset only once.
+        :return:
+        """
+        if cls.shared_instance is None:
+            cls.shared_instance = cls()
+        return cls.shared_instance
 
     @classmethod
     def abstract_utterance(cls, utterance: str) -> List[Tuple[str, Dict[str, Any], str]]:
@@ -26,9 +43,22 @@ class MockAbstractor:
         :param utterance:
         :return:
         """
-        abstractor = MockAbstractor()
+        abstractor = cls.get_shared_instance()
         return abstractor.abstract(utterance)
 
+    @staticmethod
+    def create_index(data: pd.DataFrame, key_column: str) -> Dict[Any, Dict[str, Any]]:
+        """
+        Map every key to the first dataset row containing it, as a dictionary from column names to values.
+        :param data:
+        :param key_column:
+        :return:
+        """
+        index = {}
+        for row in data.to_dict("records"):
+            index.setdefault(row[key_column], row)
+        return index
+
     def abstract(self, utterance: str, table: Table = None) -> List[Tuple[str, Dict[str, Any], str]]:
         """
         Abstract a given natural language utterance.
@@ -36,62 +66,59 @@ class MockAbstractor:
         :param table: The table on which the operation is done
         :return lifted_string, extracted_inputs, lifted_condition: The lifted string, all recognized inputs in a dict and the lifted condition if one exists.
         """
-        filtered_data_set_example = self.input_data[self.input_data["query"] == utterance]
-        if len(filtered_data_set_example.index) != 0:
-            lifted_condition, condition_inputs = self.get_condition_input_if_possible(filtered_data_set_example)
+        data_set_example = self.input_index.get(utterance)
+        if data_set_example is not None:
+            lifted_condition, condition_inputs = self.get_condition_input_if_possible(data_set_example)
         else:
-            filtered_data_set_example = self.composition_input_data[self.composition_input_data["query"] == utterance]
+            data_set_example = self.composition_input_index[utterance]
             lifted_condition, condition_inputs = \
-                self.get_composition_condition_input_if_possible(filtered_data_set_example)
-        lifted_instance = filtered_data_set_example["Lifted instance"].values[0]
-        column_input = filtered_data_set_example["column"].values[0] \
-            if filtered_data_set_example["column"].values[0] != [[]] else []
-        table_input = filtered_data_set_example["table"].values[0]
+                self.get_composition_condition_input_if_possible(data_set_example)
+        lifted_instance = data_set_example["Lifted instance"]
+        column_input = data_set_example["column"] if data_set_example["column"] != [[]] else []
+        table_input = data_set_example["table"]
         inputs = self.pack_inputs(column_input, table_input, condition_inputs)
         return [(lifted_instance, inputs, lifted_condition)]
 
-    def get_condition_input_if_possible(self, filtered_data_set_example: pd.Series) \
+    def abstract_many(self, utterances: List[str], table: Table = None) -> List[List[Tuple[str, Dict[str, Any], str]]]:
+        """
+        Abstract many natural language utterances.
+        :param utterances: The natural language utterances
+        :param table: The table on which the operations are done
+        :return: The output of :py:meth:`abstract` for each utterance.
+        """
+        return [self.abstract(utterance, table) for utterance in utterances]
+
+    def get_condition_input_if_possible(self, data_set_example: Dict[str, Any]) \
             -> Tuple[str, List[Tuple[str, str]]]:
         """
         Finds the lifted condition as well as the respective inputs of this condition.
-        :param filtered_data_set_example:
+        :param data_set_example:
         :return lifted_condition, condition_inputs: The condition inputs are a list of dictionaries which have DSL data type identifiers as keys and the respective value for this data type from the natural language instance as values.
         """
-        if filtered_data_set_example["condition id"].values[0] != -1:
-            filtered_data_set_example = filtered_data_set_example.merge(
-                self.condition_data[
-                    self.condition_data["condition id"] == filtered_data_set_example["condition id"].values[0]
-                ]
-            )
-            return self.extract_condition_data(filtered_data_set_example)
+        if data_set_example["condition id"] != -1:
+            return self.extract_condition_data(self.condition_index[data_set_example["condition id"]])
         return None, None
 
-    def get_composition_condition_input_if_possible(self, filtered_data_set_example: pd.Series):
+    def get_composition_condition_input_if_possible(self, data_set_example: Dict[str, Any]):
         """
         Does the same as the function above but looks in the composite dataset rather than the atomic action dataset.
-        :param filtered_data_set_example:
+        :param data_set_example:
         :return lifted_condition, condition_inputs:
         """
-        if filtered_data_set_example["condition id"].values[0] != -1:
-            filtered_data_set_example = filtered_data_set_example.merge(
-                self.composition_condition_data[
-                    self.composition_condition_data["condition id"] ==
-                    filtered_data_set_example["condition id"].values[0]
-                ]
-            )
-            return self.extract_condition_data(filtered_data_set_example)
+        if data_set_example["condition id"] != -1:
+            return self.extract_condition_data(self.composition_condition_index[data_set_example["condition id"]])
         return None, None
 
     @staticmethod
-    def extract_condition_data(filtered_data_set_example: pd.Series):
+    def extract_condition_data(condition_example: Dict[str, Any]):
         """
         Extracts the pertinent information for abstraction from a dataset row.
-        :param filtered_data_set_example: the dataset row corresponding to the utterance given.
+        :param condition_example: the condition dataset row corresponding to the utterance given.
         :return lifted_condition, condition_inputs:
         """
-        lifted_condition = filtered_data_set_example["Lifted condition"].values[0]
-        column_condition_inputs = filtered_data_set_example["condition column"].values[0]
-        value_condition_inputs = filtered_data_set_example["condition value"].values[0]
+        lifted_condition = condition_example["Lifted condition"]
+        column_condition_inputs = condition_example["condition column"]
+        value_condition_inputs = condition_example["condition value"]
         condition_inputs = [
             {
                 TableType.COLUMN.value: column_condition_input,
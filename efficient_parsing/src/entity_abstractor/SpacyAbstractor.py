@@ -0,0 +1,126 @@
+from typing import List, Tuple
+
+import spacy
+
+from src.entity_abstractor.DependencyParseAbstractor import DependencyParseAbstractor
+
+
+class SpacyAbstractor(DependencyParseAbstractor):
+    """
+    This abstractor obtains the dependency parses from an in-process spaCy pipeline instead of the Stanford CoreNLP server.
+    spaCy's English models annotate ClearNLP dependencies, which are translated to the universal dependencies CoreNLP annotates:
+    Prepositions are attached as case to their object, which is attached as obl or nmod to the head of the preposition,
+    copulas are attached as cop to their predicate and the remaining labels are renamed.
+    """
+    dependency_mapping = {
+        "dobj": "obj",
+        "dative": "iobj",
+        "attr": "obj",
+        "acomp": "xcomp",
+        "oprd": "xcomp",
+        "relcl": "acl:relcl",
+        "nsubjpass": "nsubj:pass",
+        "csubjpass": "csubj:pass",
+        "auxpass": "aux:pass",
+        "poss": "nmod:poss",
+        "neg": "advmod",
+        "quantmod": "advmod",
+        "npadvmod": "obl:npmod",
+        "prt": "compound:prt",
+        "predet": "det:predet",
+        "preconj": "cc:preconj",
+        "intj": "discourse",
+        "meta": "dep",
+        "prep": "advmod",
+        "agent": "advmod",
+        "pobj": "obl",
+        "pcomp": "advcl"
+    }
+    preposition_dependencies = ("prep", "agent")
+    predicate_dependencies = ("attr", "acomp")
+    nominal_parts_of_speech = ("NOUN", "PROPN", "PRON", "NUM")
+
+    def __init__(self, model_name: str = "en_core_web_sm", batch_size: int = 64):
+        """
+        :param model_name: The name of the spaCy pipeline which annotates the dependencies.
+        :param batch_size: The number of utterances spaCy parses at once.
+        """
+        super().__init__()
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.nlp = spacy.load(model_name, disable=["ner"])
+
+    def parse_dependencies_of(self, utterances: List[str]) -> List[List[Tuple[str, str, int, str]]]:
+        """
+        Parses the utterances with spaCy, bypassing the dependency parse cache.
+        :param utterances:
+        :return:
+        """
+        documents = self.nlp.pipe([" ".join(utterance.split()) for utterance in utterances], batch_size=self.batch_size)
+        return [
+            self.universal_dependency_tuples_from([
+                (token.text, token.tag_, token.pos_, token.lemma_, token.head.i, token.dep_) for token in document
+            ])
+            for document in documents
+        ]
+
+    @property
+    def parser_version(self) -> str:
+        return f"spacy-{spacy.__version__}-{self.model_name}"
+
+    @classmethod
+    def universal_dependency_tuples_from(cls, tokens: List[Tuple[str, str, str, str, int, str]]) \
+            -> List[Tuple[str, str, int, str]]:
+        """
+        Translate spaCy tokens to the dependency tuples of :py:meth:`DependencyParseAbstractor.extract_raw_dependency_parse_nodes_from`.
+        :param tokens: (word, tag, coarse part of speech, lemma, head index, ClearNLP dependency) of each token, a root is its own head.
+        :return: A (word, part of speech tag, parent id, universal dependency) tuple for each word.
+        """
+        heads = [head if head != i else None for i, (_, _, _, _, head, _) in enumerate(tokens)]
+        dependencies = [dependency for _, _, _, _, _, dependency in tokens]
+        roots = [i for i, head in enumerate(heads) if head is None]
+        for root in roots[1:]:
+            # The server parses each utterance as one sentence, hence further sentences become parataxes of the first.
+            heads[root], dependencies[root] = roots[0], "parataxis"
+        for i, (_, _, _, lemma, _, _) in enumerate(tokens):
+            predicates = [j for j in cls.children_of(i, heads) if dependencies[j] in cls.predicate_dependencies]
+            if lemma == "be" and len(predicates) > 0:
+                cls.promote(predicates[0], i, "cop", heads, dependencies)
+        for i in range(len(tokens)):
+            if dependencies[i] not in cls.preposition_dependencies:
+                continue
+            children = cls.children_of(i, heads)
+            objects = [j for j in children if dependencies[j] == "pobj"]
+            clauses = [j for j in children if dependencies[j] == "pcomp"]
+            if len(objects) > 0:
+                head = heads[i]
+                cls.promote(objects[0], i, "case", heads, dependencies)
+                if head is not None:
+                    dependencies[objects[0]] = "nmod" if tokens[head][2] in cls.nominal_parts_of_speech else "obl"
+            elif len(clauses) > 0:
+                cls.promote(clauses[0], i, "mark", heads, dependencies)
+        return [
+            (word, tag, heads[i] + 1 if heads[i] is not None else 0, cls.dependency_mapping.get(dependency, dependency))
+            for i, ((word, tag, _, _, _, _), dependency) in enumerate(zip(tokens, dependencies))
+        ]
+
+    @staticmethod
+    def children_of(i: int, heads: List[int | None]) -> List[int]:
+        return [j for j, head in enumerate(heads) if head == i]
+
+    @classmethod
+    def promote(cls, dependent: int, head: int, demoted_dependency: str, heads: List[int | None], dependencies: List[str]):
+        """
+        Make the dependent the head of its former head, which is attached to it with the demoted dependency.
+        The other children of the former head are attached to the dependent.
+        :param dependent:
+        :param head:
+        :param demoted_dependency:
+        :param heads:
+        :param dependencies:
+        :return:
+        """
+        for child in cls.children_of(head, heads):
+            heads[child] = dependent
+        heads[dependent], dependencies[dependent] = heads[head], dependencies[head]
+        heads[head], dependencies[head] = dependent, demoted_dependency
@@ -4,3 +4,4 @@ from enum import Enum
 class AbstractionType(Enum):
     MOCK = 0
     DEPENDENCY = 1
+    SPACY_DEPENDENCY = 2
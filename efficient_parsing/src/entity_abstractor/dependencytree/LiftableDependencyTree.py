@@ -73,6 +73,15 @@ class LiftableDependencyTree:
             node.dependency, node.__class__.__name__
         ) for node in self.nodes()])
 
+    def detached_copy(self) -> LiftableDependencyTree:
+        """
+        Copy the tree without copying anything outside of it.
+        The root of a sentence tree keeps its parent id 0, the root of a subtree loses its parent.
+        :return:
+        """
+        root_parent = self.root.parent if not isinstance(self.root.parent, LiftableDependencyTreeNode) else None
+        return LiftableDependencyTree(self.root.detached_copy(root_parent))
+
     def nodes(self) -> List[LiftableDependencyTreeNode]:
         """
         Get all nodes of the tree.
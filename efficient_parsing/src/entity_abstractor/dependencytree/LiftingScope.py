@@ -0,0 +1,46 @@
+import threading
+
+from typing import Any, Callable, Tuple
+
+
+class LiftingScope:
+    """
+    Inside a lifting scope the dependency trees are not mutated, hence the results of traversals and lookups on their nodes are memoised.
+    The abstraction of a sentence is done inside a lifting scope, whereas the creation of a sentence mutates its dependency tree and is not.
+    Scopes can be nested, the memo is dropped when the outermost scope exits. Outside a scope nothing is memoised.
+    Nodes compare by their structure and are not hashable, hence results are memoised per identity of the nodes and the memo holds a reference to them,
+    such that the identity of a node is not reused while its result is memoised.
+    """
+    state = threading.local()
+
+    def __enter__(self):
+        if getattr(self.state, "depth", 0) == 0:
+            self.state.memo = {}
+        self.state.depth = getattr(self.state, "depth", 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.state.depth -= 1
+        if self.state.depth == 0:
+            self.state.memo = None
+
+    @classmethod
+    def is_active(cls) -> bool:
+        return getattr(cls.state, "memo", None) is not None
+
+    @classmethod
+    def memoised(cls, name: str, objects: Tuple[Any, ...], compute: Callable[[], Any]) -> Any:
+        """
+        Get the memoised result of the named computation on the objects, computing it if it is not memoised or no scope is active.
+        :param name: The name of the computation.
+        :param objects: The nodes, tables or functions the computation depends on, which are identified by their identity.
+        :param compute:
+        :return:
+        """
+        memo = getattr(cls.state, "memo", None)
+        if memo is None:
+            return compute()
+        key = (name,) + tuple(id(memoised_object) for memoised_object in objects)
+        if key not in memo:
+            memo[key] = (objects, compute())
+        return memo[key][1]
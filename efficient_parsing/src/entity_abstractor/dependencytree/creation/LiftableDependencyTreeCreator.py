@@ -1,6 +1,4 @@
-import copy
-from copy import deepcopy
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from src.entity_abstractor.dependencytree.LiftableDependencyTree import LiftableDependencyTree
 from src.entity_abstractor.dependencytree.creation.LiftableDependencyTreeNodeFactory \
@@ -12,11 +10,25 @@ from src.entity_abstractor.dependencytree.nodes.LiftableDependencyTreeRootNode i
 class LiftableDependencyTreeCreator:
     """
     This class creates dependency trees from node data tuples.
+    The node data tuples are indexed by their parent id once, such that a tree is created in linear time.
     """
     def __init__(self, raw_nodes: List[Tuple[str, str, int, str]],
                  node_factory: LiftableDependencyTreeNodeFactory):
         self.raw_nodes = raw_nodes
         self.node_factory = node_factory
+        self.children_index = self.create_children_index(raw_nodes)
+
+    @staticmethod
+    def create_children_index(raw_nodes: List[Tuple[str, str, int, str]]) -> Dict[int, List[int]]:
+        """
+        Map each parent id to the conll line indices of its children in the order of the lines.
+        :param raw_nodes:
+        :return:
+        """
+        children_index = {}
+        for conll_line_index, (_, _, parent_id, _) in enumerate(raw_nodes):
+            children_index.setdefault(parent_id, []).append(conll_line_index)
+        return children_index
 
     def create_subsentence_trees_of(self, sentence_tree: LiftableDependencyTree) -> List[LiftableDependencyTree]:
         """
@@ -24,7 +36,7 @@ class LiftableDependencyTreeCreator:
         :param sentence_tree: The sentence tree of the original utterance.
         :return subsentence_trees: A list of subsentence dependency trees.
         """
-        subsentence_trees = [copy.deepcopy(sentence_tree)]
+        subsentence_trees = [sentence_tree.detached_copy()]
         for child in sentence_tree.root.children:
             if LiftableDependencyTreeRootNode.isinstance(child):
                 subsentence_trees[0], subsentence_tree = self.create_subsentence_tree_from(subsentence_trees[0], child)
@@ -41,7 +53,7 @@ class LiftableDependencyTreeCreator:
         :param root_node:
         :return:
         """
-        node_copy = deepcopy(root_node)
+        node_copy = root_node.detached_copy()
         parent_sentence_subtree = parent_sentence_tree - LiftableDependencyTree(root_node)
         node_copy = self.transform_to_sentence_root(node_copy)
         return parent_sentence_subtree, LiftableDependencyTree(node_copy)
@@ -66,9 +78,12 @@ class LiftableDependencyTreeCreator:
         return self.build_liftable_dependency_tree_from(root_node)
 
     def create_root_node(self) -> LiftableDependencyTreeNode:
-        for node_id, (word, word_type, parent_id, dependency) in enumerate(self.raw_nodes):
-            if parent_id == 0 and self.node_factory.is_root_dependency(dependency):
-                return self.node_factory.create_initial_root_node((node_id + 1, word, word_type, parent_id, dependency))
+        for conll_line_index in self.children_index.get(0, []):
+            word, word_type, parent_id, dependency = self.raw_nodes[conll_line_index]
+            if self.node_factory.is_root_dependency(dependency):
+                return self.node_factory.create_initial_root_node(
+                    (conll_line_index + 1, word, word_type, parent_id, dependency)
+                )
 
     def build_liftable_dependency_tree_from(self, root_node: LiftableDependencyTreeNode) -> LiftableDependencyTree:
         root_node = self.create_subtree(root_node)
@@ -86,7 +101,7 @@ class LiftableDependencyTreeCreator:
         :return:
         """
         child_depth = parent_node.depth + 1
-        for conll_line_index in range(len(self.raw_nodes)):
+        for conll_line_index in self.children_index.get(parent_node.node_id, []):
             parent_node = self.if_possible_create_child(parent_node, conll_line_index, child_depth)
         return parent_node
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import copy
-from typing import List, Callable, Any
+from typing import List, Callable, Any, Dict
+
+from src.entity_abstractor.dependencytree.LiftingScope import LiftingScope
 
 
 class LiftableDependencyTreeNode:
@@ -53,7 +55,23 @@ class LiftableDependencyTreeNode:
         :param table: The active table in the parser's context.
         :return:
         """
-        return self.lifted(table)
+        return self.memoised_lifted(table)
+
+    def memoised_lifted(self, table=None) -> str:
+        """
+        Get :py:meth:`lifted`, which is computed once per node and table inside a lifting scope.
+        :param table: The active table in the parser's context.
+        :return:
+        """
+        return LiftingScope.memoised("lifted", (self, table), lambda: self.lifted(table))
+
+    def memoised_case_lifted(self, table=None) -> str:
+        """
+        Get :py:meth:`case_lifted`, which is computed once per node and table inside a lifting scope.
+        :param table: The active table in the parser's context.
+        :return:
+        """
+        return LiftingScope.memoised("case_lifted", (self, table), lambda: self.case_lifted(table))
 
     def lifted(self, table=None) -> str:
         """
@@ -67,15 +85,18 @@ class LiftableDependencyTreeNode:
 
     def nodes(self) -> List[LiftableDependencyTreeNode]:
         """
-        All descendents of this node and the node itself.
+        All descendents of this node and the node itself, ordered by their position in the sentence.
         :return:
         """
-        res = [self]
-        for child in self.children:
-            if child.is_leaf():
-                res.append(child)
-            else:
-                res += child.nodes()
+        return list(LiftingScope.memoised("nodes", (self,), self.collect_nodes))
+
+    def collect_nodes(self) -> List[LiftableDependencyTreeNode]:
+        res = []
+        stack = [self]
+        while len(stack) > 0:
+            node = stack.pop()
+            res.append(node)
+            stack.extend(reversed(node.children))
         res.sort()
         return res
 
@@ -105,23 +126,64 @@ class LiftableDependencyTreeNode:
     def has_ancestor_with_property(self, property_function: Callable[[LiftableDependencyTreeNode], bool]) -> bool:
         """
         Check whether an ancestor has a property defined by the property function given to this method.
+        Inside a lifting scope, the first check memoises the result for all nodes of the tree in one pass from its root.
         :param property_function:
         :return:
         """
-        return any([property_function(ancestor) for ancestor in self.get_ancestors()])
+        if not LiftingScope.is_active():
+            return any(property_function(ancestor) for ancestor in self.get_ancestors())
+        return LiftingScope.memoised(
+            "has_ancestor_with_property", (self, property_function),
+            lambda: self.memoise_ancestor_properties_of_tree(property_function)[id(self)]
+        )
+
+    def memoise_ancestor_properties_of_tree(self, property_function: Callable[[LiftableDependencyTreeNode], bool]) \
+            -> Dict[int, bool]:
+        """
+        Check for all nodes of the tree of this node whether an ancestor has the property, and memoise the results.
+        :param property_function:
+        :return: The result per identity of the nodes.
+        """
+        root = self
+        while root.has_parent():
+            root = root.parent
+        res = {id(root): False}
+        stack = [root]
+        while len(stack) > 0:
+            node = stack.pop()
+            children_result = res[id(node)] or property_function(node)
+            for child in node.children:
+                res[id(child)] = children_result
+                LiftingScope.memoised("has_ancestor_with_property", (child, property_function), lambda: children_result)
+                stack.append(child)
+        LiftingScope.memoised("has_ancestor_with_property", (root, property_function), lambda: False)
+        return res
 
     def get_ancestors(self) -> List[LiftableDependencyTreeNode]:
         res = []
-        if self.has_parent():
-            res.append(self.parent)
-            res.extend(self.parent.get_ancestors())
+        node = self
+        while node.has_parent():
+            node = node.parent
+            res.append(node)
         return res
 
     def get_neighbors(self) -> List[LiftableDependencyTreeNode]:
-        res = copy.deepcopy(self.parent.children)
+        res = list(self.parent.children)
         res.remove(self)
         return res
 
+    def detached_copy(self, parent: Any = None) -> LiftableDependencyTreeNode:
+        """
+        Copy this node and its descendants.
+        Unlike copy.deepcopy, the parent back-pointer is not followed, hence only the subtree is copied instead of the whole connected tree.
+        :param parent: The parent of the copy, by default None, since the copy is not part of the tree of this node.
+        :return:
+        """
+        node_copy = copy.copy(self)
+        node_copy.parent = parent
+        node_copy.children = [child.detached_copy(node_copy) for child in self.children]
+        return node_copy
+
     def get_position(self) -> int:
         return self.node_id
 
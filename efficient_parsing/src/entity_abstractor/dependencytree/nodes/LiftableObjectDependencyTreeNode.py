@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List
 
 from src.datamodel.Table import TableType
+from src.entity_abstractor.dependencytree.LiftingScope import LiftingScope
 from src.entity_abstractor.dependencytree.nodes.LiftableDependencyTreeNode import LiftableDependencyTreeNode
 from src.entity_abstractor.dependencytree.nodes.LiftableValueDependencyTreeNode import LiftableValueDependencyTreeNode
 from src.util.string_utils import normalize
@@ -124,9 +125,9 @@ class LiftableObjectDependencyTreeNode(LiftableDependencyTreeNode):
         :return:
         """
         if table is not None:
-            return table.get_table_type(self)
+            return LiftingScope.memoised("table_type", (self, table), lambda: table.get_table_type(self))
         else:
-            return self.get_table_type_from_compound()
+            return LiftingScope.memoised("table_type", (self, None), self.get_table_type_from_compound)
 
     def is_object_enumeration(self, table) -> bool:
         return any([
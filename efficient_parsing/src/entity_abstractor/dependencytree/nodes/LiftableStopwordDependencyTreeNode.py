@@ -24,7 +24,7 @@ class LiftableStopwordDependencyTreeNode(LiftableDependencyTreeNode):
         :param table: The active table in the parser's context.
         :return:
         """
-        return self.lifted(table)
+        return self.memoised_lifted(table)
 
     def lifted(self, table=None):
         """
@@ -1,6 +1,8 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 
 
+from src.entity_abstractor.dependencytree.LiftingScope import LiftingScope
 from src.entity_abstractor.dependencytree.nodes.LiftableCompoundDependencyTreeNode import \
     LiftableCompoundDependencyTreeNode
 from src.entity_abstractor.dependencytree.nodes.LiftableObjectDependencyTreeNode import LiftableObjectDependencyTreeNode
@@ -9,11 +11,17 @@ from src.util.string_utils import normalize, make_snake_case, make_camel_case, m
 
 
 def compounds(object_node: LiftableObjectDependencyTreeNode):
-    return create_variable_compound_versions(compound_words(object_node, normalized=False))
+    return list(LiftingScope.memoised(
+        "compounds", (object_node,),
+        lambda: compound_versions_of(tuple(compound_words(object_node, normalized=False)))
+    ))
 
 
 def normalized_compounds(object_node: LiftableObjectDependencyTreeNode):
-    return create_variable_compound_versions(compound_words(object_node))
+    return list(LiftingScope.memoised(
+        "normalized_compounds", (object_node,),
+        lambda: compound_versions_of(tuple(compound_words(object_node)))
+    ))
 
 
 def compound_words(object_node: LiftableObjectDependencyTreeNode, normalized: bool = True) -> List[str]:
@@ -31,6 +39,11 @@ def compound_words(object_node: LiftableObjectDependencyTreeNode, normalized: bo
     return res
 
 
+@lru_cache(maxsize=16384)
+def compound_versions_of(words: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(create_variable_compound_versions(list(words)))
+
+
 def create_variable_compound_versions(words: List[str]) -> List[str]:
     return [
         make_snake_case(words),
@@ -38,7 +38,9 @@ class Measurement:
                  table_embedder_pooling_types: List[TableEmbedderPoolingType] = None,
                  table_embedding_content_configurations: List[TableEmbeddingContent] = None,
                  reranker_lambda_embedder_attachments: List[LambdaEmbedderAttached] = None,
-                 test_repetitions: int = 20):
+                 test_repetitions: int = 20,
+                 max_candidates: int = None,
+                 core_nlp_urls: List[str] = None):
         self.measurement_name = measurement_name
         self.one_shot_generalization_test = one_shot_generalization_test
         self.measurement_path = self.create_measurement_directories_if_necessary(measurement_name)
@@ -48,7 +50,8 @@ class Measurement:
             dataset_difficulties, reranker_attached_configurations, abstractor_configurations, resolver_embedding_types,
             resolver_relative_not_sure_threshold, metric_learner_types, bert_layer_types,
             table_embedder_bert_layer_types, table_embedder_pooling_types,
-            table_embedding_content_configurations, reranker_lambda_embedder_attachments, test_repetitions
+            table_embedding_content_configurations, reranker_lambda_embedder_attachments, test_repetitions,
+            max_candidates, core_nlp_urls
         )
 
     @staticmethod
@@ -63,7 +66,9 @@ class Measurement:
                                  table_embedder_pooling_types: List[TableEmbedderPoolingType],
                                  table_embedding_content_configurations: List[TableEmbeddingContent],
                                  reranker_lambda_embedder_attachments: List[LambdaEmbedderAttached],
-                                 test_repetitions: int):
+                                 test_repetitions: int,
+                                 max_candidates: int = None,
+                                 core_nlp_urls: List[str] = None):
         """
         Retrieve the test set of semantic parser pipelines.
         :param dataset_difficulties:
@@ -78,6 +83,8 @@ class Measurement:
         :param table_embedding_content_configurations:
         :param reranker_lambda_embedder_attachments:
         :param test_repetitions:
+        :param max_candidates: Passed to each :py:class:`SemanticParserPipeline`, None enumerates all combinations.
+        :param core_nlp_urls: The urls of the CoreNLP servers used by the dependency abstractors.
         :return:
         """
         pipeline_test_set_creator = PipelineTestSetCreator(
@@ -92,7 +99,9 @@ class Measurement:
             table_embedder_pooling_types=table_embedder_pooling_types,
             table_embedding_content_configurations=table_embedding_content_configurations,
             reranker_lambda_embedder_attachments=reranker_lambda_embedder_attachments,
-            test_repititions=test_repetitions
+            test_repititions=test_repetitions,
+            max_candidates=max_candidates,
+            core_nlp_urls=core_nlp_urls
         )
         return pipeline_test_set_creator.yield_pipeline_test_inputs()
 
@@ -309,7 +318,7 @@ class Measurement:
         :param condition_row:
         :return:
         """
-        abstractor = MockAbstractor()
+        abstractor = MockAbstractor.get_shared_instance()
         lifted_instance, inputs, lifted_condition = abstractor.abstract(row.query)[0]
         grounded_program = FunctionTemplate.ground_lifted_program(
             row[2], inputs, condition_row["Lifted condition DSL"].item() if condition_row is not None else None
@@ -11,6 +11,7 @@ from src.candidate_reranker.table_embedding.TableEmbedder import TableEmbedder
 from src.candidate_resolver.CandidateResolver import CandidateResolver
 from src.candidate_resolver.configurables.resolver_configurable_enums import EmbeddingType, MetricLearnerType, \
     BertKerasLayerType
+from src.candidate_resolver.embedding.embedder_functions import EmbeddingFunctionProvider
 from src.entity_abstractor.configurables.abstractor_configurable_enums import AbstractionType
 from src.evaluation.test_set_creation_utils import create_abstractor, create_resolver_model_from, \
     get_resolver_representation_from_arguments, get_reranker_representation_from_arguments, create_reranker_model_from, \
@@ -35,7 +36,9 @@ class PipelineTestSetCreator:
                  table_embedder_pooling_types: List[TableEmbedderPoolingType] = None,
                  table_embedding_content_configurations: List[TableEmbeddingContent] = None,
                  reranker_lambda_embedder_attachments: List[LambdaEmbedderAttached] = None,
-                 test_repititions: int = 20):
+                 test_repititions: int = 20,
+                 max_candidates: int = None,
+                 core_nlp_urls: List[str] = None):
         self.models_dir = Path("../../res/trained/test_models/")
         self.current_subdir = ""
         self.data_storage = Storage()
@@ -51,6 +54,8 @@ class PipelineTestSetCreator:
         self.table_embedding_content_configurations = table_embedding_content_configurations
         self.reranker_lambda_embedder_attachments = reranker_lambda_embedder_attachments
         self.test_repetitions = test_repititions
+        self.max_candidates = max_candidates
+        self.core_nlp_urls = core_nlp_urls
 
         self.resolve_inmutable_default_arguments(
             dataset_difficulties,
@@ -66,13 +71,55 @@ class PipelineTestSetCreator:
         )
 
         self.datasets = self.load_required_datasets()
+        self.embedding_function_providers = {}
 
     def yield_pipeline_test_inputs(self) -> Iterable[Tuple[int, str, SemanticParserPipeline]]:
-        argument_packs = [argument_pack for argument_pack in self.get_all_argument_packs()]
+        """
+        Yield the pipelines of all configurations, grouped by the bert layer type of the resolvers.
+        Only the embedding function provider of the current bert layer type is held, the provider of the previous type is released before the next one is loaded.
+        All providers are released when the iteration ends, is stopped early or fails.
+        :return:
+        """
+        argument_packs = sorted(
+            self.get_all_argument_packs(),
+            key=lambda argument_pack: self.bert_layer_types.index(self.bert_layer_type_of(argument_pack))
+        )
         test_pipeline_progress = tqdm(argument_packs)
         test_pipeline_progress.set_description("Running Tests")
-        for argument_pack in test_pipeline_progress:
-            yield argument_pack[0], argument_pack[1], self.create_semantic_parser_pipelines(*argument_pack)
+        try:
+            for argument_pack in test_pipeline_progress:
+                self.release_embedding_function_providers(kept_bert_layer_type=self.bert_layer_type_of(argument_pack))
+                yield argument_pack[0], argument_pack[1], self.create_semantic_parser_pipelines(*argument_pack)
+        finally:
+            self.release_embedding_function_providers()
+
+    @staticmethod
+    def bert_layer_type_of(argument_pack: Tuple) -> BertKerasLayerType:
+        resolver_argument_pack = argument_pack[4]
+        return resolver_argument_pack[0]
+
+    def get_embedding_function_provider(self, bert_layer_type: BertKerasLayerType) -> EmbeddingFunctionProvider:
+        """
+        Get the embedding function provider shared by all configurations using the bert layer type.
+        Whenever an utterance is embedded, all resolver embedding types under test are derived from the same BERT pass and cached.
+        :param bert_layer_type:
+        :return:
+        """
+        if bert_layer_type not in self.embedding_function_providers:
+            self.embedding_function_providers[bert_layer_type] = create_embedding_function_provider(
+                bert_layer_type, co_embedded_types=self.resolver_embedding_types
+            )
+        return self.embedding_function_providers[bert_layer_type]
+
+    def release_embedding_function_providers(self, kept_bert_layer_type: BertKerasLayerType = None):
+        """
+        Release the embedders of all embedding function providers except the one of the kept bert layer type.
+        :param kept_bert_layer_type:
+        :return:
+        """
+        for bert_layer_type in list(self.embedding_function_providers.keys()):
+            if bert_layer_type != kept_bert_layer_type:
+                self.embedding_function_providers.pop(bert_layer_type).embedder.release()
 
     def get_all_argument_packs(self):
         for dataset_difficulty in self.dataset_difficulties:
@@ -103,36 +150,44 @@ class PipelineTestSetCreator:
                 Tuple[BertKerasLayerType, TableEmbedderPoolingType, TableEmbeddingContent], LambdaEmbedderAttached
             ]) -> Iterable[SemanticParserPipeline]:
 
-        embedding_function_provider = create_embedding_function_provider(resolver_argument_pack[0])
+        embedding_function_provider = self.get_embedding_function_provider(resolver_argument_pack[0])
         save_location = self.resolve_save_directory_from(pipeline_name)
         resolver_dataset, condition_dataset, reranker_dataset = self.datasets[
             self.dataset_difficulties.index(dataset_difficulty)
         ]
-        abstractor = create_abstractor(abstractor_configuration)
-        for i in range(self.test_repetitions):
-            candidate_resolver = create_resolver_model_from(
-                resolver_dataset,
-                "Lifted instance", "DSL output",
-                embedding_function_provider,
-                resolver_argument_pack[1],
-                resolver_argument_pack[2],
-                save_location / "candidate_resolver",
-                relative_not_sure_threshold=self.resolver_relative_not_sure_threshold
-            )
-            condition_resolver = create_resolver_model_from(
-                condition_dataset,
-                "Lifted condition", "Lifted condition DSL",
-                embedding_function_provider,
-                resolver_argument_pack[1],
-                resolver_argument_pack[2],
-                save_location / "condition_resolver",
-                take_best_guess=True,
-                relative_not_sure_threshold=0
-            )
-            candidate_reranker = self.create_reranker_model_if_necessary(
-                candidate_resolver, reranker_attached, reranker_dataset, reranker_argument_pack
-            )
-            yield SemanticParserPipeline(abstractor, candidate_resolver, condition_resolver, candidate_reranker)
+        abstractor = create_abstractor(abstractor_configuration, self.core_nlp_urls)
+        table_embedder = self.create_table_embedder(*reranker_argument_pack[0]) if reranker_attached else None
+        try:
+            for i in range(self.test_repetitions):
+                candidate_resolver = create_resolver_model_from(
+                    resolver_dataset,
+                    "Lifted instance", "DSL output",
+                    embedding_function_provider,
+                    resolver_argument_pack[1],
+                    resolver_argument_pack[2],
+                    save_location / "candidate_resolver",
+                    relative_not_sure_threshold=self.resolver_relative_not_sure_threshold
+                )
+                condition_resolver = create_resolver_model_from(
+                    condition_dataset,
+                    "Lifted condition", "Lifted condition DSL",
+                    embedding_function_provider,
+                    resolver_argument_pack[1],
+                    resolver_argument_pack[2],
+                    save_location / "condition_resolver",
+                    take_best_guess=True,
+                    relative_not_sure_threshold=0
+                )
+                candidate_reranker = self.create_reranker_model_if_necessary(
+                    candidate_resolver, table_embedder, reranker_dataset, reranker_argument_pack[1]
+                )
+                yield SemanticParserPipeline(
+                    abstractor, candidate_resolver, condition_resolver, candidate_reranker,
+                    max_candidates=self.max_candidates
+                )
+        finally:
+            if table_embedder is not None:
+                table_embedder.release()
 
     def get_all_resolver_argument_packs(self) -> Iterable[Tuple[BertKerasLayerType, EmbeddingType, MetricLearnerType]]:
         for bert_layer_type in self.bert_layer_types:
@@ -172,18 +227,17 @@ class PipelineTestSetCreator:
     def resolve_save_directory_from(self, pipeline_name: str) -> Path:
         return self.models_dir / pipeline_name
 
+    @staticmethod
     def create_reranker_model_if_necessary(
-            self, candidate_resolver: CandidateResolver, reranker_attached: bool, reranker_dataset: pd.DataFrame,
-            reranker_argument_pack: Tuple[
-                Tuple[BertKerasLayerType, TableEmbedderPoolingType, TableEmbeddingContent], LambdaEmbedderAttached
-            ]) -> CandidateReranker:
+            candidate_resolver: CandidateResolver, table_embedder: TableEmbedder | None, reranker_dataset: pd.DataFrame,
+            lambda_embedder_attached: LambdaEmbedderAttached) -> CandidateReranker:
         candidate_reranker = None
-        if reranker_attached:
+        if table_embedder is not None:
             candidate_reranker = create_reranker_model_from(
                 candidate_resolver,
                 reranker_dataset,
-                self.create_table_embedder(*reranker_argument_pack[0]),
-                reranker_argument_pack[1]
+                table_embedder,
+                lambda_embedder_attached
             )
         return candidate_reranker
 
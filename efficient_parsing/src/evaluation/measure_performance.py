@@ -156,23 +156,22 @@ def abstractor_measurement():
     Provides the setup for the abstractor measurement and runs it.
     :return: None
     """
-    Abstractor.start_core_nlp_server()
-    Abstractor.wait_until_server_reachable()
     data_difficulties = [1, 2, 3]
     reranker_attached = [False]
     bert_layer_types = [BertKerasLayerType.ELECTRA_LARGE]
     resolver_embedding_types = [EmbeddingType.AVG_POOLED_POSITIONAL]
     metric_learner_types = [MetricLearnerType.LMNN]
     abstractor_types = [AbstractionType.DEPENDENCY, AbstractionType.MOCK]
-    measurement = Measurement(
-        "abstractor_measurement", dataset_difficulties=data_difficulties,
-        reranker_attached_configurations=reranker_attached, resolver_embedding_types=resolver_embedding_types,
-        metric_learner_types=metric_learner_types, bert_layer_types=bert_layer_types,
-        abstractor_configurations=abstractor_types, resolver_relative_not_sure_threshold=4
-    )
-
-    measurement.run_tests()
-    Abstractor.stop_core_nlp_server()
+    with Abstractor.create_core_nlp_server_pool() as pool:
+        measurement = Measurement(
+            "abstractor_measurement", dataset_difficulties=data_difficulties,
+            reranker_attached_configurations=reranker_attached, resolver_embedding_types=resolver_embedding_types,
+            metric_learner_types=metric_learner_types, bert_layer_types=bert_layer_types,
+            abstractor_configurations=abstractor_types, resolver_relative_not_sure_threshold=4,
+            core_nlp_urls=pool.urls
+        )
+
+        measurement.run_tests()
 
 
 def one_shot_generalization_test():
@@ -0,0 +1,90 @@
+"""
+This module compares the nearest neighbor backends of the candidate resolver.
+Each approximate backend is measured by its recall of the radius neighbors found by the exact backend and by its query latency.
+"""
+import time
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.candidate_resolver.ApproximateNearestNeighbors import ApproximateNearestNeighbors
+from src.candidate_resolver.NearestNeighbors import NearestNeighbors
+from src.candidate_resolver.configurables.resolver_configurable_enums import NearestNeighborBackendType
+
+
+NEAREST_NEIGHBOR_BACKENDS = {
+    NearestNeighborBackendType.EXACT: NearestNeighbors,
+    NearestNeighborBackendType.LSH: ApproximateNearestNeighbors
+}
+
+
+def benchmark_nearest_neighbor_backends(examples: np.ndarray,
+                                        queries: np.ndarray,
+                                        radius: float,
+                                        backend_types: List[NearestNeighborBackendType] = None,
+                                        backend_arguments: Dict[NearestNeighborBackendType, dict] = None) -> pd.DataFrame:
+    """
+    Build every backend over the examples and answer all queries one by one, like the candidate resolver does.
+    :param examples: The trained feature vectors stacked along the first axis.
+    :param queries: The query feature vectors stacked along the first axis.
+    :param radius: The radius of the queries, i.e. the not sure threshold of a candidate resolver.
+    :param backend_types: The backends to be measured. Defaults to all backends.
+    :param backend_arguments: Additional constructor arguments for each backend.
+    :return: A table containing build time, mean query latency and mean recall of each backend.
+    """
+    backend_types = backend_types if backend_types is not None \
+        else [backend_type for backend_type in NearestNeighborBackendType]
+    backend_arguments = backend_arguments if backend_arguments is not None else {}
+    exact_results = [
+        set(indices) for indices, _ in NearestNeighbors(examples, radius).query_radius_batch(queries)
+    ]
+    rows = []
+    for backend_type in backend_types:
+        start = time.perf_counter()
+        nearest_neighbor_search = NEAREST_NEIGHBOR_BACKENDS[backend_type](
+            examples, radius, **backend_arguments.get(backend_type, {})
+        )
+        build_time = time.perf_counter() - start
+        latencies, recalls = [], []
+        for query, exact_result in zip(queries, exact_results):
+            start = time.perf_counter()
+            indices, _ = nearest_neighbor_search.query_radius(query[np.newaxis])
+            latencies.append(time.perf_counter() - start)
+            recalls.append(len(exact_result.intersection(indices)) / len(exact_result) if len(exact_result) > 0 else 1.0)
+        rows.append({
+            "backend": backend_type.name,
+            "build time (s)": build_time,
+            "mean query latency (ms)": 1000 * float(np.mean(latencies)),
+            "mean recall": float(np.mean(recalls))
+        })
+    return pd.DataFrame(rows)
+
+
+def create_clustered_examples(num_examples: int,
+                              num_queries: int,
+                              dimension: int = 512,
+                              num_clusters: int = 100,
+                              cluster_spread: float = 0.1,
+                              seed: int = 0):
+    """
+    Create feature vectors grouped around random centers, which resemble embedded lifted utterances sharing a program template.
+    :param num_examples:
+    :param num_queries:
+    :param dimension: The dimension of the feature vectors, e.g. 512 for pooled small BERT embeddings.
+    :param num_clusters:
+    :param cluster_spread: The standard deviation of a feature vector around its center.
+    :param seed:
+    :return: examples, queries
+    """
+    random_state = np.random.default_rng(seed)
+    centers = random_state.standard_normal((num_clusters, dimension)).astype(np.float32)
+    vectors = centers[random_state.integers(0, num_clusters, num_examples + num_queries)] \
+        + cluster_spread * random_state.standard_normal((num_examples + num_queries, dimension)).astype(np.float32)
+    return vectors[:num_examples], vectors[num_examples:]
+
+
+if __name__ == "__main__":
+    benchmark_examples, benchmark_queries = create_clustered_examples(100000, 200)
+    print(benchmark_nearest_neighbor_backends(benchmark_examples, benchmark_queries, radius=4.0).to_string(index=False))
@@ -2,7 +2,7 @@
 This module provides helper functions for creating semantic parser pipelines and semantic parser pipeline test sets.
 """
 from pathlib import Path
-from typing import Tuple
+from typing import List, Tuple
 
 import pandas as pd
 from metric_learn import NCA, LMNN
@@ -15,12 +15,15 @@ from src.candidate_reranker.table_embedding.TableEmbedder import TableEmbedder
 from src.candidate_resolver import training as candidate_resolver_training
 from src.candidate_resolver.CandidateResolver import CandidateResolver
 from src.candidate_resolver.configurables.resolver_configurable_enums import BertKerasLayerType, MetricLearnerType, \
-    EmbeddingType
+    EmbeddingType, NearestNeighborBackendType
 from src.candidate_resolver.embedding.BertEmbedder import BertEmbedder
+from src.candidate_resolver.embedding.EmbeddingCache import EmbeddingCache
 from src.candidate_resolver.embedding.embedder_functions import EmbeddingFunctionProvider
 from src.entity_abstractor.Abstractor import Abstractor
 from src.entity_abstractor.MockAbstractor import MockAbstractor
+from src.entity_abstractor.SpacyAbstractor import SpacyAbstractor
 from src.entity_abstractor.configurables.abstractor_configurable_enums import AbstractionType
+from src.util.Storage import Storage
 
 
 def get_resolver_representation_from_arguments(
@@ -62,8 +65,19 @@ def get_reranker_representation_from_arguments(
     ) if reranker_attached else ""
 
 
-def create_abstractor(abstraction_type: AbstractionType):
-    return Abstractor() if abstraction_type == AbstractionType.DEPENDENCY else MockAbstractor()
+def create_abstractor(abstraction_type: AbstractionType, core_nlp_urls: List[str] = None):
+    """
+    Create the abstractor of the abstraction type.
+    :param abstraction_type:
+    :param core_nlp_urls: The urls of the CoreNLP servers the dependency abstractor sends its requests to, e.g. of a :py:class:`CoreNLPServerPool`.
+    By default the server started by :py:meth:`Abstractor.start_core_nlp_server` is used.
+    :return:
+    """
+    if abstraction_type == AbstractionType.DEPENDENCY:
+        return Abstractor(core_nlp_urls) if core_nlp_urls is not None else Abstractor()
+    elif abstraction_type == AbstractionType.SPACY_DEPENDENCY:
+        return SpacyAbstractor()
+    return MockAbstractor.get_shared_instance()
 
 
 def create_resolver_model_from(resolver_dataset: pd.DataFrame,
@@ -74,7 +88,9 @@ def create_resolver_model_from(resolver_dataset: pd.DataFrame,
                                metric_learner_type: MetricLearnerType,
                                save_location: Path,
                                relative_not_sure_threshold: int,
-                               take_best_guess: bool = False):
+                               take_best_guess: bool = False,
+                               nearest_neighbor_backend_type: NearestNeighborBackendType =
+                               NearestNeighborBackendType.EXACT):
     metric_learner = create_metric_learner(metric_learner_type)
     return candidate_resolver_training.create_and_train_model(
         resolver_dataset,
@@ -84,7 +100,8 @@ def create_resolver_model_from(resolver_dataset: pd.DataFrame,
         metric_learner=metric_learner,
         relative_not_sure_threshold=relative_not_sure_threshold,
         regressor_learning_rate=1e-3,
-        take_best_guess=take_best_guess
+        take_best_guess=take_best_guess,
+        nearest_neighbor_backend_type=nearest_neighbor_backend_type
     )
 
 
@@ -99,12 +116,17 @@ def create_reranker_model_from(candidate_resolver: CandidateResolver,
                                               lambda_embedder=lambda_embedder)
 
 
-def create_embedding_function_provider(bert_layer_type: BertKerasLayerType):
+def create_embedding_function_provider(bert_layer_type: BertKerasLayerType,
+                                       dynamic_sequence_length: bool = False,
+                                       co_embedded_types: List[EmbeddingType] = None):
     embedder = BertEmbedder.initialize(
         "https://tfhub.dev/tensorflow/bert_en_uncased_preprocess/3",
         bert_layer_type.value
     )
-    return EmbeddingFunctionProvider(embedder)
+    return EmbeddingFunctionProvider(
+        embedder, embedding_cache=EmbeddingCache(Storage().cache_location / "embeddings.sqlite"),
+        dynamic_sequence_length=dynamic_sequence_length, co_embedded_types=co_embedded_types
+    )
 
 
 def create_metric_learner(metric_learner_type: MetricLearnerType):
@@ -8,9 +8,10 @@ import tensorflow as tf
 from src.candidate_reranker.CandidateReranker import CandidateReranker
 from src.candidate_resolver.CandidateResolver import CandidateResolver
 from src.combination.FunctionTemplate import FunctionTemplate
+from src.combination.candidate_enumeration import best_program_line_combinations
 from src.datamodel.Table import Table
 from src.datamodel.TableType import TableType
-from src.entity_abstractor.Abstractor import Abstractor
+from src.entity_abstractor.DependencyParseAbstractor import DependencyParseAbstractor
 from src.entity_abstractor.MockAbstractor import MockAbstractor
 from src.util.Storage import Storage
 
@@ -21,15 +22,26 @@ class SemanticParserPipeline:
     An overview of the structure can be found in the thesis.
     """
     def __init__(self,
-                 entity_abstractor: Abstractor | MockAbstractor,
+                 entity_abstractor: DependencyParseAbstractor | MockAbstractor,
                  candidate_resolver: CandidateResolver,
                  condition_resolver: CandidateResolver,
                  candidate_reranker: CandidateReranker = None,
-                 active_context: str = None):
+                 active_context: str = None,
+                 max_candidates: int = None):
+        """
+        :param entity_abstractor:
+        :param candidate_resolver:
+        :param condition_resolver:
+        :param candidate_reranker:
+        :param active_context:
+        :param max_candidates: If given, only this many combined candidate programs with the highest mean probability
+        are enumerated and passed to the reranker, best first. If None, all combinations are enumerated.
+        """
         self.entity_abstractor = entity_abstractor
         self.candidate_resolver = candidate_resolver
         self.condition_resolver = condition_resolver
         self.candidate_reranker = candidate_reranker
+        self.max_candidates = max_candidates
         self.active_context = active_context if active_context is not None else "meeting_management"
         self.active_tables = Storage().load_context(self.active_context)
 
@@ -43,6 +55,32 @@ class SemanticParserPipeline:
             output_probabilities, candidate_programs, abstractor_program_line_outputs, utterance
         )
 
+    def predict_batch(self, utterances: List[str], active_contexts: List[str] = None) -> List[str]:
+        """
+        Predict the programs of multiple utterances at once.
+        The resolvers and the reranker are called once for all program lines of all utterances.
+        The predictions are the same as calling :py:meth:`predict` for each utterance in order.
+        :param utterances: The natural language utterances.
+        :param active_contexts: The active context for each utterance, None keeps the previously active context.
+        :return: The predicted program for each utterance.
+        """
+        active_contexts = active_contexts if active_contexts is not None else [None] * len(utterances)
+        active_tables = self.resolve_active_tables_for(active_contexts)
+        abstractor_outputs = self.abstract_batch(utterances, [tables[0] for tables in active_tables])
+        grounded_program_line_candidates = self.get_grounded_program_line_candidates_batch([
+            abstractor_program_line_output
+            for abstractor_program_line_outputs in abstractor_outputs
+            for abstractor_program_line_output in abstractor_program_line_outputs
+        ])
+        candidates = []
+        for abstractor_program_line_outputs in abstractor_outputs:
+            number_of_program_lines = len(abstractor_program_line_outputs)
+            candidates.append(self.combine_grounded_program_line_candidates(
+                grounded_program_line_candidates[:number_of_program_lines]
+            ))
+            grounded_program_line_candidates = grounded_program_line_candidates[number_of_program_lines:]
+        return self.select_predicted_programs_from(candidates, abstractor_outputs, utterances)
+
     def retrain(self, original_utterance: str, decomposed_utterances: List[str], active_context: str = None) -> bool:
         self.update_active_context(active_context)
         composite_utterance_abstractor_output = self.entity_abstractor.abstract(
@@ -62,6 +100,43 @@ class SemanticParserPipeline:
             self.active_context = active_context
             self.active_tables = Storage().load_context(active_context)
 
+    def abstract_batch(self, utterances: List[str], tables: List[Table]) -> List[List[Tuple[str, Dict[str, Any], str]]]:
+        """
+        Abstract the utterances with one call of the entity abstractor per distinct table.
+        :param utterances: The natural language utterances.
+        :param tables: The table each utterance is abstracted on.
+        :return: The abstractor output for each utterance, in the order of the utterances.
+        """
+        utterance_indices_by_table = {}
+        for i, table in enumerate(tables):
+            utterance_indices_by_table.setdefault(id(table), []).append(i)
+        abstractor_outputs = [None] * len(utterances)
+        for utterance_indices in utterance_indices_by_table.values():
+            table_abstractor_outputs = self.entity_abstractor.abstract_many(
+                [utterances[i] for i in utterance_indices], tables[utterance_indices[0]]
+            )
+            for i, abstractor_output in zip(utterance_indices, table_abstractor_outputs):
+                abstractor_outputs[i] = abstractor_output
+        return abstractor_outputs
+
+    def resolve_active_tables_for(self, active_contexts: List[str]) -> List[List[Table]]:
+        """
+        Update the active context as consecutive calls to :py:meth:`update_active_context` would and return the active
+        tables for each of the given contexts. Every context is loaded at most once.
+        :param active_contexts:
+        :return:
+        """
+        loaded_contexts = {self.active_context: self.active_tables}
+        active_tables = []
+        for active_context in active_contexts:
+            if active_context is not None:
+                if active_context not in loaded_contexts:
+                    loaded_contexts[active_context] = Storage().load_context(active_context)
+                self.active_context = active_context
+                self.active_tables = loaded_contexts[active_context]
+            active_tables.append(self.active_tables)
+        return active_tables
+
     def generate_candidate_programs_and_assign_probability(
             self, abstractor_program_line_outputs: List[Tuple[str, Dict[str, Any], str]]) \
             -> Tuple[List[float], List[str]]:
@@ -69,9 +144,17 @@ class SemanticParserPipeline:
             self.get_grounded_program_line_candidates(lifted_subsentence, subprogram_inputs, lifted_condition)
             for lifted_subsentence, subprogram_inputs, lifted_condition in abstractor_program_line_outputs
         ]
+        return self.combine_grounded_program_line_candidates(grounded_program_line_candidates)
+
+    def combine_grounded_program_line_candidates(
+            self, grounded_program_line_candidates: List[List[Tuple[float, str]]]) -> Tuple[List[float], List[str]]:
+        program_line_combinations = itertools.product(*grounded_program_line_candidates) \
+            if self.max_candidates is None else itertools.islice(
+                best_program_line_combinations(grounded_program_line_candidates), self.max_candidates
+            )
         program_probability_tuples = [
             self.glue_grounded_subprograms_and_compute_probability(program_line_candidates)
-            for program_line_candidates in itertools.product(*grounded_program_line_candidates)
+            for program_line_candidates in program_line_combinations
         ]
         if len(program_probability_tuples) > 0:
             output_probabilities, candidate_programs = zip(*program_probability_tuples)
@@ -116,6 +199,37 @@ class SemanticParserPipeline:
             predicted_program = "NOT_SURE"
         return predicted_program
 
+    def select_predicted_programs_from(self,
+                                       candidates: List[Tuple[List[float], List[str]]],
+                                       abstractor_outputs: List[List[Tuple[str, Dict[str, Any], str]]],
+                                       utterances: List[str]) -> List[str]:
+        """
+        Select the predicted program for multiple utterances, reranking all candidates with a single reranker call.
+        :param candidates: The output probabilities and candidate programs for each utterance.
+        :param abstractor_outputs: The abstractor output for each utterance.
+        :param utterances:
+        :return:
+        """
+        predicted_programs = [
+            candidate_programs[0] if len(candidate_programs) > 0 else "NOT_SURE"
+            for _, candidate_programs in candidates
+        ]
+        if self.candidate_reranker is not None:
+            reranked_indices = [i for i, (_, candidate_programs) in enumerate(candidates) if len(candidate_programs) > 0]
+            if len(reranked_indices) > 0:
+                reranked_programs = self.candidate_reranker.select_best_candidates(
+                    [utterances[i] for i in reranked_indices],
+                    [
+                        tf.convert_to_tensor(candidates[i][0], dtype=tf.float32)[:, tf.newaxis]
+                        for i in reranked_indices
+                    ],
+                    [candidates[i][1] for i in reranked_indices],
+                    [self.get_input_tables_from(abstractor_outputs[i]) for i in reranked_indices]
+                )
+                for i, reranked_program in zip(reranked_indices, reranked_programs):
+                    predicted_programs[i] = reranked_program
+        return predicted_programs
+
     def add_new_example_if_possible(self,
                                     utterance: str, lifted_retraining_subprograms: List[str],
                                     lifted_composite_utterance: str):
@@ -147,6 +261,40 @@ class SemanticParserPipeline:
                                              lifted_condition: str) -> List[Tuple[float, str]]:
         output_probabilities, candidate_program_lines = self.candidate_resolver.call(lifted_subsentence)
         program_condition_candidate = self.resolve_condition_if_possible(lifted_condition)
+        return self.ground_program_line_candidates(
+            output_probabilities, candidate_program_lines, subprogram_inputs, program_condition_candidate
+        )
+
+    def get_grounded_program_line_candidates_batch(
+            self, abstractor_program_line_outputs: List[Tuple[str, Dict[str, Any], str]]) \
+            -> List[List[Tuple[float, str]]]:
+        """
+        Resolve and ground the candidates of many program lines, calling each resolver once for all lines.
+        :param abstractor_program_line_outputs:
+        :return: The grounded candidates for each program line.
+        """
+        resolver_outputs = self.candidate_resolver.call_batch([
+            lifted_subsentence for lifted_subsentence, _, _ in abstractor_program_line_outputs
+        ])
+        lifted_conditions = [
+            lifted_condition for _, _, lifted_condition in abstractor_program_line_outputs
+            if lifted_condition is not None
+        ]
+        condition_outputs = dict(zip(lifted_conditions, self.condition_resolver.call_batch(lifted_conditions)))
+        return [
+            self.ground_program_line_candidates(
+                output_probabilities, candidate_program_lines, subprogram_inputs,
+                condition_outputs[lifted_condition][1] if lifted_condition is not None else None
+            )
+            for (output_probabilities, candidate_program_lines), (_, subprogram_inputs, lifted_condition)
+            in zip(resolver_outputs, abstractor_program_line_outputs)
+        ]
+
+    @staticmethod
+    def ground_program_line_candidates(output_probabilities: List[float],
+                                       candidate_program_lines: List[str],
+                                       subprogram_inputs: Dict[str, Any],
+                                       program_condition_candidate: str) -> List[Tuple[float, str]]:
         res = []
         for output_probability, candidate_program_line in zip(output_probabilities, candidate_program_lines):
             grounded_program_candidate = FunctionTemplate.ground_lifted_program(
@@ -173,7 +321,7 @@ class SemanticParserPipeline:
         program_line_candidates = list(program_line_candidates)
         output_probabilities = np.array([
             program_line_candidate[0] for program_line_candidate in program_line_candidates
-        ], dtype=np.float)
+        ], dtype=np.float64)
         program_lines = [program_line_candidate[1] for program_line_candidate in program_line_candidates]
         return np.mean(output_probabilities), ";\n".join(program_lines)
 
@@ -0,0 +1,88 @@
+import threading
+
+from typing import Any, Callable, Dict, Hashable
+
+import gensim.downloader as api
+import tensorflow_hub as hub
+
+
+class ModelRegistry:
+    """
+    The model registry loads every TF Hub model and gensim model once per process, such that all embedders using the same model share it.
+    Each acquisition of a model increments its reference count and has to be paired with a release.
+    A model is dropped from the registry once its reference count reaches zero, hence sweeping many models keeps only those in use in memory.
+    """
+    shared_instance = None
+    shared_instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.models: Dict[Hashable, Any] = {}
+        self.reference_counts: Dict[Hashable, int] = {}
+
+    @classmethod
+    def get_shared_instance(cls):
+        """
+        Get the registry which is shared by the whole process.
+        :return:
+        """
+        with cls.shared_instance_lock:
+            if cls.shared_instance is None:
+                cls.shared_instance = cls()
+            return cls.shared_instance
+
+    def acquire_hub_model(self, tfhub_link: str) -> Any:
+        """
+        Get the TF Hub model of the link, loading it with :py:func:`hub.load` if no embedder uses it yet.
+        Wrap it into a :py:class:`hub.KerasLayer` to use it as a layer.
+        :param tfhub_link:
+        :return:
+        """
+        return self.acquire(("hub", tfhub_link), lambda: hub.load(tfhub_link))
+
+    def release_hub_model(self, tfhub_link: str):
+        self.release(("hub", tfhub_link))
+
+    def acquire_gensim_model(self, gensim_api_model_name: str) -> Any:
+        """
+        Get the gensim model of the name, loading it with the gensim downloader api if no embedder uses it yet.
+        :param gensim_api_model_name:
+        :return:
+        """
+        return self.acquire(("gensim", gensim_api_model_name), lambda: api.load(gensim_api_model_name))
+
+    def release_gensim_model(self, gensim_api_model_name: str):
+        self.release(("gensim", gensim_api_model_name))
+
+    def acquire(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Get the model registered under the key and increment its reference count.
+        :param key:
+        :param load: Loads the model if it is not registered.
+        :return:
+        """
+        with self.lock:
+            if key not in self.models:
+                self.models[key] = load()
+                self.reference_counts[key] = 0
+            self.reference_counts[key] += 1
+            return self.models[key]
+
+    def release(self, key: Hashable):
+        """
+        Decrement the reference count of the model registered under the key, and drop the model if it is no longer used.
+        The model is freed as soon as no embedder references it anymore.
+        :param key:
+        :return:
+        """
+        with self.lock:
+            if key not in self.models:
+                raise KeyError(f"No model is registered under {key}.")
+            self.reference_counts[key] -= 1
+            if self.reference_counts[key] == 0:
+                del self.models[key]
+                del self.reference_counts[key]
+
+    def reference_count_of(self, key: Hashable) -> int:
+        with self.lock:
+            return self.reference_counts.get(key, 0)
@@ -7,12 +7,14 @@ import numpy as np
 import pandas as pd
 
 from src.datamodel.Table import Table
+from src.util.TableRegistry import TableRegistry
 
 
 class Storage:
     def __init__(self):
         resources_location = Path(__file__).parents[3] / "res"
         self.dataset_location = resources_location / "dataset"
+        self.cache_location = resources_location / "cache"
 
     def load_candidate_resolver_dataset(self, difficulty: int = 3) -> pd.DataFrame:
         main_data = self.load_main_data(self.training_data_location)
@@ -85,32 +87,26 @@ class Storage:
         return joined_composition_data, composition_condition_data
 
     def get_matching_tables(self, table_names: List[List[str]]) -> List[Table]:
-        return [
-            table for table in self.load_all_tables()
-            if table.table_name in reduce(lambda pack1, pack2: pack1 + pack2, table_names)
-        ]
+        """
+        Get the tables of all contexts named like one of the table names, looked up through the name index of the table registry.
+        The returned tables are shared by all callers of the process and must not be mutated.
+        :param table_names:
+        :return:
+        """
+        return self.table_registry.tables_named(reduce(lambda pack1, pack2: pack1 + pack2, table_names))
 
     def load_all_tables(self) -> List[Table]:
-        all_tables = []
-        for table_context in self.table_contexts_location.iterdir():
-            if table_context.is_dir():
-                all_tables += self.load_context(table_context.stem)
-        return all_tables
+        return self.table_registry.all_tables()
 
     def load_context(self, context: str) -> List[Table]:
-        context_folder = self.table_contexts_location / context
-        return [
-            Table(pd.read_csv(str(table_path), sep="\t"), table_path.stem, context_folder.name)
-            for table_path in context_folder.iterdir()
-            if table_path.is_file() and table_path.suffix == ".txt"
-        ]
+        return self.table_registry.context(context)
 
     def load_table(self, context: str, table_name: str) -> Table:
-        table_path = (self.table_contexts_location / context).with_stem(table_name)
-        if table_path.is_file():
-            return Table(pd.read_csv(str(table_path), sep="\t"), table_name, context)
-        else:
-            raise FileNotFoundError(f"Path: {str(table_path)} is no file.")
+        return self.table_registry.table(context, table_name)
+
+    @property
+    def table_registry(self) -> TableRegistry:
+        return TableRegistry.get_shared_instance(self.table_contexts_location)
 
     @property
     def table_contexts_location(self):
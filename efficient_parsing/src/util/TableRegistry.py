@@ -0,0 +1,158 @@
+import threading
+import time
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from src.datamodel.Table import Table
+
+
+class TableRegistry:
+    """
+    The table registry loads every table of the table contexts once per process and indexes them by (context, table name) and by table name.
+    Once a context is loaded, requesting its tables does no file system access at all.
+    The table files of a context are read again after :py:meth:`reload`, or, if a refresh interval is given,
+    when the modification time of one of its table files changed, which is checked at most once per refresh interval.
+    The registry hands out the same :py:class:`Table` instances to all callers, hence they must not be mutated.
+    """
+    shared_instances = {}
+    shared_instances_lock = threading.Lock()
+
+    def __init__(self, table_contexts_location: Path, refresh_interval: float = None):
+        """
+        :param table_contexts_location: The folder containing one folder of table files per context.
+        :param refresh_interval: The minimal time in seconds between two checks of the table files of a context. If None, they are only read again after :py:meth:`reload`.
+        """
+        self.table_contexts_location = Path(table_contexts_location)
+        self.refresh_interval = refresh_interval
+        self.lock = threading.RLock()
+        self.context_names = None
+        self.contexts: Dict[str, List[Table]] = {}
+        self.context_signatures: Dict[str, Dict[str, int]] = {}
+        self.context_check_times: Dict[str, float] = {}
+        self.tables: Dict[Tuple[str, str], Table] = {}
+        self.table_name_index: Dict[str, List[Tuple[int, Table]]] | None = None
+
+    @classmethod
+    def get_shared_instance(cls, table_contexts_location: Path):
+        """
+        Get the registry of the given table contexts location which is shared by the whole process.
+        :param table_contexts_location:
+        :return:
+        """
+        with cls.shared_instances_lock:
+            table_contexts_location = Path(table_contexts_location).resolve()
+            if table_contexts_location not in cls.shared_instances:
+                cls.shared_instances[table_contexts_location] = cls(table_contexts_location)
+            return cls.shared_instances[table_contexts_location]
+
+    def context(self, context: str) -> List[Table]:
+        """
+        Get all tables of a context in the order of the table files inside the context folder.
+        :param context:
+        :return:
+        """
+        with self.lock:
+            self.refresh(context)
+            return list(self.contexts[context])
+
+    def all_tables(self) -> List[Table]:
+        """
+        Get the tables of all contexts in the order of the context folders.
+        :return:
+        """
+        with self.lock:
+            self.refresh_all()
+            return [table for context in self.context_names for table in self.contexts[context]]
+
+    def tables_named(self, table_names: Iterable[str]) -> List[Table]:
+        """
+        Get the tables of all contexts having one of the names, in the order of :py:meth:`all_tables`.
+        :param table_names:
+        :return:
+        """
+        with self.lock:
+            self.refresh_all()
+            if self.table_name_index is None:
+                self.table_name_index = {}
+                for position, table in enumerate(
+                        table for context in self.context_names for table in self.contexts[context]):
+                    self.table_name_index.setdefault(table.table_name, []).append((position, table))
+            return [
+                table for _, table in sorted(
+                    (entry for table_name in set(table_names) for entry in self.table_name_index.get(table_name, [])),
+                    key=lambda entry: entry[0]
+                )
+            ]
+
+    def table(self, context: str, table_name: str) -> Table:
+        with self.lock:
+            self.refresh(context)
+            if (context, table_name) not in self.tables:
+                raise FileNotFoundError(
+                    f"Path: {str(self.table_contexts_location / context / table_name)}.txt is no file."
+                )
+            return self.tables[context, table_name]
+
+    def reload(self, context: str = None):
+        """
+        Drop the loaded tables of the given context or of all contexts, such that they are read again on their next request.
+        :param context:
+        :return:
+        """
+        with self.lock:
+            contexts = [context] if context is not None else list(self.contexts.keys())
+            for dropped_context in contexts:
+                for table in self.contexts.pop(dropped_context, []):
+                    del self.tables[dropped_context, table.table_name]
+                self.context_signatures.pop(dropped_context, None)
+                self.context_check_times.pop(dropped_context, None)
+            if context is None:
+                self.context_names = None
+            self.table_name_index = None
+
+    def refresh_all(self):
+        if self.context_names is None:
+            self.context_names = [
+                table_context.stem for table_context in self.table_contexts_location.iterdir()
+                if table_context.is_dir()
+            ]
+        for context in self.context_names:
+            self.refresh(context)
+
+    def refresh(self, context: str):
+        """
+        Load the context if it is not loaded, or if its table files changed and the refresh interval passed since they were checked.
+        :param context:
+        :return:
+        """
+        if context in self.contexts and (
+                self.refresh_interval is None
+                or time.monotonic() - self.context_check_times[context] < self.refresh_interval):
+            return
+        signature = self.signature_of(context)
+        self.context_check_times[context] = time.monotonic()
+        if self.context_signatures.get(context) != signature:
+            self.load_context(context, signature)
+
+    def load_context(self, context: str, signature: Dict[str, int]):
+        for table in self.contexts.get(context, []):
+            del self.tables[context, table.table_name]
+        context_folder = self.table_contexts_location / context
+        self.contexts[context] = [
+            Table(pd.read_csv(str(context_folder / file_name), sep="\t"), Path(file_name).stem, context_folder.name)
+            for file_name in signature.keys()
+        ]
+        for table in self.contexts[context]:
+            self.tables[context, table.table_name] = table
+        self.context_signatures[context] = signature
+        self.table_name_index = None
+
+    def signature_of(self, context: str) -> Dict[str, int]:
+        return {
+            table_path.name: table_path.stat().st_mtime_ns
+            for table_path in (self.table_contexts_location / context).iterdir()
+            if table_path.is_file() and table_path.suffix == ".txt"
+        }
@@ -1,14 +1,17 @@
 import re
+from functools import lru_cache
 from typing import Iterator, List
 
 from more_itertools import flatten
 from pattern.text.en import singularize
 
 
+@lru_cache(maxsize=65536)
 def normalize(words: str) -> str:
     """
     Normalizes camel case or snake case or combined camel case and snake case words containing plurals to a single space
     separated string.
+    The normalizations are memoised, their cache statistics are reported by ``normalize.cache_info()``.
     :param words:
     :return:
     """
@@ -1,3 +1,4 @@
+import logging
 import re
 import shutil
 
@@ -5,6 +6,8 @@ import tensorflow as tf
 
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 def delete_matching_tfhub_cache(error: tf.errors.DataLossError):
     match = re.search(r"\/tmp\/tfhub_modules\/([a-zA-Z\d]+)\/", error.message)
@@ -16,5 +19,5 @@ def delete_matching_tfhub_cache(error: tf.errors.DataLossError):
 def delete_tfhub_cache(model_path: Path):
     cache_path = Path("/tmp/tfhub_modules") / model_path
     if cache_path.is_dir():
-        print(f"Deleting {str(cache_path)}.")
+        logger.info(f"Deleting {str(cache_path)}.")
         shutil.rmtree(cache_path)
@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.candidate_reranker.CandidateReranker import CandidateReranker
+from src.datamodel.Table import Table
+
+
+class ShapeTableEmbedder:
+    """
+    Embeds a table and a query by the number of columns and the length of the query, recording the size of every request.
+    """
+    def __init__(self):
+        self.requests = []
+
+    def embedd_many(self, tables_and_queries):
+        self.requests.append(len(tables_and_queries))
+        return [np.array([[len(table.columns), len(query)]], dtype=np.float32) for table, query in tables_and_queries]
+
+
+class CandidateRerankerTest(unittest.TestCase):
+    def setUp(self):
+        self.table_embedder = ShapeTableEmbedder()
+        self.candidate_reranker = CandidateReranker(self.table_embedder, None, pd.DataFrame())
+        self.utterances = ["show all students", "delete the exams", "count rows"]
+        self.tables = [
+            [Table.create_test_table_instance(["exam"] * number_of_columns, "students", pd.DataFrame())
+             for number_of_columns in range(1, number_of_tables + 1)]
+            for number_of_tables in [1, 2, 3]
+        ]
+
+    def test_embedd_many_embeds_all_tables_in_one_request(self):
+        embeddings = self.candidate_reranker.embedd_many(self.utterances, self.tables)
+        self.assertEqual([6], self.table_embedder.requests)
+        for utterance, tables, embedding in zip(self.utterances, self.tables, embeddings):
+            np.testing.assert_allclose(
+                np.array([[sum(len(table.columns) for table in tables), len(utterance) * len(tables)]]), embedding
+            )
+
+    def test_embedd_many_equals_embedd_data(self):
+        embeddings = self.candidate_reranker.embedd_many(self.utterances, self.tables)
+        for utterance, tables, embedding in zip(self.utterances, self.tables, embeddings):
+            np.testing.assert_allclose(self.candidate_reranker.embedd_data(utterance, tables), embedding)
+
+
+if __name__ == '__main__':
+    unittest.main()
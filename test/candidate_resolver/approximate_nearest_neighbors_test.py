@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from src.candidate_resolver.ApproximateNearestNeighbors import ApproximateNearestNeighbors
+from src.candidate_resolver.NearestNeighbors import NearestNeighbors
+from src.candidate_resolver.configurables.resolver_configurable_enums import NearestNeighborBackendType
+from src.evaluation.nearest_neighbor_benchmark import benchmark_nearest_neighbor_backends, create_clustered_examples
+
+
+class ApproximateNearestNeighborsTest(unittest.TestCase):
+    def test_recall_on_clustered_examples(self):
+        examples, queries = create_clustered_examples(2000, 100, dimension=64, num_clusters=20)
+        benchmark = benchmark_nearest_neighbor_backends(
+            examples, queries, radius=1.5, backend_types=[NearestNeighborBackendType.LSH]
+        )
+        self.assertGreaterEqual(benchmark["mean recall"].iloc[0], 0.95)
+
+    def test_results_are_subset_of_exact_results(self):
+        examples, queries = create_clustered_examples(500, 20, dimension=16, num_clusters=10, cluster_spread=0.5)
+        exact_results = NearestNeighbors(examples, radius=2.0).query_radius_batch(queries)
+        approximate_results = ApproximateNearestNeighbors(examples, radius=2.0).query_radius_batch(queries)
+        for (exact_indices, _), (approximate_indices, approximate_distances) in zip(exact_results, approximate_results):
+            self.assertTrue(set(approximate_indices).issubset(exact_indices))
+            self.assertTrue(np.all(approximate_distances <= 2.0))
+
+    def test_empty_and_single_example_index(self):
+        nearest_neighbor_search = ApproximateNearestNeighbors(np.array([]), radius=2.0)
+        indices, distances = nearest_neighbor_search.query_radius(np.zeros((1, 4)))
+        self.assertEqual(0, len(indices))
+        nearest_neighbor_search.add(np.ones((1, 4)))
+        self.assertEqual(2.0, nearest_neighbor_search.bucket_width)
+        indices, _ = nearest_neighbor_search.query_radius(np.ones((1, 4)))
+        self.assertEqual([0], list(indices))
+        nearest_neighbor_search.add(np.zeros((1, 4)))
+        indices, distances = nearest_neighbor_search.query_radius(np.zeros((1, 4)))
+        self.assertEqual(1, indices[0])
+        self.assertEqual(0.0, distances[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from src.candidate_resolver.configurables.resolver_configurable_enums import BertKerasLayerType, EmbeddingType
+from src.candidate_resolver.embedding.BertEmbedder import BertEmbedder
+from src.candidate_resolver.embedding.embedder_functions import EmbeddingFunctionProvider
+from src.util.Storage import Storage
+
+
+class BertEmbedderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.embedder = BertEmbedder.initialize(
+            "https://tfhub.dev/tensorflow/bert_en_uncased_preprocess/3", BertKerasLayerType.BERT_SMALL.value
+        )
+        cls.lifted_instances = list(dict.fromkeys(Storage().load_candidate_resolver_dataset()["Lifted instance"]))[:16]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.embedder.release()
+
+    def test_trimmed_outputs_agree_with_padded_outputs(self):
+        padded_outputs = self.embedder(self.lifted_instances)
+        trimmed_outputs = self.embedder.call_trimmed(self.lifted_instances)
+        for output_name in BertEmbedder.padding_independent_outputs:
+            np.testing.assert_allclose(
+                np.array(padded_outputs[output_name]), np.array(trimmed_outputs[output_name]), rtol=1e-3, atol=1e-4
+            )
+
+    def test_pooled_embeddings_agree_between_sequence_length_modes(self):
+        padded_embeddings, trimmed_embeddings = [
+            EmbeddingFunctionProvider(self.embedder, dynamic_sequence_length=dynamic_sequence_length)
+            .select_embedding_function(EmbeddingType.AVG_POOLED_POSITIONAL)(self.lifted_instances)
+            for dynamic_sequence_length in [False, True]
+        ]
+        for padded_embedding, trimmed_embedding in zip(padded_embeddings, trimmed_embeddings):
+            np.testing.assert_allclose(np.array(padded_embedding), np.array(trimmed_embedding), rtol=1e-3, atol=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from src.util.Storage import Storage
+from test.test_utils import LinearMetricLearner, create_trained_resolver
+
+
+class CandidateResolverTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = Storage().load_candidate_resolver_dataset()
+        cls.lifted_instances = list(cls.dataset["Lifted instance"])
+
+    def create_resolvers(self, take_best_guess: bool = False):
+        return [
+            create_trained_resolver(self.dataset, "Lifted instance", "DSL output", take_best_guess=take_best_guess),
+            create_trained_resolver(
+                self.dataset, "Lifted instance", "DSL output", not_sure_threshold=15.0,
+                nearest_neighbor_metric_learner=LinearMetricLearner(), take_best_guess=take_best_guess
+            )
+        ]
+
+    def assert_outputs_equal(self, expected_output, output):
+        expected_probabilities, expected_programs = expected_output
+        probabilities, programs = output
+        self.assertEqual(expected_programs, programs)
+        np.testing.assert_allclose(
+            np.array(expected_probabilities, dtype=np.float64), np.array(probabilities, dtype=np.float64), rtol=1e-5
+        )
+
+    def test_embed_batch_equals_single_embeddings(self):
+        for candidate_resolver in self.create_resolvers():
+            embedded_inputs = candidate_resolver.embed_batch(self.lifted_instances)
+            for lifted_instance, embedded_input in zip(self.lifted_instances, embedded_inputs):
+                expected_embedding = np.array(candidate_resolver.embedding_function(lifted_instance))
+                if candidate_resolver.nearest_neighbor_metric_learner is not None:
+                    expected_embedding = candidate_resolver.nearest_neighbor_metric_learner.transform(expected_embedding)
+                np.testing.assert_allclose(expected_embedding, embedded_input, rtol=1e-5, atol=1e-5)
+
+    def test_resolve_batch_equals_resolve(self):
+        for candidate_resolver in self.create_resolvers():
+            outputs = candidate_resolver.resolve_batch(self.lifted_instances)
+            self.assertGreater(sum(len(candidate_programs) for _, candidate_programs in outputs), 0)
+            for lifted_instance, output in zip(self.lifted_instances, outputs):
+                self.assert_outputs_equal(candidate_resolver.resolve(lifted_instance), output)
+
+    def test_call_batch_equals_call(self):
+        inputs = self.lifted_instances + self.lifted_instances[:5]
+        for take_best_guess in [False, True]:
+            for candidate_resolver in self.create_resolvers(take_best_guess):
+                expected_outputs = [candidate_resolver.call(lifted_input) for lifted_input in inputs]
+                candidate_resolver.invalidate_cached_outputs()
+                outputs = candidate_resolver.call_batch(inputs)
+                self.assertEqual(len(expected_outputs), len(outputs))
+                for expected_output, output in zip(expected_outputs, outputs):
+                    self.assert_outputs_equal(expected_output, output)
+                self.assertEqual(outputs, candidate_resolver.call_batch(inputs))
+
+    def test_retraining_applies_not_sure_threshold(self):
+        candidate_resolver = create_trained_resolver(
+            self.dataset, "Lifted instance", "DSL output", not_sure_threshold=400.0
+        )
+        candidate_resolver.not_sure_threshold = 2.0
+        candidate_resolver.add_training_example_and_retrain("Show [column] [table]", "SELECT([table], [,column])")
+        self.assertEqual(candidate_resolver.not_sure_threshold, candidate_resolver.nearest_neighbor_search.radius)
+        for lifted_instance in self.lifted_instances:
+            _, distances = candidate_resolver.nearest_neighbor_search.query_radius(
+                np.array(candidate_resolver.embedding_function(lifted_instance))[np.newaxis]
+            )
+            self.assertTrue(np.all(distances <= 2.0))
+
+    def test_least_recently_used_result_is_evicted(self):
+        candidate_resolver = create_trained_resolver(self.dataset, "Lifted instance", "DSL output")
+        candidate_resolver.max_result_cache_size = 2
+        first, second, third = list(dict.fromkeys(self.lifted_instances))[:3]
+        candidate_resolver.call(first)
+        candidate_resolver.call(second)
+        candidate_resolver.call(first)
+        candidate_resolver.call(third)
+        self.assertEqual([first, third], list(candidate_resolver.result_cache.keys()))
+        candidate_resolver.add_training_example_and_retrain(first, "SELECT([table], [,column])")
+        self.assertEqual(0, len(candidate_resolver.result_cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.candidate_resolver.configurables.resolver_configurable_enums import EmbeddingType
+from src.candidate_resolver.embedding.embedder_functions import EmbeddingFunctionProvider
+from src.candidate_resolver.embedding.embedding_utils import summed_quadratic_kernel
+
+
+class CharacterEmbedder:
+    """
+    Embeds each lifted utterance by the codes of its first characters, with the output structure of the BERT embedder.
+    """
+    tfhub_preprocessor_link = "preprocessor"
+    tfhub_bert_link = "bert"
+
+    def __call__(self, inputs):
+        inputs = [inputs] if isinstance(inputs, str) else list(inputs)
+        sequence_output = np.array([
+            [[ord(character) / 128 + dimension for dimension in range(3)] for character in (utterance + "    ")[:4]]
+            for utterance in inputs
+        ], dtype=np.float32)
+        return {
+            "sequence_output": sequence_output,
+            "sequence_output_pos_encoded": sequence_output / 2,
+            "pooled_output": sequence_output[:, 0, :]
+        }
+
+
+class EmbeddingFunctionProviderTest(unittest.TestCase):
+    def setUp(self):
+        embedder = SimpleNamespace(tfhub_preprocessor_link="preprocessor", tfhub_bert_link="bert")
+        self.providers = [
+            EmbeddingFunctionProvider(embedder, dynamic_sequence_length=dynamic_sequence_length)
+            for dynamic_sequence_length in [False, True]
+        ]
+
+    def cache_configurations_of(self, embedding_type: EmbeddingType):
+        return [
+            provider.cache_configuration_of(embedding_type, tuple(provider.pooling_arguments))
+            for provider in self.providers
+        ]
+
+    def test_padding_independent_embeddings_are_shared_between_sequence_length_modes(self):
+        for embedding_type in [EmbeddingType.BERT_POOLED, EmbeddingType.SEQUENCE_POSITIONAL,
+                               EmbeddingType.AVG_POOLED_POSITIONAL, EmbeddingType.MAX_POOLED_POSITIONAL]:
+            fixed_configuration, dynamic_configuration = self.cache_configurations_of(embedding_type)
+            self.assertEqual(fixed_configuration, dynamic_configuration)
+
+    def test_padding_dependent_embeddings_are_keyed_with_the_sequence_length_mode(self):
+        for embedding_type in [EmbeddingType.SEQUENCE, EmbeddingType.AVG_POOLED, EmbeddingType.MAX_POOLED,
+                               EmbeddingType.SUMMED_QUADRATIC_KERNEL_SEQUENCE]:
+            fixed_configuration, dynamic_configuration = self.cache_configurations_of(embedding_type)
+            self.assertNotEqual(fixed_configuration, dynamic_configuration)
+
+    def test_batched_embeddings_equal_single_embeddings(self):
+        provider = EmbeddingFunctionProvider(CharacterEmbedder(), batch_size=2)
+        embedding_types = [EmbeddingType.SEQUENCE, EmbeddingType.BERT_POOLED,
+                           EmbeddingType.SUMMED_QUADRATIC_KERNEL_SEQUENCE,
+                           EmbeddingType.SUMMED_QUADRATIC_KERNEL_BERT_POOLED]
+        utterances = ["show [table]", "delete [column]", "sum", "show [column] where [condition]", "count"]
+        batched_embeddings = provider.embed_multiple(utterances, embedding_types)
+        for i, utterance in enumerate(utterances):
+            single_embeddings = provider.embed_multiple(utterance, embedding_types)
+            for embedding_type in embedding_types:
+                np.testing.assert_allclose(
+                    np.array(single_embeddings[embedding_type]), np.array(batched_embeddings[embedding_type][i]),
+                    rtol=1e-5
+                )
+            outputs = CharacterEmbedder()(utterance)
+            np.testing.assert_allclose(outputs["sequence_output"], single_embeddings[EmbeddingType.SEQUENCE])
+            for embedding_type, output_name in [(EmbeddingType.SUMMED_QUADRATIC_KERNEL_SEQUENCE, "sequence_output"),
+                                                (EmbeddingType.SUMMED_QUADRATIC_KERNEL_BERT_POOLED, "pooled_output")]:
+                np.testing.assert_allclose(
+                    np.array(summed_quadratic_kernel(outputs[output_name], outputs[output_name])),
+                    np.array(single_embeddings[embedding_type]), rtol=1e-5
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
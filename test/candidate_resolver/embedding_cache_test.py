@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import numpy as np
+
+from src.candidate_resolver.embedding.EmbeddingCache import EmbeddingCache
+from test.test_utils import character_count_embedding
+
+
+class EmbeddingCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.database_location = Path(self.temporary_directory.name) / "embeddings.sqlite"
+        self.embedded_inputs = []
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def counting_embedding(self, inputs):
+        self.embedded_inputs.append(inputs)
+        return character_count_embedding(inputs)
+
+    def test_embeddings_persist_across_instances(self):
+        embedding_function = EmbeddingCache(self.database_location).wrap(self.counting_embedding, "configuration")
+        embedding = embedding_function("Show [column] [table]")
+        reloaded_embedding_function = EmbeddingCache(self.database_location).wrap(
+            self.counting_embedding, "configuration"
+        )
+        np.testing.assert_array_equal(embedding, reloaded_embedding_function("Show [column] [table]"))
+        self.assertEqual(["Show [column] [table]"], self.embedded_inputs)
+        EmbeddingCache(self.database_location).wrap(self.counting_embedding, "other configuration")(
+            "Show [column] [table]"
+        )
+        self.assertEqual(2, len(self.embedded_inputs))
+
+    def test_least_recently_used_embedding_is_evicted_from_memory(self):
+        embedding_cache = EmbeddingCache(self.database_location, max_memory_entries=2)
+        embedding_cache.store("first", np.zeros(2))
+        embedding_cache.store("second", np.ones(2))
+        embedding_cache.lookup("first")
+        embedding_cache.store("third", np.ones(2))
+        self.assertEqual(["first", "third"], list(embedding_cache.memory.keys()))
+        np.testing.assert_array_equal(np.ones(2), embedding_cache.lookup("second"))
+        self.assertEqual(["third", "second"], list(embedding_cache.memory.keys()))
+
+    def test_only_missing_inputs_are_embedded(self):
+        embedding_function = EmbeddingCache(self.database_location).wrap(self.counting_embedding, "configuration")
+        embedding_function("Show [column] [table]")
+        inputs = ["Show [column] [table]", "Delete [table]", "Show [column] [table]", "Count [table]", "Delete [table]"]
+        embeddings = embedding_function(inputs)
+        self.assertEqual([["Delete [table]", "Count [table]"]], self.embedded_inputs[1:])
+        for embedding, expected_embedding in zip(embeddings, character_count_embedding(inputs)):
+            np.testing.assert_array_equal(expected_embedding, embedding)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+import numpy as np
+import tensorflow as tf
+
+from src.candidate_resolver.InferenceKernel import InferenceKernel
+from src.util.Storage import Storage
+from test.test_utils import LinearMetricLearner, create_trained_resolver
+
+
+class InferenceKernelTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = Storage().load_candidate_resolver_dataset()
+        cls.lifted_instances = list(cls.dataset["Lifted instance"])
+
+    def assert_kernel_matches_resolver(self, candidate_resolver):
+        random_distances = np.random.default_rng(0).uniform(0, 50, 64).astype(np.float32)
+        expected_outputs = candidate_resolver.resolve_batch(self.lifted_instances)
+        inference_kernel = candidate_resolver.export_inference_kernel()
+        np.testing.assert_allclose(
+            np.reshape(candidate_resolver.regressor(random_distances[:, np.newaxis]), [-1]),
+            inference_kernel.score(random_distances),
+            rtol=1e-5
+        )
+        kernel_outputs = candidate_resolver.resolve_batch(self.lifted_instances)
+        self.assertGreater(sum(len(candidate_programs) for _, candidate_programs in kernel_outputs), 0)
+        for (expected_probabilities, expected_programs), (kernel_probabilities, kernel_programs) \
+                in zip(expected_outputs, kernel_outputs):
+            self.assertEqual(expected_programs, kernel_programs)
+            np.testing.assert_allclose(
+                np.array(expected_probabilities, dtype=np.float32), np.array(kernel_probabilities), rtol=1e-4
+            )
+
+    def test_kernel_matches_resolver(self):
+        self.assert_kernel_matches_resolver(
+            create_trained_resolver(self.dataset, "Lifted instance", "DSL output")
+        )
+
+    def test_kernel_matches_resolver_with_metric_learner(self):
+        self.assert_kernel_matches_resolver(create_trained_resolver(
+            self.dataset, "Lifted instance", "DSL output", not_sure_threshold=15.0,
+            nearest_neighbor_metric_learner=LinearMetricLearner()
+        ))
+
+    def test_exported_kernel_is_not_changed_by_retraining(self):
+        candidate_resolver = create_trained_resolver(self.dataset, "Lifted instance", "DSL output")
+        inference_kernel = candidate_resolver.export_inference_kernel()
+        embedded_inputs = candidate_resolver.stack_embeddings_of(self.lifted_instances)
+        expected_outputs = inference_kernel.call_batch(embedded_inputs)
+        number_of_programs = len(inference_kernel.dsl_programs)
+        for lifted_instance in self.lifted_instances[:40]:
+            candidate_resolver.add_training_example_and_retrain(lifted_instance, "SELECT([table], [,column])")
+        self.assertIsNot(inference_kernel, candidate_resolver.inference_kernel)
+        self.assertEqual(number_of_programs, len(inference_kernel.dsl_programs))
+        for (expected_probabilities, expected_programs), (probabilities, programs) \
+                in zip(expected_outputs, inference_kernel.call_batch(embedded_inputs)):
+            self.assertEqual(expected_programs, programs)
+            np.testing.assert_array_equal(np.array(expected_probabilities), np.array(probabilities))
+
+    def test_export_rejects_other_regressors(self):
+        candidate_resolver = create_trained_resolver(self.dataset, "Lifted instance", "DSL output")
+        candidate_resolver.regressor = tf.keras.Sequential([
+            tf.keras.layers.Dense(4, activation="relu"), tf.keras.layers.Dense(1, activation="sigmoid")
+        ])
+        candidate_resolver.regressor(np.zeros((1, 1), dtype=np.float32))
+        with self.assertRaises(ValueError):
+            InferenceKernel.export_from(candidate_resolver)
+
+
+if __name__ == '__main__':
+    unittest.main()
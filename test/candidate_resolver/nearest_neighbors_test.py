@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from src.candidate_resolver.NearestNeighbors import NearestNeighbors
+
+
+class NearestNeighborsTest(unittest.TestCase):
+    def test_implementations_include_examples_on_the_radius(self):
+        examples = np.array([[0.0, 0.0], [1.0, 0.0], [3.0, 0.0]])
+        query = np.array([[0.0, 0.0]])
+        kd_tree_indices, _ = NearestNeighbors(examples, radius=1.0).query_radius(query)
+        brute_force_indices, _ = NearestNeighbors(examples[:, np.newaxis], radius=1.0).query_radius(query[np.newaxis])
+        self.assertEqual([0, 1], list(kd_tree_indices))
+        self.assertEqual([0, 1], list(brute_force_indices))
+
+    def test_added_examples_are_found_by_brute_force(self):
+        random_state = np.random.default_rng(0)
+        examples = random_state.standard_normal((40, 4, 3))
+        queries = random_state.standard_normal((8, 4, 3))
+        nearest_neighbor_search = NearestNeighbors(examples[:30], radius=4.0)
+        nearest_neighbor_search.add(examples[30:])
+        exact_distances = np.linalg.norm(
+            examples.reshape(1, len(examples), -1) - queries.reshape(len(queries), 1, -1), axis=-1
+        )
+        for (indices, distances), query_distances in zip(nearest_neighbor_search.query_radius_batch(queries),
+                                                         exact_distances):
+            expected_indices = np.flatnonzero(query_distances <= 4.0)
+            self.assertEqual(sorted(expected_indices), sorted(indices))
+            np.testing.assert_allclose(query_distances[indices], distances, rtol=1e-4)
+            self.assertTrue(np.all(np.diff(distances) >= 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import itertools
+import random
+import unittest
+
+from itertools import islice
+
+from src.combination.candidate_enumeration import best_program_line_combinations
+
+
+def combinations_by_mean_probability(grounded_program_line_candidates):
+    return sorted(
+        itertools.product(*grounded_program_line_candidates),
+        key=lambda combination: -sum(probability for probability, _ in combination) / len(combination)
+    )
+
+
+class CandidateEnumerationTest(unittest.TestCase):
+
+    def test_best_combinations_equal_sorted_product(self):
+        rng = random.Random(0)
+        grounded_program_line_candidates = [
+            [(rng.randint(0, 16) / 16, f"line {line} candidate {i}") for i in range(rng.randint(1, 5))]
+            for line in range(4)
+        ]
+        expected = combinations_by_mean_probability(grounded_program_line_candidates)
+        for k in [1, 5, 20, len(expected)]:
+            self.assertEqual(expected[:k], list(islice(best_program_line_combinations(grounded_program_line_candidates), k)))
+
+    def test_ties_are_yielded_in_product_order(self):
+        grounded_program_line_candidates = [
+            [(0.5, "a"), (0.75, "b"), (0.5, "c")],
+            [(0.25, "x"), (0.25, "y")]
+        ]
+        self.assertEqual(
+            combinations_by_mean_probability(grounded_program_line_candidates),
+            list(best_program_line_combinations(grounded_program_line_candidates))
+        )
+
+    def test_empty_candidate_list_yields_nothing(self):
+        self.assertEqual([], list(best_program_line_combinations([[(0.5, "a"), (0.25, "b")], []])))
+        self.assertEqual([], list(islice(best_program_line_combinations([[]]), 3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -34,3 +34,13 @@ class CombinationTest(unittest.TestCase):
             "SELECT([table], [,column])", mock_abstractor_out[0][1]
         )
         self.assertEqual("", grounded_program)
+
+    def test_interleaved_tag_numbering(self):
+        function_template = FunctionTemplate("SELECT([table], [,column]); SELECT([table1], [,column1]); COUNT([table])")
+        self.assertEqual("SELECT({0}, {1}); SELECT({2}, {3}); COUNT({4})", function_template.output_function_template)
+
+    def test_compiled_template_reuse(self):
+        self.assertIs(
+            FunctionTemplate.compile("SELECT([table], [,column])"),
+            FunctionTemplate.compile("SELECT([table], [,column])")
+        )
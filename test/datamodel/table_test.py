@@ -0,0 +1,73 @@
+import unittest
+
+import pandas as pd
+
+from src.datamodel.Table import Table
+from src.datamodel.TableType import TableType
+from src.entity_abstractor.DependencyParseAbstractor import DependencyParseAbstractor
+
+
+class TableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = Table.create_test_table_instance(["student_number", "exam"], "medical_certificates", pd.DataFrame())
+
+    @staticmethod
+    def objects_of(raw_nodes):
+        sentence, _ = DependencyParseAbstractor.create_sentence_instances_from(raw_nodes)
+        return {obj.word: obj for obj_pack in sentence.objects for obj in obj_pack}
+
+    def test_variant_index_maps_naming_conventions_to_names(self):
+        self.assertEqual("student number", self.table.column_name_of("student number"))
+        self.assertEqual("student number", self.table.column_name_of("studentNumber"))
+        self.assertEqual("student number", self.table.column_name_of("STUDENT_NUMBER"))
+        self.assertEqual("exam", self.table.column_name_of("Exam"))
+        self.assertIsNone(self.table.column_name_of("mark"))
+        self.assertTrue(self.table.is_table_name("medical_certificates"))
+        self.assertTrue(self.table.is_table_name("MedicalCertificates"))
+        self.assertFalse(self.table.is_table_name("certificates"))
+
+    def test_table_types_of_nodes(self):
+        objects = self.objects_of([
+            ("Show", "VB", 0, "ROOT"), ("the", "DT", 4, "det"), ("student", "NN", 4, "compound"),
+            ("number", "NN", 1, "obj"), ("of", "IN", 6, "case"), ("rows", "NNS", 4, "nmod"), (".", ".", 1, "punct")
+        ])
+        self.assertEqual(TableType.COLUMN, self.table.get_table_type(objects["number"]))
+        self.assertEqual(TableType.NO_TABLE_TYPE, self.table.get_table_type(objects["rows"]))
+
+    def test_setting_columns_rebuilds_the_index(self):
+        objects = self.objects_of([("Show", "VB", 0, "ROOT"), ("exam", "NN", 1, "obj"), (".", ".", 1, "punct")])
+        self.assertEqual(TableType.COLUMN, self.table.get_table_type(objects["exam"]))
+        self.table.columns = ["grade"]
+        self.assertEqual(TableType.NO_TABLE_TYPE, self.table.get_table_type(objects["exam"]))
+        self.assertIsNone(self.table.column_name_of("exam"))
+        self.assertEqual("grade", self.table.column_name_of("Grade"))
+
+    def test_abstraction_inputs_are_column_and_table_names(self):
+        sentence, subsentences = DependencyParseAbstractor.create_sentence_instances_from([
+            ("Show", "VB", 0, "ROOT"), ("the", "DT", 4, "det"), ("student", "NN", 4, "compound"),
+            ("number", "NN", 1, "obj"), ("of", "IN", 7, "case"), ("medical", "NN", 7, "compound"),
+            ("certificates", "NNS", 4, "nmod"), (".", ".", 1, "punct")
+        ])
+        (_, inputs, _), = DependencyParseAbstractor.abstract_sentence_instances(sentence, subsentences, self.table)
+        self.assertEqual([["student number"]], inputs[TableType.COLUMN.value])
+        self.assertEqual([["medical_certificates"]], inputs[TableType.TABLE.value])
+
+    def test_each_table_object_contributes_the_table_name_once(self):
+        for table_name, raw_nodes in [
+            ("student_exam_results", [
+                ("Show", "VB", 0, "ROOT"), ("the", "DT", 5, "det"), ("student", "NN", 5, "compound"),
+                ("exam", "NN", 5, "compound"), ("results", "NNS", 1, "obj"), (".", ".", 1, "punct")
+            ]),
+            ("students", [
+                ("Delete", "VB", 0, "ROOT"), ("rows", "NNS", 1, "obj"), ("from", "IN", 4, "case"),
+                ("students", "NNS", 1, "obl"), (".", ".", 1, "punct")
+            ])
+        ]:
+            table = Table.create_test_table_instance(["exam"], table_name, pd.DataFrame())
+            sentence, subsentences = DependencyParseAbstractor.create_sentence_instances_from(raw_nodes)
+            (_, inputs, _), = DependencyParseAbstractor.abstract_sentence_instances(sentence, subsentences, table)
+            self.assertEqual([[table_name]], inputs[TableType.TABLE.value])
+
+
+if __name__ == '__main__':
+    unittest.main()
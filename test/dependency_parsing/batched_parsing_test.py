@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+
+from pathlib import Path
+
+import pandas as pd
+
+from src.datamodel.Table import Table
+from src.entity_abstractor.Abstractor import Abstractor
+from src.entity_abstractor.DependencyParseCache import DependencyParseCache
+
+
+class MockCoreNLPClient:
+    """
+    Returns fixed CoreNLP parses and records the utterances of every request.
+    """
+    parses = {
+        "Show all students.": [
+            ("Show", "VB", 0, "ROOT"), ("all", "DT", 3, "det"), ("students", "NNS", 1, "obj"), (".", ".", 1, "punct")
+        ],
+        "Delete rows from students.": [
+            ("Delete", "VB", 0, "ROOT"), ("rows", "NNS", 1, "obj"), ("from", "IN", 4, "case"),
+            ("students", "NNS", 1, "obl"), (".", ".", 1, "punct")
+        ],
+        "Show the exam and id.": [
+            ("Show", "VB", 0, "ROOT"), ("the", "DT", 3, "det"), ("exam", "NN", 1, "obj"), ("and", "CC", 5, "cc"),
+            ("id", "NN", 3, "conj"), (".", ".", 1, "punct")
+        ]
+    }
+
+    def __init__(self):
+        self.requests = []
+
+    def parse(self, utterance: str):
+        return self.parse_many([utterance])[0]
+
+    def parse_many(self, utterances):
+        self.requests.append(list(utterances))
+        return [list(self.parses[utterance]) for utterance in utterances]
+
+
+class BatchedParsingTest(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.table = Table.create_test_table_instance(["exam", "id"], "students", pd.DataFrame())
+        self.utterances = [
+            "Show all students.", "Delete rows from students.", "Show all students.", "Show the exam and id."
+        ]
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def create_abstractor_with_mock_client(self, cache_name: str) -> Abstractor:
+        abstractor = Abstractor()
+        abstractor.core_nlp_client = MockCoreNLPClient()
+        abstractor.dependency_parse_cache = DependencyParseCache(Path(self.temporary_directory.name) / cache_name)
+        return abstractor
+
+    def test_abstract_many_equals_abstract(self):
+        batched = self.create_abstractor_with_mock_client("batched.sqlite")
+        single = self.create_abstractor_with_mock_client("single.sqlite")
+        self.assertEqual(
+            [single.abstract(utterance, self.table) for utterance in self.utterances],
+            batched.abstract_many(self.utterances, self.table)
+        )
+
+    def test_abstract_many_parses_each_utterance_once(self):
+        abstractor = self.create_abstractor_with_mock_client("parses.sqlite")
+        abstractor.abstract_many(self.utterances, self.table)
+        abstractor.abstract_many(self.utterances, self.table)
+        self.assertEqual([list(dict.fromkeys(self.utterances))], abstractor.core_nlp_client.requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
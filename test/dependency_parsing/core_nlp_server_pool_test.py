@@ -0,0 +1,67 @@
+import unittest
+
+from unittest import mock
+
+from requests.exceptions import ConnectionError
+
+from src.entity_abstractor.CoreNLPServerPool import CoreNLPServerPool
+
+
+class CoreNLPServerPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.sleep_patcher = mock.patch("src.entity_abstractor.CoreNLPServerPool.time.sleep")
+        self.sleep = self.sleep_patcher.start()
+
+    def tearDown(self):
+        self.sleep_patcher.stop()
+
+    @staticmethod
+    def readiness_responses(*status_codes):
+        return [mock.Mock(status_code=status_code) for status_code in status_codes]
+
+    def test_readiness_is_probed_with_exponential_backoff(self):
+        with mock.patch("src.entity_abstractor.CoreNLPServerPool.requests.get") as get:
+            get.side_effect = [ConnectionError()] + self.readiness_responses(503, 503, 503, 200)
+            CoreNLPServerPool.wait_until_ready("http://localhost:9000", initial_delay=0.5, max_delay=2)
+        get.assert_called_with("http://localhost:9000/ready", timeout=2)
+        self.assertEqual(5, get.call_count)
+        self.assertEqual([0.5, 1, 2, 2], [call.args[0] for call in self.sleep.call_args_list])
+
+    def test_exited_server_is_reported(self):
+        process = mock.Mock(returncode=1)
+        process.poll.return_value = 1
+        with mock.patch("src.entity_abstractor.CoreNLPServerPool.requests.get", side_effect=ConnectionError()):
+            with self.assertRaises(RuntimeError):
+                CoreNLPServerPool.wait_until_ready("http://localhost:9000", process=process)
+
+    def test_unready_server_times_out(self):
+        with mock.patch("src.entity_abstractor.CoreNLPServerPool.requests.get",
+                        return_value=self.readiness_responses(503)[0]):
+            with self.assertRaises(TimeoutError):
+                CoreNLPServerPool.wait_until_ready("http://localhost:9000", timeout=0)
+
+    def test_pool_starts_and_stops_all_servers(self):
+        with mock.patch("src.entity_abstractor.CoreNLPServerPool.subprocess.Popen") as popen, \
+                mock.patch("src.entity_abstractor.CoreNLPServerPool.requests.get",
+                           return_value=self.readiness_responses(200)[0]) as get:
+            with CoreNLPServerPool("corenlp", number_of_servers=3) as pool:
+                urls = pool.urls
+                self.assertEqual(3, len(set(urls)))
+                self.assertEqual(3, popen.call_count)
+                self.assertEqual([mock.call(f"{url}/ready", timeout=2) for url in urls], get.call_args_list)
+            self.assertEqual([], pool.urls)
+        self.assertEqual(3, popen.return_value.terminate.call_count)
+
+    def test_pool_is_stopped_if_a_server_does_not_start(self):
+        with mock.patch("src.entity_abstractor.CoreNLPServerPool.subprocess.Popen") as popen, \
+                mock.patch("src.entity_abstractor.CoreNLPServerPool.requests.get", side_effect=ConnectionError()):
+            popen.return_value.poll.return_value = 1
+            pool = CoreNLPServerPool("corenlp", number_of_servers=2)
+            with self.assertRaises(RuntimeError):
+                pool.start()
+        self.assertEqual([], pool.processes)
+        self.assertEqual(2, popen.return_value.terminate.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
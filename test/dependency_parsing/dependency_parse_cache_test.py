@@ -0,0 +1,39 @@
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from src.entity_abstractor.DependencyParseCache import DependencyParseCache
+
+
+class DependencyParseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.database_location = Path(self.temporary_directory.name) / "dependency_parses.sqlite"
+        self.parse = [("Show", "VB", 0, "ROOT"), ("students", "NNS", 1, "obj"), (".", ".", 1, "punct")]
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_parses_persist_per_parser_version(self):
+        cache = DependencyParseCache(self.database_location)
+        cache.store_many("stanford-corenlp-4.2.2", ["Show students."], [self.parse])
+        cache.connection.close()
+
+        reopened_cache = DependencyParseCache(self.database_location)
+        self.assertEqual(self.parse, reopened_cache.lookup("stanford-corenlp-4.2.2", "Show students."))
+        self.assertIsNone(reopened_cache.lookup("spacy-3.5.0-en_core_web_sm", "Show students."))
+        self.assertIsNone(reopened_cache.lookup("stanford-corenlp-4.2.2", "Show all students."))
+
+    def test_least_recently_used_parse_is_evicted_from_memory(self):
+        cache = DependencyParseCache(self.database_location, max_memory_entries=2)
+        cache.store_many("version", ["first", "second"], [self.parse, self.parse])
+        cache.lookup("version", "first")
+        cache.store_many("version", ["third"], [self.parse])
+        self.assertEqual([("version", "first"), ("version", "third")], list(cache.memory.keys()))
+        self.assertEqual(self.parse, cache.lookup("version", "second"))
+        self.assertEqual(2, len(cache.memory))
+
+
+if __name__ == '__main__':
+    unittest.main()
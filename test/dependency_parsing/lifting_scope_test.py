@@ -0,0 +1,89 @@
+import gc
+import unittest
+import weakref
+
+from unittest import mock
+
+from src.entity_abstractor.dependencytree.LiftingScope import LiftingScope
+from src.entity_abstractor.dependencytree.creation.LiftableDependencyTreeCreator import LiftableDependencyTreeCreator
+from src.entity_abstractor.dependencytree.creation.LiftableDependencyTreeNodeFactory \
+    import LiftableDependencyTreeNodeFactory
+from src.entity_abstractor.dependencytree.nodes.LiftableDependencyTreeNode import LiftableDependencyTreeNode
+
+
+class StructuralNode:
+    def __init__(self, word: str):
+        self.word = word
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, StructuralNode) and self.word == other.word
+
+
+class LiftingScopeTest(unittest.TestCase):
+    def test_results_are_memoised_per_node_identity(self):
+        first, second = StructuralNode("students"), StructuralNode("students")
+        computations = []
+        with LiftingScope():
+            for node in [first, second, first, second]:
+                LiftingScope.memoised("word", (node,), lambda node=node: computations.append(node) or node.word)
+        self.assertEqual(2, len(computations))
+        self.assertIs(first, computations[0])
+        self.assertIs(second, computations[1])
+
+    def test_memo_holds_nodes_until_the_scope_exits(self):
+        node = StructuralNode("students")
+        node_reference = weakref.ref(node)
+        with LiftingScope():
+            LiftingScope.memoised("word", (node,), lambda: "students")
+            del node
+            gc.collect()
+            self.assertIsNotNone(node_reference())
+        gc.collect()
+        self.assertIsNone(node_reference())
+
+    def test_nothing_is_memoised_outside_a_scope(self):
+        node = StructuralNode("students")
+        computations = []
+        for _ in range(2):
+            LiftingScope.memoised("word", (node,), lambda: computations.append(node))
+        self.assertEqual(2, len(computations))
+
+    def create_sentence_tree(self):
+        return LiftableDependencyTreeCreator([
+            ("Show", "VB", 0, "ROOT"), ("students", "NNS", 1, "obj"), ("and", "CC", 4, "cc"),
+            ("delete", "VB", 1, "conj"), ("exams", "NNS", 4, "obj"), (".", ".", 1, "punct")
+        ], LiftableDependencyTreeNodeFactory.get_default_instance()).create_tree()
+
+    def test_lifted_is_computed_once_per_node_inside_a_scope(self):
+        sentence_tree = self.create_sentence_tree()
+        with mock.patch.object(
+                LiftableDependencyTreeNode, "lifted", autospec=True, side_effect=LiftableDependencyTreeNode.lifted
+        ) as lifted:
+            with LiftingScope():
+                for _ in range(2):
+                    self.assertEqual("Show", sentence_tree.root.memoised_lifted(None))
+                    self.assertEqual("Show", sentence_tree.root.memoised_case_lifted(None))
+        self.assertEqual(1, lifted.call_count)
+
+    def test_ancestor_properties_are_checked_once_per_node_inside_a_scope(self):
+        sentence_tree = self.create_sentence_tree()
+        checked_nodes = []
+
+        def is_deletion(node) -> bool:
+            checked_nodes.append(node)
+            return node.word == "delete"
+
+        expected = [node.has_ancestor_with_property(is_deletion) for node in sentence_tree.nodes()]
+        self.assertEqual(["and", "exams"], [
+            node.word for node, has_ancestor in zip(sentence_tree.nodes(), expected) if has_ancestor
+        ])
+        checked_nodes.clear()
+        with LiftingScope():
+            self.assertEqual(expected, [
+                node.has_ancestor_with_property(is_deletion) for node in reversed(sentence_tree.nodes())
+            ][::-1])
+        self.assertLessEqual(len(checked_nodes), len(sentence_tree.nodes()))
+
+
+if __name__ == '__main__':
+    unittest.main()
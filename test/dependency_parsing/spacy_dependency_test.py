@@ -0,0 +1,38 @@
+import unittest
+
+from src.entity_abstractor.DependencyParseCache import DependencyParseCache
+from src.entity_abstractor.SpacyAbstractor import SpacyAbstractor
+
+
+class SpacyDependencyTest(unittest.TestCase):
+    def test_initialization_sets_up_dependency_parse_cache(self):
+        spacy_abstractor = SpacyAbstractor()
+        self.assertIsInstance(spacy_abstractor.dependency_parse_cache, DependencyParseCache)
+        self.assertTrue(spacy_abstractor.parser_version.endswith("-en_core_web_sm"))
+
+    def test_copula_translated_to_universal_dependencies(self):
+        tokens = [
+            ("This", "DT", "PRON", "this", 1, "nsubj"), ("is", "VBZ", "AUX", "be", 1, "ROOT"),
+            ("a", "DT", "DET", "a", 3, "det"), ("test", "NN", "NOUN", "test", 1, "attr"),
+            (".", ".", "PUNCT", ".", 1, "punct")
+        ]
+        self.assertEqual(
+            [("This", "DT", 4, "nsubj"), ("is", "VBZ", 4, "cop"), ("a", "DT", 4, "det"), ("test", "NN", 0, "ROOT"),
+             (".", ".", 4, "punct")],
+            SpacyAbstractor.universal_dependency_tuples_from(tokens)
+        )
+
+    def test_preposition_translated_to_case(self):
+        tokens = [
+            ("Delete", "VB", "VERB", "delete", 0, "ROOT"), ("rows", "NNS", "NOUN", "row", 0, "dobj"),
+            ("from", "IN", "ADP", "from", 0, "prep"), ("students", "NNS", "NOUN", "student", 2, "pobj")
+        ]
+        self.assertEqual(
+            [("Delete", "VB", 0, "ROOT"), ("rows", "NNS", 1, "obj"), ("from", "IN", 4, "case"),
+             ("students", "NNS", 1, "obl")],
+            SpacyAbstractor.universal_dependency_tuples_from(tokens)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
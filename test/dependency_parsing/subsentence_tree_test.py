@@ -0,0 +1,41 @@
+import unittest
+
+from src.entity_abstractor.dependencytree.creation.LiftableDependencyTreeCreator import LiftableDependencyTreeCreator
+from src.entity_abstractor.dependencytree.creation.LiftableDependencyTreeNodeFactory \
+    import LiftableDependencyTreeNodeFactory
+
+
+class SubsentenceTreeTest(unittest.TestCase):
+    def setUp(self):
+        self.creator = LiftableDependencyTreeCreator([
+            ("Show", "VB", 0, "ROOT"), ("students", "NNS", 1, "obj"), ("and", "CC", 4, "cc"),
+            ("delete", "VB", 1, "conj"), ("exams", "NNS", 4, "obj"), (".", ".", 1, "punct")
+        ], LiftableDependencyTreeNodeFactory.get_default_instance())
+        self.sentence_tree = self.creator.create_tree()
+
+    def test_subsentence_trees_share_no_nodes_with_the_sentence_tree(self):
+        sentence_tree_string = str(self.sentence_tree)
+        sentence_nodes = {id(node) for node in self.sentence_tree.nodes()}
+        subsentence_trees = self.creator.create_subsentence_trees_of(self.sentence_tree)
+        self.assertEqual(sentence_tree_string, str(self.sentence_tree))
+        self.assertEqual(
+            [["Show", "students", "."], ["and", "delete", "exams"]],
+            [[node.word for node in subsentence_tree.nodes()] for subsentence_tree in subsentence_trees]
+        )
+        for subsentence_tree in subsentence_trees:
+            self.assertEqual(0, subsentence_tree.root.parent)
+            for node in subsentence_tree.nodes():
+                self.assertNotIn(id(node), sentence_nodes)
+                for child in node.children:
+                    self.assertIs(node, child.parent)
+
+    def test_detached_copy_of_a_subtree_has_no_parent(self):
+        subtree_root = self.sentence_tree.root.children[1]
+        subtree_copy = subtree_root.detached_copy()
+        self.assertIsNone(subtree_copy.parent)
+        self.assertIs(self.sentence_tree.root, subtree_root.parent)
+        self.assertEqual([node.word for node in subtree_root.nodes()], [node.word for node in subtree_copy.nodes()])
+
+
+if __name__ == '__main__':
+    unittest.main()
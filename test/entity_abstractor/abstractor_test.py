@@ -18,9 +18,10 @@ class AbstractorTest(unittest.TestCase):
         cls.abstractor.stop_core_nlp_server()
 
     def test_abstractor_initialization(self):
-        parse, = self.abstractor.dependency_parser.raw_parse("This is a test.")
-        self.assertEqual("This\tDT\t4\tnsubj\nis\tVBZ\t4\tcop\na\tDT\t4\tdet\ntest\tNN\t0\tROOT\n.\t.\t4\tpunct\n",
-                         parse.to_conll(4))
+        expected_parse = [("This", "DT", 4, "nsubj"), ("is", "VBZ", 4, "cop"), ("a", "DT", 4, "det"),
+                          ("test", "NN", 0, "ROOT"), (".", ".", 4, "punct")]
+        self.assertEqual(expected_parse, self.abstractor.core_nlp_client.parse("This is a test."))
+        self.assertEqual([expected_parse], self.abstractor.parse_dependencies_of(["This is a test."]))
 
     def test_abstractor_no_table_single_sentence_object_list(self):
         string = "Create the table students containing the columns name, surname, mark and id."
@@ -0,0 +1,69 @@
+import unittest
+
+from unittest import mock
+
+from src.candidate_resolver.configurables.resolver_configurable_enums import BertKerasLayerType, EmbeddingType
+from src.evaluation.PipelineTestSetCreator import PipelineTestSetCreator
+
+
+class PipelineTestSetCreatorTest(unittest.TestCase):
+    def setUp(self):
+        self.creator = PipelineTestSetCreator.__new__(PipelineTestSetCreator)
+        self.creator.bert_layer_types = [BertKerasLayerType.BERT_SMALL, BertKerasLayerType.ELECTRA_SMALL]
+        self.creator.resolver_embedding_types = [EmbeddingType.BERT_POOLED]
+        self.creator.embedding_function_providers = {}
+        self.argument_packs = [
+            (1, f"pipeline{i}", None, False, (bert_layer_type, EmbeddingType.BERT_POOLED, None), None)
+            for i, bert_layer_type in enumerate([
+                BertKerasLayerType.ELECTRA_SMALL, BertKerasLayerType.BERT_SMALL, BertKerasLayerType.ELECTRA_SMALL
+            ])
+        ]
+        self.loaded_providers = []
+
+        def create_embedding_function_provider(bert_layer_type, co_embedded_types):
+            self.loaded_providers.append(mock.Mock(bert_layer_type=bert_layer_type))
+            return self.loaded_providers[-1]
+
+        def create_semantic_parser_pipelines(*argument_pack):
+            return self.creator.get_embedding_function_provider(argument_pack[4][0])
+
+        patches = [
+            mock.patch.object(self.creator, "get_all_argument_packs", return_value=iter(self.argument_packs)),
+            mock.patch.object(self.creator, "create_semantic_parser_pipelines",
+                              side_effect=create_semantic_parser_pipelines),
+            mock.patch("src.evaluation.PipelineTestSetCreator.create_embedding_function_provider",
+                       side_effect=create_embedding_function_provider)
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def released_providers(self):
+        return [provider for provider in self.loaded_providers if provider.embedder.release.called]
+
+    def test_one_provider_is_held_at_a_time(self):
+        pipeline_names = []
+        for _, pipeline_name, provider in self.creator.yield_pipeline_test_inputs():
+            pipeline_names.append(pipeline_name)
+            self.assertEqual([provider], [
+                loaded_provider for loaded_provider in self.loaded_providers
+                if loaded_provider not in self.released_providers()
+            ])
+        self.assertEqual(["pipeline1", "pipeline0", "pipeline2"], pipeline_names)
+        self.assertEqual(
+            [BertKerasLayerType.BERT_SMALL, BertKerasLayerType.ELECTRA_SMALL],
+            [provider.bert_layer_type for provider in self.loaded_providers]
+        )
+        self.assertEqual(self.loaded_providers, self.released_providers())
+        self.assertEqual({}, self.creator.embedding_function_providers)
+
+    def test_providers_are_released_when_the_iteration_stops_early(self):
+        pipeline_test_inputs = self.creator.yield_pipeline_test_inputs()
+        next(pipeline_test_inputs)
+        pipeline_test_inputs.close()
+        self.assertEqual(1, len(self.loaded_providers))
+        self.assertEqual(self.loaded_providers, self.released_providers())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from src.entity_abstractor.MockAbstractor import MockAbstractor
+from src.pipeline.SemanticParserPipeline import SemanticParserPipeline
+from src.util.Storage import Storage
+from test.test_utils import create_trained_resolver
+
+
+class SemanticParserPipelineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        storage = Storage()
+        cls.utterances = list(storage.load_test_dataset()[0]["query"])
+        cls.candidate_resolver = create_trained_resolver(
+            storage.load_candidate_resolver_dataset(), "Lifted instance", "DSL output"
+        )
+        cls.condition_resolver = create_trained_resolver(
+            storage.load_condition_input_data(storage.training_data_location),
+            "Lifted condition", "Lifted condition DSL",
+            take_best_guess=True
+        )
+
+    def setUp(self) -> None:
+        self.candidate_resolver.invalidate_cached_outputs()
+        self.condition_resolver.invalidate_cached_outputs()
+
+    def create_pipeline(self, max_candidates: int = None) -> SemanticParserPipeline:
+        return SemanticParserPipeline(
+            MockAbstractor.get_shared_instance(), self.candidate_resolver, self.condition_resolver,
+            max_candidates=max_candidates
+        )
+
+    def test_predict_batch_equals_predict(self):
+        pipeline = self.create_pipeline()
+        utterances = self.utterances + self.utterances[:5]
+        batch_predictions = pipeline.predict_batch(utterances)
+        self.setUp()
+        self.assertEqual([pipeline.predict(utterance) for utterance in utterances], batch_predictions)
+
+    def test_grounded_program_line_candidates_batch_equals_single(self):
+        pipeline = self.create_pipeline()
+        abstractor_outputs = [
+            abstractor_output
+            for utterance in self.utterances
+            for abstractor_output in MockAbstractor.abstract_utterance(utterance)
+        ]
+        batch_candidates = pipeline.get_grounded_program_line_candidates_batch(abstractor_outputs)
+        self.setUp()
+        single_candidates = [
+            pipeline.get_grounded_program_line_candidates(*abstractor_output) for abstractor_output in abstractor_outputs
+        ]
+        self.assertEqual(len(single_candidates), len(batch_candidates))
+        for single, batch in zip(single_candidates, batch_candidates):
+            self.assertEqual([program for _, program in single], [program for _, program in batch])
+            for (single_probability, _), (batch_probability, _) in zip(single, batch):
+                self.assertAlmostEqual(float(single_probability), float(batch_probability), places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,15 @@
 import os
+import tempfile
+
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+from src.candidate_resolver.CandidateResolver import CandidateResolver
+from src.candidate_resolver.Regressor import Regressor
+from src.candidate_resolver.training import embedd_dataset
+
 
 def get_test_resource_directory():
     working_directory = Path(os.getcwd())
@@ -8,3 +17,65 @@ def get_test_resource_directory():
         if parent.name == "SmartCCG":
             resource_directory = parent / "resources" / "test"
             return resource_directory
+
+
+def character_count_embedding(inputs):
+    """
+    A deterministic stand-in for the embedding functions of the embedding function provider, which counts the letters of a lifted utterance.
+    :param inputs: A lifted utterance or a list of lifted utterances.
+    :return: The embedding of the lifted utterance or the list of embeddings of the lifted utterances.
+    """
+    if not isinstance(inputs, str):
+        return [character_count_embedding(lifted_input) for lifted_input in inputs]
+    embedding = np.zeros(26, dtype=np.float32)
+    for character in inputs.lower():
+        if "a" <= character <= "z":
+            embedding[ord(character) - ord("a")] += 1
+    return embedding
+
+
+class LinearMetricLearner:
+    """
+    A stand-in for the metric learners of metric_learn, whose learned transformation is a fixed random matrix.
+    """
+    def __init__(self, dimension: int = 26, seed: int = 0):
+        self.components_ = np.random.default_rng(seed).standard_normal((dimension, dimension)).astype(np.float32)
+
+    def fit_transform(self, x, y) -> np.ndarray:
+        return self.transform(x)
+
+    def transform(self, x) -> np.ndarray:
+        return np.asarray(x, dtype=np.float32) @ self.components_.T
+
+
+def create_trained_resolver(dataset: pd.DataFrame,
+                            lifted_instance_column_name: str,
+                            lifted_output_column_name: str,
+                            not_sure_threshold: float = 3.0,
+                            nearest_neighbor_metric_learner=None,
+                            take_best_guess: bool = False) -> CandidateResolver:
+    """
+    Create a candidate resolver embedding with :py:func:`character_count_embedding` and train its nearest neighbor search on the dataset.
+    The regressor keeps its initial weights.
+    :param dataset:
+    :param lifted_instance_column_name:
+    :param lifted_output_column_name:
+    :param not_sure_threshold:
+    :param nearest_neighbor_metric_learner:
+    :param take_best_guess:
+    :return:
+    """
+    regressor = Regressor()
+    regressor(np.zeros((1, 1), dtype=np.float32))
+    candidate_resolver = CandidateResolver(
+        character_count_embedding,
+        regressor,
+        Path(tempfile.gettempdir()),
+        take_best_guess=take_best_guess,
+        nearest_neighbor_metric_learner=nearest_neighbor_metric_learner,
+        not_sure_threshold=not_sure_threshold
+    )
+    candidate_resolver.train_instances_from(
+        embedd_dataset(dataset, lifted_instance_column_name, lifted_output_column_name, character_count_embedding), 0, 1
+    )
+    return candidate_resolver
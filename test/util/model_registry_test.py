@@ -0,0 +1,107 @@
+import unittest
+
+from unittest import mock
+
+import tensorflow as tf
+
+from src.candidate_reranker.table_embedding.TableEmbedder import TableEmbedder
+from src.candidate_resolver.embedding.BertEmbedder import BertEmbedder
+from src.util.ModelRegistry import ModelRegistry
+
+
+class ModelRegistryTest(unittest.TestCase):
+    preprocessor_link = "preprocessor"
+    bert_link = "bert"
+
+    def setUp(self):
+        self.model_registry = ModelRegistry()
+        self.loaded_links = []
+        self.patchers = [
+            mock.patch.object(ModelRegistry, "shared_instance", self.model_registry),
+            mock.patch("src.util.ModelRegistry.hub.load", side_effect=self.load_hub_model),
+            mock.patch("src.candidate_resolver.embedding.BertEmbedder.hub.KerasLayer", side_effect=self.keras_layer),
+            mock.patch("src.candidate_reranker.table_embedding.TableEmbedder.hub.KerasLayer",
+                       side_effect=self.keras_layer)
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.corrupted_links = set()
+
+    def tearDown(self):
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+
+    def load_hub_model(self, tfhub_link: str):
+        self.loaded_links.append(tfhub_link)
+        if tfhub_link in self.corrupted_links:
+            self.corrupted_links.remove(tfhub_link)
+            raise tf.errors.DataLossError(None, None, f"/tmp/tfhub_modules/{tfhub_link}/ is corrupted")
+        model = mock.Mock()
+        model.tokenize.get_special_tokens_dict.return_value = {"start_of_sequence_id": 101, "end_of_segment_id": 102}
+        return model
+
+    @staticmethod
+    def keras_layer(*args, **kwargs):
+        return tf.keras.layers.Dense(1)
+
+    def reference_counts(self):
+        return [
+            self.model_registry.reference_count_of(("hub", self.preprocessor_link)),
+            self.model_registry.reference_count_of(("hub", self.bert_link))
+        ]
+
+    def test_models_are_loaded_once_and_dropped_after_the_last_release(self):
+        load = mock.Mock(side_effect=lambda: object())
+        first = self.model_registry.acquire("model", load)
+        second = self.model_registry.acquire("model", load)
+        self.assertIs(first, second)
+        self.assertEqual(1, load.call_count)
+        self.assertEqual(2, self.model_registry.reference_count_of("model"))
+        self.model_registry.release("model")
+        self.assertEqual(1, self.model_registry.reference_count_of("model"))
+        self.model_registry.release("model")
+        self.assertEqual(0, self.model_registry.reference_count_of("model"))
+        self.assertNotIn("model", self.model_registry.models)
+        with self.assertRaises(KeyError):
+            self.model_registry.release("model")
+
+    def test_embedders_share_and_release_models(self):
+        first = BertEmbedder(self.preprocessor_link, self.bert_link)
+        second = BertEmbedder(self.preprocessor_link, self.bert_link)
+        self.assertEqual([self.preprocessor_link, self.bert_link], self.loaded_links)
+        self.assertEqual([2, 2], self.reference_counts())
+        first.release()
+        second.release()
+        self.assertEqual([0, 0], self.reference_counts())
+
+    def test_failed_bert_embedder_releases_acquired_models(self):
+        self.corrupted_links.add(self.bert_link)
+        with self.assertRaises(tf.errors.DataLossError):
+            BertEmbedder(self.preprocessor_link, self.bert_link)
+        self.assertEqual([0, 0], self.reference_counts())
+
+    def test_bert_embedder_initialization_retries_with_balanced_reference_counts(self):
+        self.corrupted_links.add(self.bert_link)
+        with mock.patch("src.candidate_resolver.embedding.BertEmbedder.delete_matching_tfhub_cache") as delete_cache:
+            embedder = BertEmbedder.initialize(self.preprocessor_link, self.bert_link)
+        self.assertEqual(1, delete_cache.call_count)
+        self.assertEqual([1, 1], self.reference_counts())
+        embedder.release()
+        self.assertEqual([0, 0], self.reference_counts())
+
+    def test_failed_table_embedder_releases_acquired_models(self):
+        with mock.patch("src.util.ModelRegistry.api.load", side_effect=ValueError("unknown word embedder")):
+            with self.assertRaises(ValueError):
+                TableEmbedder(self.preprocessor_link, self.bert_link, "word_embedder", 128, False, (128, 128), (1, 27),
+                              "MAX")
+        self.assertEqual([0, 0], self.reference_counts())
+        self.corrupted_links.add(self.bert_link)
+        with mock.patch("src.candidate_reranker.table_embedding.TableEmbedder.delete_matching_tfhub_cache"):
+            embedder = TableEmbedder.initialize(self.preprocessor_link, self.bert_link, column_names_only=True)
+        self.assertEqual([1, 1], self.reference_counts())
+        embedder.release()
+        self.assertEqual([0, 0], self.reference_counts())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+from unittest import mock
+
+from src.util.TableRegistry import TableRegistry
+
+
+class TableRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.table_contexts_location = Path(self.temporary_directory.name)
+        (self.table_contexts_location / "guests").mkdir()
+        self.table_path = self.table_contexts_location / "guests" / "visitors.txt"
+        self.write_table("Name\tSurname\nLeo\tDorste\n")
+        self.table_registry = TableRegistry(self.table_contexts_location)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def write_table(self, content: str):
+        previous_modification_time = self.table_path.stat().st_mtime_ns if self.table_path.exists() else 0
+        self.table_path.write_text(content)
+        os.utime(self.table_path, ns=(previous_modification_time + 10 ** 9, previous_modification_time + 10 ** 9))
+
+    def test_changed_table_file_is_read_after_reload(self):
+        self.assertEqual(["name", "surname"], self.table_registry.context("guests")[0].columns)
+        self.write_table("Name\tEmail\nLeo\tleo@example.org\n")
+        self.assertEqual(["name", "surname"], self.table_registry.context("guests")[0].columns)
+        self.table_registry.reload()
+        self.assertEqual(["name", "email"], self.table_registry.context("guests")[0].columns)
+        self.assertEqual(["name", "email"], self.table_registry.table("guests", "visitors").columns)
+
+    def test_refresh_interval_picks_up_changed_table_file(self):
+        table_registry = TableRegistry(self.table_contexts_location, refresh_interval=0)
+        self.assertEqual(["name", "surname"], table_registry.context("guests")[0].columns)
+        self.write_table("Name\tEmail\nLeo\tleo@example.org\n")
+        self.assertEqual(["name", "email"], table_registry.all_tables()[0].columns)
+        self.assertEqual(["name", "email"], table_registry.tables_named(["visitors"])[0].columns)
+
+    def test_loaded_context_is_not_checked_again(self):
+        self.table_registry.context("guests")
+        with mock.patch.object(self.table_registry, "signature_of") as signature_of:
+            self.table_registry.context("guests")
+            self.table_registry.all_tables()
+            self.table_registry.tables_named(["visitors"])
+            signature_of.assert_not_called()
+
+    def test_tables_named_keeps_the_order_of_all_tables(self):
+        (self.table_contexts_location / "hotels").mkdir()
+        (self.table_contexts_location / "hotels" / "visitors.txt").write_text("Name\tRoom\nLeo\t12\n")
+        (self.table_contexts_location / "hotels" / "rooms.txt").write_text("Room\tBeds\n12\t2\n")
+        all_tables = self.table_registry.all_tables()
+        self.assertEqual(
+            [table for table in all_tables if table.table_name in {"visitors", "rooms"}],
+            self.table_registry.tables_named(["rooms", "visitors", "rooms"])
+        )
+        self.assertEqual([], self.table_registry.tables_named(["kitchens"]))
+
+    def test_reload_drops_loaded_tables(self):
+        table = self.table_registry.table("guests", "visitors")
+        self.table_registry.reload("guests")
+        self.assertIsNot(table, self.table_registry.table("guests", "visitors"))
+        self.assertIs(self.table_registry.table("guests", "visitors"), self.table_registry.context("guests")[0])
+
+
+if __name__ == '__main__':
+    unittest.main()